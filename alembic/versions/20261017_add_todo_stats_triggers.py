@@ -0,0 +1,215 @@
+"""add trigger-maintained todo stats tables
+
+Revision ID: 20261017_todo_stats_triggers
+Revises: 20261017_todos_keyset_idx
+Create Date: 2026-10-17 10:00:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261017_todo_stats_triggers"
+down_revision = "20261017_todos_keyset_idx"
+branch_labels = None
+depends_on = None
+
+# Counters are spread across slots (picked by backend pid) so concurrent writers
+# do not serialize on a single hot row; readers sum at most STATS_SLOTS rows.
+STATS_SLOTS = 16
+
+
+def upgrade() -> None:
+    op.create_table(
+        "todo_stats_counters",
+        sa.Column("slot", sa.SmallInteger(), primary_key=True, nullable=False),
+        sa.Column("total", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("completed", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "todo_stats_daily",
+        sa.Column("day", sa.Date(), primary_key=True, nullable=False),
+        sa.Column("slot", sa.SmallInteger(), primary_key=True, nullable=False),
+        sa.Column("created", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("completed", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    # Statement-level triggers with transition tables aggregate a whole
+    # multi-row INSERT/UPDATE/DELETE into one counter upsert per statement.
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION todo_stats_on_insert()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            stats_slot smallint := mod(pg_backend_pid(), {STATS_SLOTS});
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM inserted_rows) THEN
+                RETURN NULL;
+            END IF;
+
+            INSERT INTO todo_stats_counters AS c (slot, total, completed)
+            SELECT stats_slot, count(*), count(*) FILTER (WHERE is_completed)
+            FROM inserted_rows
+            ON CONFLICT (slot) DO UPDATE
+            SET total = c.total + EXCLUDED.total,
+                completed = c.completed + EXCLUDED.completed;
+
+            INSERT INTO todo_stats_daily AS d (day, slot, created, completed)
+            SELECT
+                (created_at AT TIME ZONE 'UTC')::date,
+                stats_slot,
+                count(*),
+                count(*) FILTER (WHERE is_completed)
+            FROM inserted_rows
+            GROUP BY 1
+            ON CONFLICT (day, slot) DO UPDATE
+            SET created = d.created + EXCLUDED.created,
+                completed = d.completed + EXCLUDED.completed;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION todo_stats_on_update()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            stats_slot smallint := mod(pg_backend_pid(), {STATS_SLOTS});
+            newly_completed bigint;
+            reopened bigint;
+        BEGIN
+            SELECT
+                count(*) FILTER (WHERE n.is_completed AND NOT o.is_completed),
+                count(*) FILTER (WHERE o.is_completed AND NOT n.is_completed)
+            INTO newly_completed, reopened
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id;
+
+            IF newly_completed = 0 AND reopened = 0 THEN
+                RETURN NULL;
+            END IF;
+
+            INSERT INTO todo_stats_counters AS c (slot, total, completed)
+            VALUES (stats_slot, 0, newly_completed - reopened)
+            ON CONFLICT (slot) DO UPDATE
+            SET completed = c.completed + EXCLUDED.completed;
+
+            IF newly_completed > 0 THEN
+                INSERT INTO todo_stats_daily AS d (day, slot, created, completed)
+                VALUES (
+                    (now() AT TIME ZONE 'UTC')::date,
+                    stats_slot,
+                    0,
+                    newly_completed
+                )
+                ON CONFLICT (day, slot) DO UPDATE
+                SET completed = d.completed + EXCLUDED.completed;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION todo_stats_on_delete()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            stats_slot smallint := mod(pg_backend_pid(), {STATS_SLOTS});
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM deleted_rows) THEN
+                RETURN NULL;
+            END IF;
+
+            INSERT INTO todo_stats_counters AS c (slot, total, completed)
+            SELECT
+                stats_slot,
+                -count(*),
+                -(count(*) FILTER (WHERE is_completed))
+            FROM deleted_rows
+            ON CONFLICT (slot) DO UPDATE
+            SET total = c.total + EXCLUDED.total,
+                completed = c.completed + EXCLUDED.completed;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_todos_stats_insert
+        AFTER INSERT ON todos
+        REFERENCING NEW TABLE AS inserted_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION todo_stats_on_insert();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_todos_stats_update
+        AFTER UPDATE ON todos
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION todo_stats_on_update();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_todos_stats_delete
+        AFTER DELETE ON todos
+        REFERENCING OLD TABLE AS deleted_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION todo_stats_on_delete();
+        """
+    )
+
+    # Backfill inside the same transaction: CREATE TRIGGER holds a lock that
+    # blocks concurrent writes, so no row is counted twice or missed.
+    op.execute(
+        """
+        INSERT INTO todo_stats_counters (slot, total, completed)
+        SELECT 0, count(*), count(*) FILTER (WHERE is_completed)
+        FROM todos;
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO todo_stats_daily (day, slot, created, completed)
+        SELECT day, 0, sum(created), sum(completed)
+        FROM (
+            SELECT (created_at AT TIME ZONE 'UTC')::date AS day,
+                   1 AS created,
+                   0 AS completed
+            FROM todos
+            UNION ALL
+            SELECT (updated_at AT TIME ZONE 'UTC')::date, 0, 1
+            FROM todos
+            WHERE is_completed
+        ) AS activity
+        GROUP BY day;
+        """
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS trg_todos_stats_delete ON todos;")
+        op.execute("DROP TRIGGER IF EXISTS trg_todos_stats_update ON todos;")
+        op.execute("DROP TRIGGER IF EXISTS trg_todos_stats_insert ON todos;")
+        op.execute("DROP FUNCTION IF EXISTS todo_stats_on_delete();")
+        op.execute("DROP FUNCTION IF EXISTS todo_stats_on_update();")
+        op.execute("DROP FUNCTION IF EXISTS todo_stats_on_insert();")
+
+    op.drop_table("todo_stats_daily")
+    op.drop_table("todo_stats_counters")
@@ -0,0 +1,50 @@
+"""add todos_archive cold table for completed todos
+
+Revision ID: 20261017_todos_archive
+Revises: 20261017_todos_partitioned
+Create Date: 2026-10-17 14:00:00
+
+Completed todos older than a cutoff are moved here in batches by
+`scripts/archive_todos.py` (or the optional in-app schedule), keeping `todos`
+and its indexes small. Ids are copied unchanged.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261017_todos_archive"
+down_revision = "20261017_todos_partitioned"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "todos_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.String(length=1024), nullable=True),
+        sa.Column("is_completed", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    # Backs `include_archived` list pages in the default `created_at` order.
+    op.create_index(
+        "ix_todos_archive_created_at_id",
+        "todos_archive",
+        ["created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todos_archive_created_at_id", table_name="todos_archive")
+    op.drop_table("todos_archive")
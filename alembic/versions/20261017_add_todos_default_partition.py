@@ -0,0 +1,144 @@
+"""add a DEFAULT partition to todos and let the app maintain partitions
+
+Revision ID: 20261017_todos_default_part
+Revises: 20261017_todos_archive
+Create Date: 2026-10-17 15:00:00
+
+PostgreSQL only.
+
+- `todos_default` catches rows whose month has no partition yet, so a missed
+  maintenance run degrades pruning instead of failing every INSERT.
+- `todos_ensure_partitions` now moves rows parked in `todos_default` into the
+  month's partition as it creates it, and runs as SECURITY DEFINER so the
+  application role (which does not own `todos`) can call it from the
+  scheduled in-app maintenance task.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20261017_todos_default_part"
+down_revision = "20261017_todos_archive"
+branch_labels = None
+depends_on = None
+
+ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION todos_ensure_partitions(
+    months_ahead integer DEFAULT 3,
+    from_month date DEFAULT NULL
+)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+    month_start date := date_trunc(
+        'month', coalesce(from_month, (now() AT TIME ZONE 'UTC')::date)
+    );
+    last_month date := date_trunc('month', (now() AT TIME ZONE 'UTC')::date)
+        + make_interval(months => months_ahead);
+    partition_name text;
+    lower_bound timestamptz;
+    upper_bound timestamptz;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        partition_name := format('todos_p%s', to_char(month_start, 'YYYYMM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            lower_bound := month_start::timestamp AT TIME ZONE 'UTC';
+            upper_bound := (month_start + interval '1 month')::timestamp
+                AT TIME ZONE 'UTC';
+            -- Creating a partition takes ACCESS EXCLUSIVE on todos anyway; take
+            -- it first so no row lands in the default while we move them out.
+            LOCK TABLE todos IN ACCESS EXCLUSIVE MODE;
+            -- The new range must not overlap rows held by the default
+            -- partition. Statements on a single partition fire none of the
+            -- parent's statement triggers, so stats and the locator are kept.
+            -- Partitions share the parent's column order, so `*` carries
+            -- every column, including ones added by later migrations.
+            CREATE TEMP TABLE todos_parked AS
+            SELECT * FROM todos_default
+            WHERE created_at >= lower_bound AND created_at < upper_bound;
+            DELETE FROM todos_default
+            WHERE created_at >= lower_bound AND created_at < upper_bound;
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF todos FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                lower_bound,
+                upper_bound
+            );
+            EXECUTE format(
+                'INSERT INTO %I SELECT * FROM todos_parked', partition_name
+            );
+            DROP TABLE todos_parked;
+            created := created + 1;
+        END IF;
+        month_start := month_start + interval '1 month';
+    END LOOP;
+    RETURN created;
+END;
+$$;
+"""
+
+# Definition from 20261017_todos_partitioned, restored on downgrade.
+PREVIOUS_ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION todos_ensure_partitions(
+    months_ahead integer DEFAULT 3,
+    from_month date DEFAULT NULL
+)
+RETURNS integer AS $$
+DECLARE
+    month_start date := date_trunc(
+        'month', coalesce(from_month, (now() AT TIME ZONE 'UTC')::date)
+    );
+    last_month date := date_trunc('month', (now() AT TIME ZONE 'UTC')::date)
+        + make_interval(months => months_ahead);
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        partition_name := format('todos_p%s', to_char(month_start, 'YYYYMM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF todos '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                month_start::timestamp AT TIME ZONE 'UTC',
+                (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            created := created + 1;
+        END IF;
+        month_start := month_start + interval '1 month';
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE TABLE todos_default PARTITION OF todos DEFAULT;")
+    op.execute(ENSURE_PARTITIONS)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM todos_default) THEN
+                RAISE EXCEPTION 'todos_default holds rows; run '
+                    'todos_ensure_partitions() to move them before downgrading';
+            END IF;
+        END;
+        $$;
+        """
+    )
+    op.execute(PREVIOUS_ENSURE_PARTITIONS)
+    op.execute("DROP TABLE todos_default;")
@@ -0,0 +1,71 @@
+"""add partial and composite indexes for todo list filters and sorts
+
+Revision ID: 20261017_todos_filter_idx
+Revises: 20261017_todos_search_vector
+Create Date: 2026-10-17 12:00:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261017_todos_filter_idx"
+down_revision = "20261017_todos_search_vector"
+branch_labels = None
+depends_on = None
+
+# (name, columns, partial-index predicate per dialect)
+INDEXES = (
+    (
+        "ix_todos_open_created_at_id",
+        ["created_at", "id"],
+        {"postgresql": "is_completed = false", "sqlite": "is_completed = 0"},
+    ),
+    ("ix_todos_updated_at_id", ["updated_at", "id"], None),
+    ("ix_todos_title_id", ["title", "id"], None),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        for name, columns, where in INDEXES:
+            kwargs = {}
+            if where is not None:
+                kwargs["sqlite_where"] = sa.text(where["sqlite"])
+            op.create_index(name, "todos", columns, **kwargs)
+        return
+
+    # Build without an exclusive lock so writes continue during the migration.
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            kwargs = {}
+            if where is not None:
+                kwargs["postgresql_where"] = sa.text(where["postgresql"])
+            op.create_index(
+                name,
+                "todos",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="todos")
+        return
+
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="todos",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,47 @@
+"""add todos (created_at, id) keyset index
+
+Revision ID: 20261017_todos_keyset_idx
+Revises: 20260320_todos_updated_at_trg
+Create Date: 2026-10-17 09:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20261017_todos_keyset_idx"
+down_revision = "20260320_todos_updated_at_trg"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.create_index("ix_todos_created_at_id", "todos", ["created_at", "id"])
+        return
+
+    # Build without an exclusive lock so writes continue during the migration.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_todos_created_at_id",
+            "todos",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.drop_index("ix_todos_created_at_id", table_name="todos")
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_todos_created_at_id",
+            table_name="todos",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,69 @@
+"""add a row version counter to todos and todos_archive
+
+Revision ID: 20261017_todos_row_version
+Revises: 20261017_todos_default_part
+Create Date: 2026-10-17 16:00:00
+
+`version` starts at 1 and backs strong ETags on `GET /todos/{id}`. On
+PostgreSQL a BEFORE UPDATE trigger increments it, so writes that bypass the
+application (raw SQL, scripts, manual fixes) still invalidate the ETag; on
+other dialects the application increments it. Archived rows keep the version they
+had when they were moved. On PostgreSQL 11+ adding a NOT NULL column with a
+constant default only touches the catalog, so existing rows are not
+rewritten.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261017_todos_row_version"
+down_revision = "20261017_todos_default_part"
+branch_labels = None
+depends_on = None
+
+TABLES = ("todos", "todos_archive")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "version", sa.Integer(), server_default=sa.text("1"), nullable=False
+            ),
+        )
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_row_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.version = OLD.version + 1;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_bump_version
+            BEFORE UPDATE ON {table}
+            FOR EACH ROW
+            EXECUTE FUNCTION bump_row_version();
+            """
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for table in reversed(TABLES):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_bump_version ON {table};")
+        op.execute("DROP FUNCTION IF EXISTS bump_row_version();")
+    for table in reversed(TABLES):
+        op.drop_column(table, "version")
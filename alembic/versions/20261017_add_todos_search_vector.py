@@ -0,0 +1,55 @@
+"""add GIN expression index for todo search
+
+Revision ID: 20261017_todos_search_vector
+Revises: 20261017_todo_stats_triggers
+Create Date: 2026-10-17 11:00:00
+
+The index is built on the tsvector expression itself rather than on a stored
+generated column: adding a STORED column rewrites all of `todos` under ACCESS
+EXCLUSIVE, while `CREATE INDEX CONCURRENTLY` lets reads and writes continue.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20261017_todos_search_vector"
+down_revision = "20261017_todo_stats_triggers"
+branch_labels = None
+depends_on = None
+
+# Title matches rank above description matches. Must match SEARCH_DOCUMENT in
+# app/modules/todos/repository.py exactly, or the planner will not use the
+# index.
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # SQLite search falls back to LIKE on title/description.
+        return
+
+    # Build without an exclusive lock so writes continue during the migration.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_search_vector "
+            f"ON todos USING gin (({SEARCH_DOCUMENT}));"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_todos_search_vector",
+            table_name="todos",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,333 @@
+"""range-partition todos by created_at (monthly) with an id locator
+
+Revision ID: 20261017_todos_partitioned
+Revises: 20261017_todos_filter_idx
+Create Date: 2026-10-17 13:00:00
+
+PostgreSQL only. `todos` is rebuilt as a table partitioned by month on
+`created_at` (partitions `todos_pYYYYMM`, UTC month bounds). The swap copies
+every row under an ACCESS EXCLUSIVE lock, so run it in a maintenance window.
+
+- `todo_locator` (id -> created_at) is kept by statement triggers so id
+  lookups can be pruned to the one partition holding the row.
+- `todos_ensure_partitions(months_ahead)` creates missing partitions from the
+  current month onward; schedule it (see docs/guides/partitioning.md).
+- `todos_drop_partitions_before(cutoff)` retires whole months, replacing
+  large DELETEs, and keeps the stats counters and locator in step.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261017_todos_partitioned"
+down_revision = "20261017_todos_filter_idx"
+branch_labels = None
+depends_on = None
+
+PARTITION_MONTHS_AHEAD = 3
+
+# (name, columns, kwargs) for indexes on `todos`; on the partitioned table
+# each is created on every partition automatically.
+INDEXES = (
+    ("ix_todos_id", ["id"], {}),
+    ("ix_todos_created_at_id", ["created_at", "id"], {}),
+    (
+        "ix_todos_open_created_at_id",
+        ["created_at", "id"],
+        {"postgresql_where": sa.text("is_completed = false")},
+    ),
+    ("ix_todos_updated_at_id", ["updated_at", "id"], {}),
+    ("ix_todos_title_id", ["title", "id"], {}),
+    (
+        "ix_todos_search_vector",
+        # Same expression as migration 20261017_todos_search_vector.
+        [
+            sa.text(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+            )
+        ],
+        {"postgresql_using": "gin"},
+    ),
+)
+
+TRIGGERS = (
+    """
+    CREATE TRIGGER trg_todos_set_updated_at
+    BEFORE UPDATE ON todos
+    FOR EACH ROW
+    EXECUTE FUNCTION set_todos_updated_at();
+    """,
+    """
+    CREATE TRIGGER trg_todos_stats_insert
+    AFTER INSERT ON todos
+    REFERENCING NEW TABLE AS inserted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION todo_stats_on_insert();
+    """,
+    """
+    CREATE TRIGGER trg_todos_stats_update
+    AFTER UPDATE ON todos
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION todo_stats_on_update();
+    """,
+    """
+    CREATE TRIGGER trg_todos_stats_delete
+    AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION todo_stats_on_delete();
+    """,
+)
+
+LOCATOR_TRIGGERS = (
+    """
+    CREATE TRIGGER trg_todos_locator_insert
+    AFTER INSERT ON todos
+    REFERENCING NEW TABLE AS inserted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION todo_locator_on_insert();
+    """,
+    """
+    CREATE TRIGGER trg_todos_locator_delete
+    AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION todo_locator_on_delete();
+    """,
+)
+
+COLUMNS_DDL = """
+    id integer NOT NULL DEFAULT nextval('todos_id_seq'::regclass),
+    title varchar(255) NOT NULL,
+    description varchar(1024),
+    is_completed boolean NOT NULL DEFAULT false,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now()
+"""
+
+COPY_COLUMNS = "id, title, description, is_completed, created_at, updated_at"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "todo_locator",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # SQLite has no declarative partitioning; the locator table exists only
+        # so the schema matches the ORM models.
+        return
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION todos_ensure_partitions(
+            months_ahead integer DEFAULT 3,
+            from_month date DEFAULT NULL
+        )
+        RETURNS integer AS $$
+        DECLARE
+            month_start date := date_trunc(
+                'month', coalesce(from_month, (now() AT TIME ZONE 'UTC')::date)
+            );
+            last_month date := date_trunc('month', (now() AT TIME ZONE 'UTC')::date)
+                + make_interval(months => months_ahead);
+            partition_name text;
+            created integer := 0;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                partition_name := format('todos_p%s', to_char(month_start, 'YYYYMM'));
+                IF to_regclass(partition_name) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF todos '
+                        'FOR VALUES FROM (%L) TO (%L)',
+                        partition_name,
+                        month_start::timestamp AT TIME ZONE 'UTC',
+                        (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+                    );
+                    created := created + 1;
+                END IF;
+                month_start := month_start + interval '1 month';
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION todos_drop_partitions_before(cutoff timestamptz)
+        RETURNS integer AS $$
+        DECLARE
+            partition_name text;
+            upper_bound timestamptz;
+            removed_total bigint;
+            removed_completed bigint;
+            min_id integer;
+            max_id integer;
+            dropped integer := 0;
+        BEGIN
+            FOR partition_name IN
+                SELECT c.relname
+                FROM pg_inherits AS i
+                JOIN pg_class AS c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'todos'::regclass
+                  AND c.relname ~ '^todos_p[0-9]{6}$'
+                ORDER BY c.relname
+            LOOP
+                upper_bound := (
+                    to_date(substr(partition_name, 8), 'YYYYMM') + interval '1 month'
+                )::timestamp AT TIME ZONE 'UTC';
+                CONTINUE WHEN upper_bound > cutoff;
+
+                EXECUTE format('ALTER TABLE todos DETACH PARTITION %I', partition_name);
+                EXECUTE format(
+                    'SELECT count(*), count(*) FILTER (WHERE is_completed), '
+                    'min(id), max(id) FROM %I',
+                    partition_name
+                ) INTO removed_total, removed_completed, min_id, max_id;
+
+                -- Dropping a partition fires no DELETE triggers; settle the
+                -- running totals and the locator by hand.
+                IF removed_total > 0 THEN
+                    INSERT INTO todo_stats_counters AS c (slot, total, completed)
+                    VALUES (0, -removed_total, -removed_completed)
+                    ON CONFLICT (slot) DO UPDATE
+                    SET total = c.total + EXCLUDED.total,
+                        completed = c.completed + EXCLUDED.completed;
+
+                    DELETE FROM todo_locator
+                    WHERE id BETWEEN min_id AND max_id
+                      AND created_at < upper_bound;
+                END IF;
+
+                EXECUTE format('DROP TABLE %I', partition_name);
+                dropped := dropped + 1;
+            END LOOP;
+            RETURN dropped;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION todo_locator_on_insert()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO todo_locator (id, created_at)
+            SELECT id, created_at FROM inserted_rows;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION todo_locator_on_delete()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            DELETE FROM todo_locator AS l
+            USING deleted_rows AS d
+            WHERE l.id = d.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    # Swap in the partitioned table. Triggers are created after the copy so the
+    # already-counted rows are not added to the stats a second time.
+    op.execute("LOCK TABLE todos IN ACCESS EXCLUSIVE MODE;")
+    op.execute("ALTER TABLE todos RENAME TO todos_unpartitioned;")
+    op.execute(
+        "ALTER TABLE todos_unpartitioned "
+        "RENAME CONSTRAINT todos_pkey TO todos_unpartitioned_pkey;"
+    )
+    # The primary key must include the partition key; ids stay unique through
+    # the sequence and the locator's primary key.
+    op.execute(
+        f"""
+        CREATE TABLE todos (
+            {COLUMNS_DDL},
+            CONSTRAINT todos_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at);
+        """
+    )
+    # Cover existing rows plus the previous month (for backdated seed data).
+    op.execute(
+        f"""
+        SELECT todos_ensure_partitions(
+            {PARTITION_MONTHS_AHEAD},
+            (
+                SELECT (
+                    least(min(created_at), now() - interval '1 month')
+                    AT TIME ZONE 'UTC'
+                )::date
+                FROM todos_unpartitioned
+            )
+        );
+        """
+    )
+    op.execute(
+        f"INSERT INTO todos ({COPY_COLUMNS}) "
+        f"SELECT {COPY_COLUMNS} FROM todos_unpartitioned;"
+    )
+    op.execute(
+        "INSERT INTO todo_locator (id, created_at) SELECT id, created_at FROM todos;"
+    )
+    op.execute("ALTER SEQUENCE todos_id_seq OWNED BY todos.id;")
+    op.execute("DROP TABLE todos_unpartitioned;")
+
+    for name, columns, kwargs in INDEXES:
+        op.create_index(name, "todos", columns, **kwargs)
+    for statement in TRIGGERS + LOCATOR_TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.drop_table("todo_locator")
+        return
+
+    op.execute("LOCK TABLE todos IN ACCESS EXCLUSIVE MODE;")
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="todos")
+    op.execute("ALTER TABLE todos RENAME TO todos_partitioned;")
+    op.execute(
+        "ALTER TABLE todos_partitioned "
+        "RENAME CONSTRAINT todos_pkey TO todos_partitioned_pkey;"
+    )
+    op.execute(
+        f"""
+        CREATE TABLE todos (
+            {COLUMNS_DDL},
+            CONSTRAINT todos_pkey PRIMARY KEY (id)
+        );
+        """
+    )
+    op.execute(
+        f"INSERT INTO todos ({COPY_COLUMNS}) "
+        f"SELECT {COPY_COLUMNS} FROM todos_partitioned;"
+    )
+    op.execute("ALTER SEQUENCE todos_id_seq OWNED BY todos.id;")
+    # Drops the partitions and the triggers defined on them.
+    op.execute("DROP TABLE todos_partitioned;")
+
+    for name, columns, kwargs in INDEXES:
+        op.create_index(name, "todos", columns, **kwargs)
+    for statement in TRIGGERS:
+        op.execute(statement)
+
+    op.execute("DROP FUNCTION IF EXISTS todo_locator_on_delete();")
+    op.execute("DROP FUNCTION IF EXISTS todo_locator_on_insert();")
+    op.execute("DROP FUNCTION IF EXISTS todos_drop_partitions_before(timestamptz);")
+    op.execute("DROP FUNCTION IF EXISTS todos_ensure_partitions(integer, date);")
+    op.drop_table("todo_locator")
@@ -1,66 +1,304 @@
 """HTTP routes for todo resources (API v1)."""
 
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.v1.schemas.todos import TodoCreate, TodoListResponse, TodoRead, TodoUpdate
-from app.core.database import get_db
+from app.api.v1.schemas.todos import (
+    TODO_BATCH_MAX_ITEMS,
+    TodoBatchCreateRequest,
+    TodoBatchCreateResponse,
+    TodoBatchDeleteResponse,
+    TodoBatchUpdateRequest,
+    TodoBatchUpdateResponse,
+    TodoCreate,
+    TodoFilter,
+    TodoImportResponse,
+    TodoListResponse,
+    TodoRead,
+    TodoSearchResponse,
+    TodoSort,
+    TodoStatsResponse,
+    TodoUpdate,
+    TotalMode,
+)
+from app.core.conditional import (
+    CACHE_NO_STORE,
+    CACHE_REVALIDATE,
+    Validators,
+    cache_control,
+    entity_tag,
+    has_preconditions,
+    is_not_modified,
+    not_modified_response,
+)
+from app.core.database import attach_consistency_token, get_db, get_read_db
+from app.core.deadline import route_deadline
+from app.core.exceptions import BadRequestError
 from app.core.logging.logger import get_logger
 from app.core.security.dependencies import require_roles
+from app.modules.todos.codecs import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    ImportFormat,
+    encode_csv,
+    encode_ndjson,
+    iter_import_records,
+)
 from app.modules.todos.mapper import (
+    to_api_batch_create_response,
+    to_api_batch_delete_response,
+    to_api_batch_update_response,
+    to_api_import_response,
     to_api_list_response,
     to_api_read,
+    to_api_search_response,
+    to_api_stats,
+    to_module_batch_updates,
     to_module_create,
+    to_module_create_batch,
+    to_module_filter,
+    to_module_import_rows,
     to_module_update,
 )
 from app.modules.todos.service import TodoService
 
 TODO_READ_ROLE = "Todos.Read"
 TODO_WRITE_ROLE = "Todos.Write"
+# Stats are aggregates over days; a minute of staleness is acceptable.
+STATS_CACHE_CONTROL = "private, max-age=60"
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
-def get_todo_service(db: Annotated[AsyncSession, Depends(get_db)]) -> TodoService:
+DbSessionDep = Annotated[AsyncSession, Depends(get_db)]
+
+
+def get_todo_service(db: DbSessionDep) -> TodoService:
+    return TodoService(db)
+
+
+ReadDbSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+
+def get_read_todo_service(db: ReadDbSessionDep) -> TodoService:
     return TodoService(db)
 
 
 TodoServiceDep = Annotated[TodoService, Depends(get_todo_service)]
+ReadTodoServiceDep = Annotated[TodoService, Depends(get_read_todo_service)]
+
+
+def get_todo_filter(
+    is_completed: bool | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    updated_after: datetime | None = None,
+) -> TodoFilter:
+    return TodoFilter(
+        is_completed=is_completed,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+    )
+
+
+TodoFilterDep = Annotated[TodoFilter, Depends(get_todo_filter)]
+
+
+def _todo_validators(todo_id: int, version: int, updated_at: datetime) -> Validators:
+    return Validators(etag=entity_tag(todo_id, version), last_modified=updated_at)
+
+
+def _page_validators(page: dict) -> Validators:
+    # Weak: derived from row versions rather than the serialized bytes. No
+    # Last-Modified, since rows leaving the page do not advance any timestamp.
+    return Validators(
+        etag=entity_tag(
+            page["total"],
+            page["total_mode"],
+            page["limit"],
+            page["offset"],
+            page.get("next_cursor"),
+            *(f"{item.id}@{item.version}" for item in page["items"]),
+            weak=True,
+        )
+    )
 
 
 @router.get(
     "/",
     response_model=TodoListResponse,
-    dependencies=[Depends(require_roles(TODO_READ_ROLE))],
+    dependencies=[
+        Depends(require_roles(TODO_READ_ROLE)),
+        Depends(cache_control(CACHE_REVALIDATE)),
+    ],
 )
 async def list_todos(
-    service: TodoServiceDep,
+    service: ReadTodoServiceDep,
+    filters: TodoFilterDep,
     request: Request,
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, max_length=512),
+    include_total: Annotated[TotalMode, Query()] = "exact",
+    sort: Annotated[TodoSort, Query()] = "-created_at",
+    include_archived: bool = Query(False),
 ):
     logger.info(
         "List todos request",
-        extra={"path": request.url.path, "limit": limit, "offset": offset},
+        extra={
+            "path": request.url.path,
+            "limit": limit,
+            "offset": offset,
+            "keyset": cursor is not None,
+            "include_total": include_total,
+            "sort": sort,
+            "include_archived": include_archived,
+            "filtered": not filters.is_empty(),
+        },
     )
-    todos = await service.list_todos(limit=limit, offset=offset)
+    todos = await service.list_todos(
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        total_mode=include_total,
+        filters=to_module_filter(filters),
+        sort=sort,
+        include_archived=include_archived,
+    )
+    validators = _page_validators(todos)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators, CACHE_REVALIDATE)
+    response.headers.update(validators.headers())
     return to_api_list_response(todos)
 
 
+@router.get(
+    "/stats",
+    response_model=TodoStatsResponse,
+    dependencies=[
+        Depends(require_roles(TODO_READ_ROLE)),
+        Depends(cache_control(STATS_CACHE_CONTROL)),
+    ],
+)
+async def get_todo_stats(
+    service: ReadTodoServiceDep,
+    request: Request,
+    days: int = Query(7, ge=1, le=90),
+):
+    logger.info(
+        "Todo stats request",
+        extra={"path": request.url.path, "days": days},
+    )
+    stats = await service.get_stats(days=days)
+    return to_api_stats(stats)
+
+
+@router.get(
+    "/search",
+    response_model=TodoSearchResponse,
+    dependencies=[
+        Depends(require_roles(TODO_READ_ROLE)),
+        Depends(cache_control(CACHE_REVALIDATE)),
+    ],
+)
+async def search_todos(
+    service: ReadTodoServiceDep,
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, max_length=512),
+):
+    logger.info(
+        "Search todos request",
+        extra={
+            "path": request.url.path,
+            "limit": limit,
+            "keyset": cursor is not None,
+        },
+    )
+    results = await service.search_todos(q, limit=limit, cursor=cursor)
+    return to_api_search_response(results)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    # Long-running by design: only a client-sent deadline bounds an export.
+    dependencies=[
+        Depends(require_roles(TODO_READ_ROLE)),
+        Depends(route_deadline(None)),
+    ],
+)
+async def export_todos(
+    service: ReadTodoServiceDep,
+    db: ReadDbSessionDep,
+    filters: TodoFilterDep,
+    request: Request,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+):
+    logger.info(
+        "Export todos request",
+        extra={"path": request.url.path, "format": export_format},
+    )
+    fieldnames = list(TodoRead.model_fields)
+
+    async def body():
+        # Dependency teardown closes the session before streaming starts; the
+        # session reconnects lazily here and must be closed once we are done.
+        # A client disconnect cancels this generator, ending the cursor fetch.
+        try:
+            if export_format == "csv":
+                yield encode_csv([], fieldnames, include_header=True)
+            async for todos in service.export_todos(to_module_filter(filters)):
+                rows = [to_api_read(todo).model_dump(mode="json") for todo in todos]
+                if export_format == "csv":
+                    yield encode_csv(rows, fieldnames)
+                else:
+                    yield encode_ndjson(rows)
+        finally:
+            await db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="todos.{export_format}"',
+            "Cache-Control": CACHE_NO_STORE,
+        },
+    )
+
+
 @router.get(
     "/{todo_id}",
     response_model=TodoRead,
-    dependencies=[Depends(require_roles(TODO_READ_ROLE))],
+    dependencies=[
+        Depends(require_roles(TODO_READ_ROLE)),
+        Depends(cache_control(CACHE_REVALIDATE)),
+    ],
 )
-async def get_todo(todo_id: int, service: TodoServiceDep, request: Request):
+async def get_todo(
+    todo_id: int, service: ReadTodoServiceDep, request: Request, response: Response
+):
     logger.info(
         "Get todo request",
         extra={"todo_id": todo_id, "path": request.url.path},
     )
+    if has_preconditions(request):
+        # Revalidation needs only the version, not the hydrated row.
+        version, updated_at = await service.get_todo_version(todo_id)
+        validators = _todo_validators(todo_id, version, updated_at)
+        if is_not_modified(request, validators):
+            return not_modified_response(validators, CACHE_REVALIDATE)
     todo = await service.get_todo(todo_id)
+    validators = _todo_validators(todo.id, todo.version, todo.updated_at)
+    response.headers.update(validators.headers())
     return to_api_read(todo)
 
 
@@ -68,42 +306,207 @@ async def get_todo(todo_id: int, service: TodoServiceDep, request: Request):
     "/",
     response_model=TodoRead,
     status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(require_roles(TODO_WRITE_ROLE))],
+    dependencies=[
+        Depends(require_roles(TODO_WRITE_ROLE)),
+        Depends(cache_control(CACHE_NO_STORE)),
+    ],
 )
-async def create_todo(payload: TodoCreate, service: TodoServiceDep, request: Request):
+async def create_todo(
+    payload: TodoCreate,
+    service: TodoServiceDep,
+    db: DbSessionDep,
+    request: Request,
+    response: Response,
+):
     logger.info("Create todo request", extra={"path": request.url.path})
     todo = await service.create_todo(to_module_create(payload))
+    await attach_consistency_token(response, db)
     return to_api_read(todo)
 
 
+@router.post(
+    ":batch",
+    response_model=TodoBatchCreateResponse,
+    dependencies=[
+        Depends(require_roles(TODO_WRITE_ROLE)),
+        Depends(cache_control(CACHE_NO_STORE)),
+    ],
+)
+async def create_todos_batch(
+    payload: TodoBatchCreateRequest,
+    service: TodoServiceDep,
+    db: DbSessionDep,
+    request: Request,
+    response: Response,
+):
+    logger.info(
+        "Batch create todos request",
+        extra={"path": request.url.path, "count": len(payload.items)},
+    )
+    creates, errors = to_module_create_batch(payload)
+    todos = await service.create_todos(creates, rejected=len(errors))
+    await attach_consistency_token(response, db)
+    return to_api_batch_create_response(todos, errors)
+
+
+@router.post(
+    "/import",
+    response_model=TodoImportResponse,
+    dependencies=[
+        Depends(require_roles(TODO_WRITE_ROLE)),
+        Depends(route_deadline(None)),
+        Depends(cache_control(CACHE_NO_STORE)),
+    ],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in EXPORT_MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_todos(
+    service: TodoServiceDep,
+    db: DbSessionDep,
+    request: Request,
+    response: Response,
+    import_format: Annotated[ImportFormat, Query(alias="format")] = "ndjson",
+):
+    logger.info(
+        "Import todos request",
+        extra={"path": request.url.path, "format": import_format},
+    )
+    records = iter_import_records(request.stream(), import_format)
+    imported, rejected, errors = await service.import_todos(
+        to_module_import_rows(records)
+    )
+    await attach_consistency_token(response, db)
+    return to_api_import_response(imported, rejected, errors)
+
+
+@router.patch(
+    ":batch",
+    response_model=TodoBatchUpdateResponse,
+    dependencies=[
+        Depends(require_roles(TODO_WRITE_ROLE)),
+        Depends(cache_control(CACHE_NO_STORE)),
+    ],
+)
+async def update_todos_batch(
+    payload: TodoBatchUpdateRequest,
+    service: TodoServiceDep,
+    db: DbSessionDep,
+    request: Request,
+    response: Response,
+):
+    logger.info(
+        "Batch update todos request",
+        extra={
+            "path": request.url.path,
+            "count": len(payload.items) if payload.items else None,
+            "filtered": payload.filter is not None,
+        },
+    )
+    if payload.items is not None:
+        todos, not_found = await service.update_todos(
+            to_module_batch_updates(payload.items)
+        )
+    else:
+        # Same cap as items mode: a broad filter is rejected, not run.
+        todos = await service.update_todos_matching(
+            to_module_filter(payload.filter),
+            to_module_update(payload.changes),
+            max_rows=TODO_BATCH_MAX_ITEMS,
+        )
+        not_found = []
+    await attach_consistency_token(response, db)
+    return to_api_batch_update_response(todos, not_found)
+
+
 @router.put(
     "/{todo_id}",
     response_model=TodoRead,
-    dependencies=[Depends(require_roles(TODO_WRITE_ROLE))],
+    dependencies=[
+        Depends(require_roles(TODO_WRITE_ROLE)),
+        Depends(cache_control(CACHE_NO_STORE)),
+    ],
 )
 async def update_todo(
     todo_id: int,
     payload: TodoUpdate,
     service: TodoServiceDep,
+    db: DbSessionDep,
     request: Request,
+    response: Response,
 ):
     logger.info(
         "Update todo request",
         extra={"todo_id": todo_id, "path": request.url.path},
     )
     todo = await service.update_todo(todo_id, to_module_update(payload))
+    await attach_consistency_token(response, db)
     return to_api_read(todo)
 
 
+@router.delete(
+    ":batch",
+    response_model=TodoBatchDeleteResponse,
+    dependencies=[
+        Depends(require_roles(TODO_WRITE_ROLE)),
+        Depends(cache_control(CACHE_NO_STORE)),
+    ],
+)
+async def delete_todos_batch(
+    service: TodoServiceDep,
+    filters: TodoFilterDep,
+    db: DbSessionDep,
+    request: Request,
+    response: Response,
+    ids: Annotated[
+        list[int] | None, Query(min_length=1, max_length=TODO_BATCH_MAX_ITEMS)
+    ] = None,
+):
+    logger.info(
+        "Batch delete todos request",
+        extra={
+            "path": request.url.path,
+            "count": len(ids) if ids else None,
+            "filtered": not filters.is_empty(),
+        },
+    )
+    if (ids is None) == filters.is_empty():
+        raise BadRequestError("Provide either ids or at least one filter")
+
+    if ids is not None:
+        deleted, not_found = await service.delete_todos(ids)
+    else:
+        deleted = await service.delete_todos_matching(to_module_filter(filters))
+        not_found = []
+    await attach_consistency_token(response, db)
+    return to_api_batch_delete_response(deleted, not_found)
+
+
 @router.delete(
     "/{todo_id}",
     status_code=status.HTTP_204_NO_CONTENT,
-    dependencies=[Depends(require_roles(TODO_WRITE_ROLE))],
+    dependencies=[
+        Depends(require_roles(TODO_WRITE_ROLE)),
+        Depends(cache_control(CACHE_NO_STORE)),
+    ],
 )
-async def delete_todo(todo_id: int, service: TodoServiceDep, request: Request):
+async def delete_todo(
+    todo_id: int,
+    service: TodoServiceDep,
+    db: DbSessionDep,
+    request: Request,
+    response: Response,
+):
     logger.info(
         "Delete todo request",
         extra={"todo_id": todo_id, "path": request.url.path},
     )
     await service.delete_todo(todo_id)
+    await attach_consistency_token(response, db)
     return None
@@ -7,10 +7,24 @@ Do not import module-layer schemas here; cross-layer translation is handled by
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+TotalMode = Literal["exact", "estimated", "none"]
+# Whitelisted list orderings; a leading "-" sorts descending.
+TodoSort = Literal[
+    "created_at",
+    "-created_at",
+    "updated_at",
+    "-updated_at",
+    "title",
+    "-title",
+]
+
+TODO_BATCH_MAX_ITEMS = 500
+
 
 class TodoBase(BaseModel):
     title: str = Field(..., max_length=255)
@@ -51,6 +65,16 @@ class TodoUpdate(BaseModel):
         return self
 
 
+class TodoFilter(BaseModel):
+    is_completed: bool | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+
+    def is_empty(self) -> bool:
+        return not any(value is not None for value in self.model_dump().values())
+
+
 class TodoRead(TodoBase):
     id: int
     is_completed: bool
@@ -62,6 +86,97 @@ class TodoRead(TodoBase):
 
 class TodoListResponse(BaseModel):
     items: list[TodoRead]
-    total: int
+    total: int | None
+    total_mode: TotalMode = "exact"
     limit: int
     offset: int
+    next_cursor: str | None = None
+
+
+class TodoSearchResponse(BaseModel):
+    # Ranked best match first; follow `next_cursor` for further pages.
+    items: list[TodoRead]
+    limit: int
+    next_cursor: str | None = None
+
+
+class TodoDailyStats(BaseModel):
+    day: date
+    created: int
+    completed: int
+
+
+class TodoStatsResponse(BaseModel):
+    total: int
+    completed: int
+    open: int
+    daily: list[TodoDailyStats]
+
+
+class TodoBatchCreateRequest(BaseModel):
+    # Items are validated one by one (see mapper) so a bad item is reported
+    # instead of rejecting the whole batch.
+    items: list[Any] = Field(..., min_length=1, max_length=TODO_BATCH_MAX_ITEMS)
+
+
+class TodoBatchItemError(BaseModel):
+    index: int
+    details: list[dict[str, Any]]
+
+
+class TodoBatchCreateResponse(BaseModel):
+    items: list[TodoRead]
+    errors: list[TodoBatchItemError]
+
+
+class TodoImportResponse(BaseModel):
+    imported: int
+    rejected: int
+    # `index` is the 1-based data record number; capped at the first 100.
+    errors: list[TodoBatchItemError]
+
+
+class TodoBatchUpdateItem(BaseModel):
+    id: int
+    changes: TodoUpdate
+
+    @model_validator(mode="after")
+    def require_changes(self) -> TodoBatchUpdateItem:
+        if not self.changes.model_fields_set:
+            raise ValueError("changes must set at least one field")
+        return self
+
+
+class TodoBatchUpdateRequest(BaseModel):
+    """Either per-id `items`, or a `filter` plus one `changes` set."""
+
+    items: list[TodoBatchUpdateItem] | None = Field(
+        None, min_length=1, max_length=TODO_BATCH_MAX_ITEMS
+    )
+    filter: TodoFilter | None = None
+    changes: TodoUpdate | None = None
+
+    @model_validator(mode="after")
+    def check_mode(self) -> TodoBatchUpdateRequest:
+        if self.items is not None:
+            if self.filter is not None or self.changes is not None:
+                raise ValueError("provide either items or filter with changes")
+            return self
+
+        if self.filter is None or self.changes is None:
+            raise ValueError("provide either items or filter with changes")
+        if self.filter.is_empty():
+            raise ValueError("filter must set at least one criterion")
+        if not self.changes.model_fields_set:
+            raise ValueError("changes must set at least one field")
+        return self
+
+
+class TodoBatchUpdateResponse(BaseModel):
+    items: list[TodoRead]
+    not_found: list[int]
+
+
+class TodoBatchDeleteResponse(BaseModel):
+    deleted: list[int]
+    not_found: list[int]
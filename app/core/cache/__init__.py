@@ -0,0 +1,29 @@
+"""Shared cache tier: pluggable backends, versioned keys and a circuit breaker."""
+
+from app.core.cache.backends import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    cache_backend,
+    close_cache_backend,
+    create_cache_backend,
+)
+from app.core.cache.breaker import CircuitBreaker
+from app.core.cache.versioned import (
+    INITIAL_VERSION,
+    CacheUnavailableError,
+    VersionedCache,
+)
+
+__all__ = [
+    "INITIAL_VERSION",
+    "CacheBackend",
+    "CacheUnavailableError",
+    "CircuitBreaker",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "VersionedCache",
+    "cache_backend",
+    "close_cache_backend",
+    "create_cache_backend",
+]
@@ -0,0 +1,115 @@
+"""Key/value backends for the shared cache tier.
+
+`RedisCacheBackend` talks to any Redis-protocol server (Azure Cache for
+Redis, Redis, Valkey); `MemoryCacheBackend` keeps entries in the process and
+stands in for it in tests and single-instance development.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Protocol
+
+from app.core.config import Settings, get_settings
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None: ...
+
+    async def set_many(self, items: list[tuple[str, bytes, float]]) -> None:
+        """Set `(key, value, ttl_seconds)` items in one round trip."""
+
+    async def close(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """Dictionary with per-key expiry; expired keys are dropped on read."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._entries: dict[str, tuple[float, bytes]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self.clock():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries[key] = (self.clock() + ttl_seconds, value)
+
+    async def set_many(self, items: list[tuple[str, bytes, float]]) -> None:
+        for key, value, ttl_seconds in items:
+            await self.set(key, value, ttl_seconds)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Backend on a `redis.asyncio` client (pass one in, e.g. fakeredis)."""
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str, timeout_seconds: float) -> RedisCacheBackend:
+        from redis.asyncio import Redis
+
+        return cls(
+            Redis.from_url(
+                url,
+                socket_timeout=timeout_seconds,
+                socket_connect_timeout=timeout_seconds,
+                health_check_interval=30,
+            )
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self.client.set(key, value, px=_ttl_ms(ttl_seconds))
+
+    async def set_many(self, items: list[tuple[str, bytes, float]]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value, ttl_seconds in items:
+                pipe.set(key, value, px=_ttl_ms(ttl_seconds))
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def _ttl_ms(ttl_seconds: float) -> int:
+    return max(1, int(ttl_seconds * 1000))
+
+
+def create_cache_backend(settings: Settings) -> CacheBackend | None:
+    """Build the backend selected by `CACHE_BACKEND`; None when disabled."""
+    if settings.cache_backend == "memory":
+        return MemoryCacheBackend()
+    if settings.cache_backend == "redis":
+        if not settings.cache_redis_url:
+            raise RuntimeError("CACHE_REDIS_URL is required when CACHE_BACKEND=redis")
+        # The per-operation budget is enforced by VersionedCache; the socket
+        # timeout only backs it up.
+        return RedisCacheBackend.from_url(
+            settings.cache_redis_url,
+            timeout_seconds=max(1.0, settings.cache_op_timeout_ms / 1000 * 4),
+        )
+    return None
+
+
+cache_backend = create_cache_backend(get_settings())
+
+
+async def close_cache_backend() -> None:
+    if cache_backend is not None:
+        await cache_backend.close()
@@ -0,0 +1,76 @@
+"""Circuit breaker that takes a slow or failing cache out of the request path."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Literal
+
+from app.core.logging.logger import get_logger
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+logger = get_logger(__name__)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures.
+
+    While open, callers skip the dependency entirely. After
+    `reset_timeout_seconds` a single trial call is let through (half-open):
+    success closes the breaker, failure re-opens it for another timeout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.clock = clock
+        self.state: BreakerState = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if self.clock() < self._opened_at + self.reset_timeout_seconds:
+                return False
+            self._transition("half_open")
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        if self.state != "closed":
+            self._transition("closed")
+
+    def release(self) -> None:
+        """Give up an allowed call without an outcome (e.g. it was cancelled)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            self._opened_at = self.clock()
+            if self.state != "open":
+                self._transition("open")
+
+    def _transition(self, state: BreakerState) -> None:
+        logger.warning(
+            "Circuit breaker state changed",
+            extra={"breaker": self.name, "from": self.state, "to": state},
+        )
+        self.state = state
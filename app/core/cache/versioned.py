@@ -0,0 +1,211 @@
+"""Versioned read-through cache on a shared backend.
+
+Every logical key has a version key next to its data keys:
+
+    {namespace}:ver:{key}        -> current version token
+    {namespace}:{key}:{version}  -> cached payload for that version
+
+A write stores the new payload under a fresh version and then points the
+version key at it, so replicas switch to the new value on their next read
+without any fan-out delete; payloads of old versions are never read again
+and simply expire. Because tokens are random rather than counters, a version
+key that expires can never bring an old payload back into view.
+
+Each backend call is bounded by `op_timeout_seconds` and guarded by a
+`CircuitBreaker`; when the backend is slow, failing or the breaker is open,
+reads fall through to the loader (the database) and writes are skipped.
+Concurrent misses for the same key and version in one process share a single
+load.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any
+
+from opentelemetry import metrics
+
+from app.core.cache.backends import CacheBackend
+from app.core.cache.breaker import CircuitBreaker
+from app.core.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Version of a key that has never been written (or whose version expired).
+INITIAL_VERSION = "0"
+# Version keys must outlive every payload written under them.
+VERSION_TTL_SECONDS = 7 * 24 * 3600
+
+_meter = metrics.get_meter("todo_api.cache")
+
+_lookups = _meter.create_counter(
+    name="cache.lookups",
+    unit="1",
+    description="Shared cache reads by result (hit/miss/unavailable).",
+)
+
+_errors = _meter.create_counter(
+    name="cache.errors",
+    unit="1",
+    description="Shared cache operations skipped or failed, by reason.",
+)
+
+Loader = Callable[[], Awaitable[tuple[bytes, float]]]
+
+
+class CacheUnavailableError(Exception):
+    """The backend timed out, failed, or its circuit breaker is open."""
+
+
+class VersionedCache:
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str,
+        *,
+        op_timeout_seconds: float,
+        breaker: CircuitBreaker,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.op_timeout_seconds = op_timeout_seconds
+        self.breaker = breaker
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+
+    async def version(self, key: str) -> str | None:
+        """Current version token of `key`; None when the cache is unavailable."""
+        try:
+            token = await self._call(
+                "version", self.backend.get(self._version_key(key))
+            )
+        except CacheUnavailableError:
+            return None
+        return token.decode() if token is not None else INITIAL_VERSION
+
+    async def get_or_load(self, key: str, version: str, load: Loader) -> bytes:
+        """Return the payload cached for `key` at `version`, loading it on a miss.
+
+        `load` returns the payload and how long to cache it. Loader errors
+        propagate; cache errors only mean the loader runs uncached.
+        """
+        data_key = self._data_key(key, version)
+        while (leader := self._inflight.get(data_key)) is not None:
+            try:
+                return await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                if not leader.cancelled():
+                    raise
+                # The leading request went away; the first follower to get
+                # here takes over and the others wait on it.
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting on it; don't warn about an unretrieved error.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[data_key] = future
+        try:
+            payload = await self._read_through(data_key, load)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(payload)
+            return payload
+        finally:
+            if self._inflight.get(data_key) is future:
+                del self._inflight[data_key]
+
+    async def write(self, key: str, payload: bytes | None, ttl_seconds: float) -> str:
+        """Publish a new version of `key`, cached with `payload` when given.
+
+        Returns the new version token; raises `CacheUnavailableError` if it
+        could not be published.
+        """
+        [version] = await self.write_many([(key, payload, ttl_seconds)])
+        return version
+
+    async def write_many(
+        self, entries: list[tuple[str, bytes | None, float]]
+    ) -> list[str]:
+        """`write` for several keys in two backend round trips."""
+        versions = [secrets.token_hex(8) for _ in entries]
+        payloads = [
+            (self._data_key(key, version), payload, ttl_seconds)
+            for (key, payload, ttl_seconds), version in zip(
+                entries, versions, strict=True
+            )
+            if payload is not None
+        ]
+        if payloads:
+            await self._call("write", self.backend.set_many(payloads))
+        # Payloads first: a reader never sees a version without its payload.
+        await self._call(
+            "write",
+            self.backend.set_many(
+                [
+                    (self._version_key(key), version.encode(), VERSION_TTL_SECONDS)
+                    for (key, _, _), version in zip(entries, versions, strict=True)
+                ]
+            ),
+        )
+        return versions
+
+    async def _read_through(self, data_key: str, load: Loader) -> bytes:
+        try:
+            cached = await self._call("get", self.backend.get(data_key))
+        except CacheUnavailableError:
+            _lookups.add(1, attributes=self._attributes(result="unavailable"))
+            payload, _ = await load()
+            return payload
+
+        if cached is not None:
+            _lookups.add(1, attributes=self._attributes(result="hit"))
+            return cached
+        _lookups.add(1, attributes=self._attributes(result="miss"))
+        payload, ttl_seconds = await load()
+        try:
+            await self._call("set", self.backend.set(data_key, payload, ttl_seconds))
+        except CacheUnavailableError:
+            pass
+        return payload
+
+    async def _call(self, operation: str, awaitable: Coroutine[Any, Any, Any]):
+        if not self.breaker.allow():
+            awaitable.close()
+            _errors.add(1, attributes=self._attributes(reason="circuit_open"))
+            raise CacheUnavailableError(f"{self.breaker.name} circuit open")
+        try:
+            async with asyncio.timeout(self.op_timeout_seconds):
+                result = await awaitable
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as exc:
+            self.breaker.record_failure()
+            reason = "timeout" if isinstance(exc, TimeoutError) else "error"
+            _errors.add(1, attributes=self._attributes(reason=reason))
+            logger.warning(
+                "Shared cache operation failed",
+                extra={
+                    "cache.namespace": self.namespace,
+                    "operation": operation,
+                    "reason": reason,
+                    "error": type(exc).__name__,
+                },
+            )
+            raise CacheUnavailableError(str(exc)) from exc
+        self.breaker.record_success()
+        return result
+
+    def _attributes(self, **extra: str) -> dict[str, str]:
+        return {"cache.namespace": self.namespace, **extra}
+
+    def _version_key(self, key: str) -> str:
+        return f"{self.namespace}:ver:{key}"
+
+    def _data_key(self, key: str, version: str) -> str:
+        return f"{self.namespace}:{key}:{version}"
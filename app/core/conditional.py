@@ -0,0 +1,99 @@
+"""HTTP validators and conditional GETs (ETag / Last-Modified / 304).
+
+Routes build `Validators` for what they are about to return, answer
+`not_modified_response` when `is_not_modified` says the client's copy is
+current, and otherwise attach the validators to the full response. Per-route
+`Cache-Control` policies are declared with the `cache_control` dependency.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+# Authenticated, per-user data: browsers may keep it, shared caches may not.
+CACHE_REVALIDATE = "private, no-cache"
+CACHE_NO_STORE = "no-store"
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: datetime | None = None
+
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                _utc(self.last_modified), usegmt=True
+            )
+        return headers
+
+
+def entity_tag(*parts: object, weak: bool = False) -> str:
+    """Opaque entity tag over `parts`; weak tags get the `W/` prefix."""
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def has_preconditions(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """Evaluate If-None-Match, else If-Modified-Since (RFC 9110 section 13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, validators.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validators.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have whole-second precision.
+    last_modified = _utc(validators.last_modified).replace(microsecond=0)
+    return last_modified <= _utc(since)
+
+
+def not_modified_response(validators: Validators, cache_control: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={**validators.headers(), "Cache-Control": cache_control},
+    )
+
+
+def cache_control(policy: str) -> Callable[[Response], None]:
+    """Route dependency setting `Cache-Control: policy` on the response."""
+
+    def _set_cache_control(response: Response) -> None:
+        response.headers["Cache-Control"] = policy
+
+    return _set_cache_control
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison function.
+    if header.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == target
+        for candidate in header.split(",")
+    )
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps; they are stored in UTC.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
@@ -1,6 +1,7 @@
 """Application configuration powered by Pydantic settings."""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -35,6 +36,24 @@ class Settings(BaseSettings):
     database_pool_timeout: int = Field(default=30, alias="DATABASE_POOL_TIMEOUT")
     database_pool_recycle: int = Field(default=1800, alias="DATABASE_POOL_RECYCLE")
     database_pool_pre_ping: bool = Field(default=True, alias="DATABASE_POOL_PRE_PING")
+    # Slow-query log (0 disables) and the share of slow statements re-planned
+    # with EXPLAIN (FORMAT JSON) on PostgreSQL.
+    slow_query_threshold_ms: int = Field(default=500, alias="SLOW_QUERY_THRESHOLD_MS")
+    slow_query_explain_sample_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        alias="SLOW_QUERY_EXPLAIN_SAMPLE_RATE",
+    )
+    # "transaction" when PgBouncer (transaction pooling) sits in front of PG.
+    database_pooler_mode: Literal["none", "transaction"] = Field(
+        default="none",
+        alias="DATABASE_POOLER_MODE",
+    )
+    database_pooler_null_pool: bool = Field(
+        default=False,
+        alias="DATABASE_POOLER_NULL_POOL",
+    )
     entra_db_token_lifetime_seconds: int = Field(
         default=3600,
         alias="ENTRA_DB_TOKEN_LIFETIME_SECONDS",
@@ -43,11 +62,161 @@ class Settings(BaseSettings):
         default=300,
         alias="ENTRA_DB_TOKEN_REFRESH_SKEW_SECONDS",
     )
+    # Entra connections retire at a random point within this window before
+    # their recycle ceiling / token expiry, spreading reconnects over time.
+    database_pool_recycle_jitter_seconds: int = Field(
+        default=300,
+        ge=0,
+        alias="DATABASE_POOL_RECYCLE_JITTER_SECONDS",
+    )
+    # "returning": single-statement INSERT/UPDATE/DELETE ... RETURNING writes.
+    # "orm": lock-load-flush-refresh unit-of-work writes.
+    todo_write_mode: Literal["returning", "orm"] = Field(
+        default="returning",
+        alias="TODO_WRITE_MODE",
+    )
+    # Archival of completed todos into `todos_archive`; the in-app schedule is
+    # off by default (scripts/archive_todos.py runs it on demand).
+    todo_archive_enabled: bool = Field(default=False, alias="TODO_ARCHIVE_ENABLED")
+    todo_archive_interval_seconds: int = Field(
+        default=3600,
+        ge=1,
+        alias="TODO_ARCHIVE_INTERVAL_SECONDS",
+    )
+    todo_archive_older_than_days: int = Field(
+        default=90,
+        ge=0,
+        alias="TODO_ARCHIVE_OLDER_THAN_DAYS",
+    )
+    todo_archive_batch_size: int = Field(
+        default=1000,
+        ge=1,
+        alias="TODO_ARCHIVE_BATCH_SIZE",
+    )
+    # Creates upcoming monthly `todos` partitions from inside the app
+    # (PostgreSQL only); the default partition catches rows if it falls behind.
+    todo_partition_maintenance_enabled: bool = Field(
+        default=True,
+        alias="TODO_PARTITION_MAINTENANCE_ENABLED",
+    )
+    todo_partition_interval_seconds: int = Field(
+        default=3600,
+        ge=1,
+        alias="TODO_PARTITION_INTERVAL_SECONDS",
+    )
+    todo_partition_months_ahead: int = Field(
+        default=3,
+        ge=1,
+        alias="TODO_PARTITION_MONTHS_AHEAD",
+    )
+    # In-process cache for GET /todos/{id} (0 entries disables it); not-found
+    # ids are cached as tombstones for the shorter negative TTL.
+    todo_cache_max_entries: int = Field(
+        default=10000,
+        ge=0,
+        alias="TODO_CACHE_MAX_ENTRIES",
+    )
+    todo_cache_ttl_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        alias="TODO_CACHE_TTL_SECONDS",
+    )
+    todo_cache_negative_ttl_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        alias="TODO_CACHE_NEGATIVE_TTL_SECONDS",
+    )
+    # Shared cache tier under the in-process one (see app.core.cache): "none",
+    # "memory" (single process; tests) or "redis" (Redis-protocol server).
+    cache_backend: Literal["none", "memory", "redis"] = Field(
+        default="none",
+        alias="CACHE_BACKEND",
+    )
+    cache_redis_url: str | None = Field(default=None, alias="CACHE_REDIS_URL")
+    # Cache calls slower than this count as failures; after enough consecutive
+    # failures the breaker skips the cache until the reset period has passed.
+    cache_op_timeout_ms: int = Field(default=50, ge=1, alias="CACHE_OP_TIMEOUT_MS")
+    cache_breaker_failure_threshold: int = Field(
+        default=5,
+        ge=1,
+        alias="CACHE_BREAKER_FAILURE_THRESHOLD",
+    )
+    cache_breaker_reset_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        alias="CACHE_BREAKER_RESET_SECONDS",
+    )
+    todo_shared_cache_ttl_seconds: float = Field(
+        default=300.0,
+        gt=0,
+        alias="TODO_SHARED_CACHE_TTL_SECONDS",
+    )
     database_url_override: str | None = Field(default=None, alias="DATABASE_URL")
     async_database_url_override: str | None = Field(
         default=None,
         alias="ASYNC_DATABASE_URL",
     )
+    # Optional read replica (async URL); GET routes read from it when set.
+    async_database_replica_url: str | None = Field(
+        default=None,
+        alias="ASYNC_DATABASE_REPLICA_URL",
+    )
+    database_replica_max_wait_ms: int = Field(
+        default=200,
+        alias="DATABASE_REPLICA_MAX_WAIT_MS",
+    )
+
+    # Admission control: per-process concurrency limit in front of the app.
+    # The initial limit defaults to DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW.
+    admission_control_enabled: bool = Field(
+        default=True,
+        alias="ADMISSION_CONTROL_ENABLED",
+    )
+    admission_initial_limit: int | None = Field(
+        default=None,
+        alias="ADMISSION_INITIAL_LIMIT",
+    )
+    admission_min_limit: int = Field(default=2, alias="ADMISSION_MIN_LIMIT")
+    admission_max_limit: int = Field(default=200, alias="ADMISSION_MAX_LIMIT")
+    admission_target_latency_ms: int = Field(
+        default=500,
+        alias="ADMISSION_TARGET_LATENCY_MS",
+    )
+    admission_max_queue: int = Field(default=50, alias="ADMISSION_MAX_QUEUE")
+    admission_max_queue_ms: int = Field(default=500, alias="ADMISSION_MAX_QUEUE_MS")
+
+    # Request deadlines: default budget (0 disables) and the cap applied to
+    # X-Request-Timeout / X-Request-Deadline sent by clients.
+    request_deadline_default_ms: int = Field(
+        default=15000,
+        alias="REQUEST_DEADLINE_DEFAULT_MS",
+    )
+    request_deadline_max_ms: int = Field(
+        default=60000,
+        alias="REQUEST_DEADLINE_MAX_MS",
+    )
+
+    # Start-up warm-up and shutdown drain (see app.core.lifecycle). Warm-up
+    # opens DATABASE_POOL_SIZE connections per engine unless overridden.
+    startup_warmup_enabled: bool = Field(default=True, alias="STARTUP_WARMUP_ENABLED")
+    startup_warmup_connections: int | None = Field(
+        default=None,
+        ge=1,
+        alias="STARTUP_WARMUP_CONNECTIONS",
+    )
+    startup_prime_jwks: bool = Field(default=True, alias="STARTUP_PRIME_JWKS")
+    shutdown_drain_timeout_seconds: float = Field(
+        default=10.0,
+        ge=0,
+        alias="SHUTDOWN_DRAIN_TIMEOUT_SECONDS",
+    )
+    # `python -m app.server`: time between the first SIGTERM (readiness turns
+    # 503) and uvicorn closing its listener.
+    shutdown_readiness_delay_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        alias="SHUTDOWN_READINESS_DELAY_SECONDS",
+    )
 
     # Application Insights
     applicationinsights_connection_string: str | None = None
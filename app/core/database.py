@@ -1,27 +1,76 @@
 """Database session and engine helpers."""
 
+import asyncio
+import contextlib
+import math
+import re
 import time
 from collections.abc import AsyncIterator
-from threading import Lock
+from typing import Annotated
+from uuid import uuid4
 
+from fastapi import Depends, Request, Response
 from sqlalchemy import event
-from sqlalchemy import exc as sa_exc
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql import text
+from sqlalchemy.util import await_only
 
 from app.core.config import get_settings
+from app.core.deadline import current_deadline, remaining_ms
+from app.core.exceptions import BadRequestError
+from app.core.lifecycle import warm_up_pool, warm_up_size
+from app.core.logging.logger import get_logger
+from app.core.observability.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    instrument_pool,
+)
+from app.core.observability.slow_query import install_slow_query_log
+from app.core.pool_recycling import PoolRecycler, install_jittered_recycle
 
 POSTGRES_ENTRA_SCOPE = "https://ossrdbms-aad.database.windows.net/.default"
 CONNECTION_EXPIRY_GUARD_SECONDS = 60
+ENTRA_TOKEN_EXPIRES_ON_KEY = "entra_token_expires_on"
+# Background refresh starts this many refresh-skews before token expiry, and
+# retries this often after a failure.
+TOKEN_REFRESH_LEAD_FACTOR = 2
+TOKEN_REFRESH_RETRY_SECONDS = 10
+
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+REPLICA_POLL_INTERVAL_SECONDS = 0.01
+# A transaction whose remaining budget is within this much below the
+# connection's default statement_timeout keeps the default: no SET LOCAL.
+STATEMENT_TIMEOUT_SLACK_MS = 1000
+
+_LSN_PATTERN = re.compile(r"[0-9A-F]{1,8}/[0-9A-F]{1,8}")
+_WAL_INSERT_LSN = "SELECT pg_current_wal_insert_lsn()::text"
+# `session.info` keys: whether the open transaction holds a connection, and
+# the token minted by its commit.
+_TRANSACTION_BEGUN_KEY = "consistency_token_begun"
+_CONSISTENCY_TOKEN_KEY = "consistency_token"
+_REPLAY_REACHED = text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)")
+
+logger = get_logger(__name__)
 
 
 class Base(DeclarativeBase):
     """Declarative base for ORM models."""
 
 
-def _create_engine_with_password():
+# Background recyclers for engines with jittered recycle deadlines (Entra).
+_pool_recyclers: dict[str, PoolRecycler] = {}
+
+
+def _create_engine_with_password(url: str | None = None):
     """Create async engine with password authentication."""
     settings = get_settings()
+    url = url or settings.async_database_url
 
     engine_kwargs: dict[str, object] = {
         "echo": settings.database_echo,
@@ -29,7 +78,7 @@ def _create_engine_with_password():
     }
 
     # SQLite pool options differ; keep defaults for sqlite-based tests/dev usage.
-    if not settings.async_database_url.startswith("sqlite"):
+    if not url.startswith("sqlite"):
         engine_kwargs.update(
             {
                 "pool_size": settings.database_pool_size,
@@ -37,21 +86,98 @@ def _create_engine_with_password():
                 "pool_timeout": settings.database_pool_timeout,
                 "pool_recycle": settings.database_pool_recycle,
                 "pool_pre_ping": settings.database_pool_pre_ping,
+                "poolclass": InstrumentedAsyncAdaptedQueuePool,
             }
         )
 
-    return create_async_engine(
-        settings.async_database_url,
-        **engine_kwargs,
-    )
+    _apply_pooler_mode(engine_kwargs, url)
+    _apply_statement_timeout(engine_kwargs, url)
+    return create_async_engine(url, **engine_kwargs)
+
+
+def _unique_prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def _apply_pooler_mode(engine_kwargs: dict[str, object], url: str) -> None:
+    """Adjust engine options for a transaction-pooling PgBouncer in front of PG.
+
+    In transaction mode consecutive transactions may land on different server
+    connections, so prepared statements cached per connection break. Disable
+    asyncpg's and SQLAlchemy's statement caches and give every prepared
+    statement a unique name. Optionally drop the client pool too, since
+    PgBouncer already pools server connections.
+    """
+    settings = get_settings()
+    if settings.database_pooler_mode != "transaction" or url.startswith("sqlite"):
+        return
+
+    engine_kwargs["connect_args"] = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": _unique_prepared_statement_name,
+    }
+    if settings.database_pooler_null_pool:
+        for key in ("pool_size", "max_overflow", "pool_timeout", "pool_pre_ping"):
+            engine_kwargs.pop(key, None)
+        engine_kwargs["poolclass"] = NullPool
+
+
+def _connection_statement_timeout_ms() -> int | None:
+    """statement_timeout every new PostgreSQL connection starts with, if any.
+
+    It is `REQUEST_DEADLINE_DEFAULT_MS`, so most transactions need no
+    `SET LOCAL`. Not set behind a transaction pooler: PgBouncer rejects
+    unknown startup parameters.
+    """
+    settings = get_settings()
+    if (
+        settings.database_pooler_mode == "transaction"
+        or settings.request_deadline_default_ms <= 0
+    ):
+        return None
+    return settings.request_deadline_default_ms
+
+
+def _apply_statement_timeout(engine_kwargs: dict[str, object], url: str) -> None:
+    timeout_ms = _connection_statement_timeout_ms()
+    if timeout_ms is None or not url.startswith("postgresql+asyncpg"):
+        return
+    # Sent in the startup packet, so it costs no extra round trip.
+    connect_args = engine_kwargs.setdefault("connect_args", {})
+    connect_args["server_settings"] = {"statement_timeout": str(timeout_ms)}
 
 
 class _PostgresTokenProvider:
-    """Caches Entra tokens for database login and refreshes before expiry."""
+    """Caches the Entra token used as the database password.
+
+    `get_token` runs inside `do_connect` on the event loop, so it only reads
+    the cache. A background task refreshes the token
+    `TOKEN_REFRESH_LEAD_FACTOR` x the refresh skew before expiry, well ahead of
+    the point where the cache stops serving it. Only when nothing usable is
+    cached (cold start, or refreshes kept failing) does a connect wait, and
+    then it awaits the async credential cooperatively instead of blocking the
+    loop; concurrent waiters share one fetch.
+    """
+
+    def __init__(self, credential: object | None = None):
+        self._credential = credential or self._default_credential()
+        settings = get_settings()
+        self._token: str | None = None
+        self._expires_on: float = 0
+        self._fetch_lock = asyncio.Lock()
+        self._refresher: asyncio.Task[None] | None = None
+        self._refresh_skew_seconds = max(
+            30, settings.entra_db_token_refresh_skew_seconds
+        )
 
-    def __init__(self):
+    @staticmethod
+    def _default_credential() -> object:
         try:
-            from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+            from azure.identity.aio import (
+                DefaultAzureCredential,
+                ManagedIdentityCredential,
+            )
         except ImportError as exc:  # pragma: no cover - enforced in packaging
             raise RuntimeError(
                 "azure-identity is required for Entra database authentication"
@@ -59,31 +185,76 @@ class _PostgresTokenProvider:
 
         settings = get_settings()
         if settings.azure_client_id:
-            self._credential = ManagedIdentityCredential(
-                client_id=settings.azure_client_id
-            )
-        else:
-            self._credential = DefaultAzureCredential(
-                exclude_interactive_browser_credential=True
-            )
-
-        self._token: str | None = None
-        self._expires_on: float = 0
-        self._lock = Lock()
-        self._refresh_skew_seconds = max(
-            30, settings.entra_db_token_refresh_skew_seconds
-        )
+            return ManagedIdentityCredential(client_id=settings.azure_client_id)
+        return DefaultAzureCredential(exclude_interactive_browser_credential=True)
 
     def get_token(self) -> tuple[str, float]:
-        now = time.time()
-        with self._lock:
-            if self._token and now < self._expires_on - self._refresh_skew_seconds:
-                return self._token, self._expires_on
+        """Return `(token, expires_on)`; call from a SQLAlchemy sync event."""
+        if not self._usable(time.time()):
+            # Inside the async engine's greenlet: yields to the loop while the
+            # credential round trip is in flight.
+            await_only(self._fetch(force=False))
+        self._ensure_refresher()
+        return self._token, self._expires_on
+
+    async def start(self) -> None:
+        """Fetch a token now and keep it refreshed in the background."""
+        await self._fetch(force=False)
+        self._ensure_refresher()
+
+    async def close(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresher
+            self._refresher = None
+        close = getattr(self._credential, "close", None)
+        if close is not None:
+            await close()
+
+    def _usable(self, now: float) -> bool:
+        return self._token is not None and now < (
+            self._expires_on - self._refresh_skew_seconds
+        )
 
-            token = self._credential.get_token(POSTGRES_ENTRA_SCOPE)
+    async def _fetch(self, *, force: bool) -> None:
+        async with self._fetch_lock:
+            if not force and self._usable(time.time()):
+                return
+            started = time.perf_counter()
+            token = await self._credential.get_token(POSTGRES_ENTRA_SCOPE)
             self._token = token.token
             self._expires_on = float(token.expires_on)
-            return self._token, self._expires_on
+        logger.info(
+            "Entra database token acquired",
+            extra={
+                "background": force,
+                "expires_in_seconds": round(self._expires_on - time.time()),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
+
+    def _ensure_refresher(self) -> None:
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.get_running_loop().create_task(
+                self._refresh_periodically()
+            )
+
+    def _next_refresh_delay(self, now: float) -> float:
+        refresh_at = self._expires_on - (
+            TOKEN_REFRESH_LEAD_FACTOR * self._refresh_skew_seconds
+        )
+        return max(TOKEN_REFRESH_RETRY_SECONDS, refresh_at - now)
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_refresh_delay(time.time()))
+            try:
+                await self._fetch(force=True)
+            except Exception:
+                # The cached token is still served until the skew window; a
+                # connect after that fetches on its own.
+                logger.exception("Entra database token refresh failed")
 
 
 def _safe_entra_pool_recycle_seconds() -> int:
@@ -95,9 +266,21 @@ def _safe_entra_pool_recycle_seconds() -> int:
     return min(settings.database_pool_recycle, recycle_ceiling)
 
 
-def _create_engine_with_entra():
-    """Create async engine that injects Entra access token for each new connection."""
+def _create_engine_with_entra(
+    url: str | None = None,
+    token_provider: _PostgresTokenProvider | None = None,
+    pool_name: str = "primary",
+):
+    """Create async engine that injects Entra access token for each new connection.
+
+    Pass a shared `token_provider` so primary and replica engines reuse one
+    cached token instead of each fetching their own. Each connection retires
+    at its own jittered deadline before the recycle ceiling or its token's
+    expiry; `start_pool_recyclers` replaces due idle connections in the
+    background so neither requests nor replicas reconnect in lockstep.
+    """
     settings = get_settings()
+    url = url or settings.async_database_url
 
     engine_kwargs: dict[str, object] = {
         "echo": settings.database_echo,
@@ -109,45 +292,59 @@ def _create_engine_with_entra():
             "pool_size": settings.database_pool_size,
             "max_overflow": settings.database_max_overflow,
             "pool_timeout": settings.database_pool_timeout,
+            # Backstop only: jittered deadlines come first.
             "pool_recycle": _safe_entra_pool_recycle_seconds(),
             "pool_pre_ping": settings.database_pool_pre_ping,
+            "poolclass": InstrumentedAsyncAdaptedQueuePool,
         }
     )
 
-    engine = create_async_engine(
-        settings.async_database_url,
-        **engine_kwargs,
-    )
+    _apply_pooler_mode(engine_kwargs, url)
+    _apply_statement_timeout(engine_kwargs, url)
+    engine = create_async_engine(url, **engine_kwargs)
 
-    token_provider = _PostgresTokenProvider()
+    token_provider = token_provider or _PostgresTokenProvider()
 
     @event.listens_for(engine.sync_engine, "do_connect")
     def _inject_access_token(dialect, conn_rec, cargs, cparams):  # noqa: ARG001
         token, expires_on = token_provider.get_token()
         cparams["password"] = token
-        conn_rec.info["entra_token_expires_on"] = expires_on
-
-    @event.listens_for(engine.sync_engine, "checkout")
-    def _invalidate_near_expiry_connections(
-        dbapi_conn, conn_rec, conn_proxy
-    ):  # noqa: ARG001
-        expires_on = float(conn_rec.info.get("entra_token_expires_on", 0))
-        now = time.time()
-        if now >= expires_on - CONNECTION_EXPIRY_GUARD_SECONDS:
-            conn_rec.invalidate()
-            raise sa_exc.DisconnectionError(
-                "Discarding pooled connection with near-expiry Entra token"
-            )
+        conn_rec.info[ENTRA_TOKEN_EXPIRES_ON_KEY] = expires_on
+
+    _pool_recyclers[pool_name] = install_jittered_recycle(
+        engine,
+        pool_name,
+        max_age_seconds=_safe_entra_pool_recycle_seconds(),
+        jitter_seconds=settings.database_pool_recycle_jitter_seconds,
+        expires_on_key=ENTRA_TOKEN_EXPIRES_ON_KEY,
+        expiry_guard_seconds=CONNECTION_EXPIRY_GUARD_SECONDS,
+    )
 
     return engine
 
 
+def _create_engine(
+    url: str,
+    token_provider: _PostgresTokenProvider | None,
+    pool_name: str = "primary",
+):
+    if token_provider is not None and not url.startswith("sqlite"):
+        return _create_engine_with_entra(url, token_provider, pool_name)
+    return _create_engine_with_password(url)
+
+
 settings = get_settings()
 
-if settings.use_entra_db_auth and not settings.async_database_url.startswith("sqlite"):
-    async_engine = _create_engine_with_entra()
-else:
-    async_engine = _create_engine_with_password()
+_token_provider = (
+    _PostgresTokenProvider()
+    if settings.use_entra_db_auth
+    and not settings.async_database_url.startswith("sqlite")
+    else None
+)
+
+async_engine = _create_engine(settings.async_database_url, _token_provider)
+instrument_pool(async_engine, "primary")
+install_slow_query_log(async_engine, "primary")
 
 async_session_factory = async_sessionmaker(
     bind=async_engine,
@@ -155,8 +352,202 @@ async_session_factory = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Optional read replica with its own pool; reads use the primary when unset.
+replica_engine: AsyncEngine | None = None
+replica_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+if settings.async_database_replica_url:
+    replica_engine = _create_engine(
+        settings.async_database_replica_url,
+        _token_provider,
+        "replica",
+    )
+    instrument_pool(replica_engine, "replica")
+    install_slow_query_log(replica_engine, "replica")
+    replica_session_factory = async_sessionmaker(
+        bind=replica_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+def _engines() -> list[tuple[AsyncEngine, str]]:
+    engines = [(async_engine, "primary")]
+    if replica_engine is not None:
+        engines.append((replica_engine, "replica"))
+    return engines
+
+
+async def prime_db_token() -> bool:
+    """Fetch the Entra database token and start its background refresh.
+
+    Returns False when the engines use password authentication.
+    """
+    if _token_provider is None:
+        return False
+    await _token_provider.start()
+    return True
+
+
+async def warm_up_engines(connections: int | None = None) -> None:
+    """Pre-open `connections` (default: `pool_size`) per engine."""
+    for engine, pool_name in _engines():
+        await warm_up_pool(engine, pool_name, warm_up_size(engine, connections))
+
+
+def start_pool_recyclers() -> None:
+    """Start replacing idle connections at their jittered recycle deadlines."""
+    for recycler in _pool_recyclers.values():
+        recycler.start()
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection; call once no request can use them."""
+    for recycler in _pool_recyclers.values():
+        await recycler.stop()
+    for engine, _ in _engines():
+        await engine.dispose()
+    if _token_provider is not None:
+        await _token_provider.close()
+
+
+def _set_statement_timeout(session, transaction, connection) -> None:  # noqa: ARG001
+    """Bound each transaction's statements by what is left of the request deadline.
+
+    Connections already start at `_connection_statement_timeout_ms`; only a
+    budget well below it, above it or unbounded costs a `SET LOCAL`.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    budget_ms = remaining_ms()
+    default_ms = _connection_statement_timeout_ms()
+    if budget_ms is None:
+        if default_ms is not None and current_deadline() is not None:
+            # Routes without a deadline (export, import) lift the default.
+            connection.exec_driver_sql("SET LOCAL statement_timeout = 0")
+        return
+    if (
+        default_ms is not None
+        and default_ms - STATEMENT_TIMEOUT_SLACK_MS <= budget_ms <= default_ms
+    ):
+        return
+    # SET LOCAL lasts until COMMIT/ROLLBACK, so it is also safe behind
+    # PgBouncer transaction pooling. 0 would disable the timeout, hence >= 1.
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {max(1, math.ceil(budget_ms))}"
+    )
+
+
+def apply_request_deadline(session: AsyncSession) -> None:
+    event.listen(session.sync_session, "after_begin", _set_statement_timeout)
+
+
+def _mark_transaction_begun(session, transaction, connection) -> None:  # noqa: ARG001
+    session.info[_TRANSACTION_BEGUN_KEY] = True
+
+
+def _clear_transaction_begun(session, transaction) -> None:  # noqa: ARG001
+    session.info.pop(_TRANSACTION_BEGUN_KEY, None)
+
+
+def _capture_commit_lsn(session) -> None:
+    """Mint the consistency token inside the write transaction, before COMMIT.
+
+    The WAL insert position after the transaction's last change is a lower
+    bound for its commit record, and reading it here needs neither a new
+    transaction nor a round trip after the commit.
+    """
+    begun = session.info.pop(_TRANSACTION_BEGUN_KEY, False)
+    if not (begun or session.new or session.dirty or session.deleted):
+        return
+    # before_commit runs ahead of the final flush; flush so the position
+    # covers every pending change.
+    session.flush()
+    lsn = wal_insert_lsn(session.connection())
+    if lsn is not None:
+        session.info[_CONSISTENCY_TOKEN_KEY] = lsn
+
+
+def apply_consistency_token(session: AsyncSession) -> None:
+    if replica_session_factory is None:
+        return
+    sync_session = session.sync_session
+    event.listen(sync_session, "after_begin", _mark_transaction_begun)
+    event.listen(sync_session, "before_commit", _capture_commit_lsn)
+    event.listen(sync_session, "after_transaction_end", _clear_transaction_begun)
+
 
 async def get_db() -> AsyncIterator[AsyncSession]:
     """Provide a scoped async session for FastAPI dependencies."""
     async with async_session_factory() as session:
+        apply_request_deadline(session)
+        apply_consistency_token(session)
         yield session
+
+
+async def get_read_db(
+    request: Request,
+    primary: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncIterator[AsyncSession]:
+    """Provide a replica session for read-only routes.
+
+    A request carrying `X-Consistency-Token` (returned by writes) reads from the
+    replica only once it has replayed up to that LSN, waiting at most
+    `DATABASE_REPLICA_MAX_WAIT_MS` before falling back to the primary.
+    """
+    if replica_session_factory is None:
+        yield primary
+        return
+
+    token = request.headers.get(CONSISTENCY_TOKEN_HEADER)
+    if token is not None and not _LSN_PATTERN.fullmatch(token):
+        raise BadRequestError("Invalid consistency token")
+
+    async with replica_session_factory() as session:
+        apply_request_deadline(session)
+        if token is not None and not await wait_for_replica_lsn(
+            session,
+            token,
+            timeout_seconds=get_settings().database_replica_max_wait_ms / 1000,
+        ):
+            logger.info(
+                "Replica behind consistency token; reading from primary",
+                extra={"path": request.url.path, "lsn": token},
+            )
+            yield primary
+            return
+        yield session
+
+
+def wal_insert_lsn(connection) -> str | None:
+    """Return the primary's WAL insert position, or None off PostgreSQL."""
+    if connection.dialect.name != "postgresql":
+        return None
+    return connection.exec_driver_sql(_WAL_INSERT_LSN).scalar_one()
+
+
+async def wait_for_replica_lsn(
+    session: AsyncSession,
+    lsn: str,
+    timeout_seconds: float,
+) -> bool:
+    """Poll the replica until it has replayed `lsn`; False on timeout."""
+    if session.get_bind().dialect.name != "postgresql":
+        return True
+
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        replayed = (await session.execute(_REPLAY_REACHED, {"lsn": lsn})).scalar()
+        # NULL means the server is not a standby, so it is trivially current.
+        if replayed is None or replayed:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        await asyncio.sleep(REPLICA_POLL_INTERVAL_SECONDS)
+
+
+async def attach_consistency_token(response: Response, session: AsyncSession) -> None:
+    """Hand the client the read-your-writes token minted by the last commit."""
+    lsn = session.info.pop(_CONSISTENCY_TOKEN_KEY, None)
+    if lsn is not None:
+        response.headers[CONSISTENCY_TOKEN_HEADER] = lsn
@@ -0,0 +1,127 @@
+"""Per-request deadlines shared by the middleware, routes and DB sessions.
+
+`DeadlineMiddleware` opens a `RequestDeadline` for every HTTP request and
+cancels the handler once it expires. The budget comes from
+`X-Request-Timeout` (milliseconds) or `X-Request-Deadline` (Unix epoch
+seconds), otherwise from the route default (`route_deadline`) or
+`REQUEST_DEADLINE_DEFAULT_MS`. Sessions from `get_db` turn the remaining
+budget into `SET LOCAL statement_timeout` so PostgreSQL stops the work too,
+unless the connection's default timeout already matches it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+REQUEST_DEADLINE_HEADER = "X-Request-Deadline"
+
+# SQLSTATE query_canceled: raised when statement_timeout fires.
+_QUERY_CANCELED_SQLSTATE = "57014"
+
+
+@dataclass
+class RequestDeadline:
+    """Deadline for the current request, enforced through `timeout`."""
+
+    started_at: float
+    budget_ms: float | None
+    from_header: bool
+    timeout: asyncio.Timeout
+
+    def __post_init__(self) -> None:
+        self.timeout.reschedule(self.expires_at)
+
+    @property
+    def expires_at(self) -> float | None:
+        if self.budget_ms is None:
+            return None
+        return self.started_at + self.budget_ms / 1000
+
+    def remaining_ms(self) -> float | None:
+        expires_at = self.expires_at
+        if expires_at is None:
+            return None
+        return max(0.0, (expires_at - asyncio.get_running_loop().time()) * 1000)
+
+    def apply_route_default(self, budget_ms: float | None) -> None:
+        # A deadline sent by the client always wins over the route default.
+        if self.from_header:
+            return
+        self.budget_ms = budget_ms
+        self.timeout.reschedule(self.expires_at)
+
+
+_current_deadline: ContextVar[RequestDeadline | None] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+@asynccontextmanager
+async def request_deadline(
+    budget_ms: float | None,
+    *,
+    from_header: bool = False,
+) -> AsyncIterator[RequestDeadline]:
+    """Bind a deadline to the current context; raises TimeoutError on expiry."""
+    async with asyncio.timeout(None) as timeout:
+        deadline = RequestDeadline(
+            started_at=asyncio.get_running_loop().time(),
+            budget_ms=budget_ms,
+            from_header=from_header,
+            timeout=timeout,
+        )
+        token = _current_deadline.set(deadline)
+        try:
+            yield deadline
+        finally:
+            _current_deadline.reset(token)
+
+
+def current_deadline() -> RequestDeadline | None:
+    return _current_deadline.get()
+
+
+def remaining_ms() -> float | None:
+    """Milliseconds left for the current request, or None if unbounded."""
+    deadline = _current_deadline.get()
+    return deadline.remaining_ms() if deadline is not None else None
+
+
+def route_deadline(budget_ms: int | None) -> Callable[[], Awaitable[None]]:
+    """Dependency overriding the default deadline for a route (None = no limit)."""
+
+    async def apply_route_deadline() -> None:
+        deadline = _current_deadline.get()
+        if deadline is not None:
+            deadline.apply_route_default(budget_ms)
+
+    return apply_route_deadline
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    """Whether `exc` (or what it wraps) is PostgreSQL cancelling a statement."""
+    seen: set[int] = set()
+    pending: list[BaseException | None] = [exc]
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        sqlstate = getattr(current, "sqlstate", None) or getattr(
+            current, "pgcode", None
+        )
+        if sqlstate == _QUERY_CANCELED_SQLSTATE:
+            return True
+        pending.extend(
+            [
+                getattr(current, "orig", None),
+                getattr(current, "cause", None),
+                current.__cause__,
+            ]
+        )
+    return False
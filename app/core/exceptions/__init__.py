@@ -6,6 +6,7 @@ from app.core.exceptions.app_exceptions import (
     AuthorizationError,
     BadRequestError,
     ConflictError,
+    DeadlineExceededError,
     NotFoundError,
     PersistenceError,
 )
@@ -16,6 +17,7 @@ __all__ = [
     "AuthorizationError",
     "BadRequestError",
     "ConflictError",
+    "DeadlineExceededError",
     "NotFoundError",
     "PersistenceError",
 ]
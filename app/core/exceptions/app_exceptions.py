@@ -63,3 +63,10 @@ class AuthorizationError(AppError):
 
     status_code = 403
     code = "authorization_error"
+
+
+class DeadlineExceededError(AppError):
+    """Raised when a request runs past its deadline."""
+
+    status_code = 504
+    code = "deadline_exceeded"
@@ -0,0 +1,119 @@
+"""Process lifecycle: start-up warm-up, readiness and graceful drain.
+
+The FastAPI lifespan (see `app.main`) warms the connection pools and primes
+credentials before marking the process ready, so the first requests after a
+scale-out do not pay for TCP/TLS/Entra-token setup. Draining starts at the
+first SIGTERM (see `app.server`), before uvicorn stops accepting connections;
+on lifespan shutdown the app waits for in-flight requests up to a deadline and
+only then disposes the engines.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from time import perf_counter
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql import text
+
+from app.core.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WARM_UP_QUERY = text("SELECT 1")
+
+
+class LifecycleState:
+    """Readiness and in-flight request tracking for one process."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def mark_ready(self) -> None:
+        # A new lifespan in the same process (tests, reloads) starts fresh.
+        self.ready = True
+        self.draining = False
+
+    def start_draining(self) -> None:
+        """Report not-ready and close connections after each response."""
+        self.ready = False
+        self.draining = True
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    async def wait_idle(self, timeout_seconds: float) -> bool:
+        """Wait for in-flight requests to finish; False if the timeout hit first."""
+        try:
+            async with asyncio.timeout(timeout_seconds):
+                await self._idle.wait()
+        except TimeoutError:
+            return False
+        return True
+
+
+async def warm_up_pool(engine: AsyncEngine, pool_name: str, connections: int) -> int:
+    """Open `connections` connections concurrently, run a query on each and
+    check them back into the pool; returns how many succeeded.
+
+    The first failure is re-raised after every connection opened so far has
+    been returned.
+    """
+    started = perf_counter()
+
+    async def _open() -> AsyncConnection:
+        connection = await engine.connect()
+        try:
+            await connection.execute(_WARM_UP_QUERY)
+        except BaseException:
+            await connection.close()
+            raise
+        return connection
+
+    # Hold every connection until all are open, so the pool ends up with
+    # `connections` distinct ones instead of reusing the first.
+    results = await asyncio.gather(
+        *(_open() for _ in range(max(1, connections))),
+        return_exceptions=True,
+    )
+    opened = [result for result in results if isinstance(result, AsyncConnection)]
+    for connection in opened:
+        await connection.close()
+
+    logger.info(
+        "Connection pool warmed up",
+        extra={
+            "db.pool": pool_name,
+            "connections": len(opened),
+            "requested": connections,
+            "duration_ms": round((perf_counter() - started) * 1000, 1),
+        },
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(opened)
+
+
+def warm_up_size(engine: AsyncEngine, requested: int | None) -> int:
+    """Connections to pre-open: `requested`, capped at the pool's steady size.
+
+    Overflow connections are closed on check-in, so warming past `pool_size`
+    is wasted work. Pools without a size (e.g. NullPool) open one connection,
+    which still primes DNS, TLS and the Entra token.
+    """
+    size = getattr(engine.pool, "size", None)
+    pool_size = size() if callable(size) else 1
+    if requested is None:
+        return max(1, pool_size)
+    return max(1, min(requested, pool_size))
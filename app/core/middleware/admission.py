@@ -0,0 +1,267 @@
+"""Admission control: adaptive per-process concurrency limit with load shedding.
+
+Requests beyond the current limit wait in a bounded FIFO queue for at most
+`max_queue_ms`; when the queue is full or the wait expires the request is shed
+with `503` + `Retry-After` before it can touch the database pool. The limit
+adapts AIMD-style: additive increase while latency stays under target, and
+multiplicative decrease when a request is slow or fails with a 5xx. As with
+TCP congestion control, the limit backs off at most once per round trip:
+requests admitted before the last decrease ran under the old limit and say
+nothing about the new one.
+
+Latency is time to the first response byte, so a streamed body (the todos
+export) counts only until its headers go out. Routes whose latency tracks the
+client rather than the server, such as uploads, can be listed in
+`unmeasured_paths`; they still hold a slot and still back off on a 5xx.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from collections import deque
+from collections.abc import Iterable
+from time import perf_counter
+from typing import Literal
+from weakref import WeakSet
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings, get_settings
+from app.core.logging.logger import get_logger
+
+AdmissionOutcome = Literal["admitted", "queued", "shed"]
+
+logger = get_logger(__name__)
+
+_meter = metrics.get_meter("todo_api.admission")
+
+_admission_requests = _meter.create_counter(
+    name="http.server.admission.requests",
+    unit="1",
+    description="Requests by admission outcome (admitted/queued/shed).",
+)
+
+_queue_time = _meter.create_histogram(
+    name="http.server.admission.queue_time",
+    unit="ms",
+    description="Time requests spent in the admission queue.",
+)
+
+_limiters: WeakSet[AdaptiveConcurrencyLimiter] = WeakSet()
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit in front of a bounded FIFO wait queue."""
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency_ms: float,
+        max_queue: int,
+        max_queue_ms: float,
+        backoff_ratio: float = 0.9,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.target_latency_ms = target_latency_ms
+        self.max_queue = max_queue
+        self.max_queue_ms = max_queue_ms
+        self.backoff_ratio = backoff_ratio
+        self.in_flight = 0
+        self._decreased_at = float("-inf")
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        _limiters.add(self)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> AdaptiveConcurrencyLimiter:
+        # Default to what the DB pool can serve at once so excess work waits
+        # here (bounded, cheap to shed) rather than on DATABASE_POOL_TIMEOUT.
+        initial_limit = settings.admission_initial_limit or (
+            settings.database_pool_size + settings.database_max_overflow
+        )
+        return cls(
+            initial_limit=initial_limit,
+            min_limit=settings.admission_min_limit,
+            max_limit=settings.admission_max_limit,
+            target_latency_ms=settings.admission_target_latency_ms,
+            max_queue=settings.admission_max_queue,
+            max_queue_ms=settings.admission_max_queue_ms,
+        )
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> AdmissionOutcome:
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return "admitted"
+        if len(self._waiters) >= self.max_queue:
+            return "shed"
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=self.max_queue_ms / 1000)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+        if waiter.done():
+            # `_wake` already counted this request as in flight.
+            return "queued"
+        self._abandon(waiter)
+        return "shed"
+
+    def release(
+        self, latency_ms: float, failed: bool = False, measured: bool = True
+    ) -> None:
+        """Free a slot; with `measured=False` only a failure adjusts the limit."""
+        utilized = self.in_flight >= int(self.limit) / 2
+        self.in_flight -= 1
+        if failed or (measured and latency_ms > self.target_latency_ms):
+            now = perf_counter()
+            if now - latency_ms / 1000 >= self._decreased_at:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                self._decreased_at = now
+        elif measured and utilized:
+            # ~+1 per `limit` fast completions, and only while the limit is in
+            # use, so an idle period cannot ratchet it up to max.
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.max_queue_ms / 1000))
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def _abandon(self, waiter: asyncio.Future[None]) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # Slot was handed over as we gave up; pass it on.
+            self.in_flight -= 1
+            self._wake()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying an `AdaptiveConcurrencyLimiter` to HTTP requests."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+        exempt_path_prefixes: tuple[str, ...] = ("/health",),
+        unmeasured_paths: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.limiter = limiter or AdaptiveConcurrencyLimiter.from_settings(
+            get_settings()
+        )
+        self.exempt_path_prefixes = exempt_path_prefixes
+        self.unmeasured_paths = unmeasured_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(
+            self.exempt_path_prefixes
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        queued_at = perf_counter()
+        outcome = await self.limiter.acquire()
+        _admission_requests.add(1, attributes={"outcome": outcome})
+        if outcome != "admitted":
+            _queue_time.record((perf_counter() - queued_at) * 1000)
+        if outcome == "shed":
+            # Debug only: a log line per shed request adds cost under overload;
+            # the outcome counter is the signal to alert on.
+            logger.debug(
+                "Request shed by admission control",
+                extra={
+                    "path": scope["path"],
+                    "limit": int(self.limiter.limit),
+                    "in_flight": self.limiter.in_flight,
+                    "queued": self.limiter.queued,
+                },
+            )
+            await self._reject(send)
+            return
+
+        status_code = 500
+        first_byte_at: float | None = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code, first_byte_at
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                first_byte_at = perf_counter()
+            await send(message)
+
+        admitted_at = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.limiter.release(
+                ((first_byte_at or perf_counter()) - admitted_at) * 1000,
+                failed=status_code >= 500,
+                measured=scope["path"] not in self.unmeasured_paths,
+            )
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps(
+            {
+                "error": {
+                    "code": "overloaded",
+                    "message": "Server is at capacity; retry later",
+                }
+            }
+        ).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                    (
+                        b"retry-after",
+                        str(self.limiter.retry_after_seconds()).encode("ascii"),
+                    ),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def _observe_limit(_options: CallbackOptions) -> Iterable[Observation]:
+    for limiter in list(_limiters):
+        yield Observation(int(limiter.limit), {"state": "limit"})
+        yield Observation(limiter.in_flight, {"state": "in_flight"})
+        yield Observation(limiter.queued, {"state": "queued"})
+
+
+_meter.create_observable_gauge(
+    name="http.server.admission.concurrency",
+    callbacks=[_observe_limit],
+    unit="1",
+    description="Admission limit, in-flight and queued requests.",
+)
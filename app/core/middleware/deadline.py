@@ -0,0 +1,116 @@
+"""Middleware enforcing per-request deadlines (see `app.core.deadline`)."""
+
+from __future__ import annotations
+
+import time
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.deadline import (
+    REQUEST_DEADLINE_HEADER,
+    REQUEST_TIMEOUT_HEADER,
+    is_statement_timeout,
+    request_deadline,
+)
+from app.core.exceptions import AppError, BadRequestError, DeadlineExceededError
+from app.core.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DeadlineMiddleware:
+    """Cancel the handler once the request deadline passes and answer 504."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_ms: int | None = None,
+        max_ms: int | None = None,
+    ):
+        settings = get_settings()
+        self.app = app
+        self.default_ms = (
+            default_ms
+            if default_ms is not None
+            else settings.request_deadline_default_ms or None
+        )
+        self.max_ms = max_ms if max_ms is not None else settings.request_deadline_max_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            budget_ms, from_header = self._budget(Headers(scope=scope))
+        except BadRequestError as exc:
+            await _error_response(exc)(scope, receive, send)
+            return
+        if budget_ms == 0:
+            # Already expired on arrival: don't start work nobody will wait for.
+            error = DeadlineExceededError("Request deadline exceeded")
+            await _error_response(error)(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        error: AppError | None = None
+        try:
+            async with request_deadline(budget_ms, from_header=from_header) as deadline:
+                try:
+                    await self.app(scope, receive, send_tracking)
+                except Exception as exc:
+                    if not is_statement_timeout(exc):
+                        raise
+                    error = DeadlineExceededError(
+                        "Request deadline exceeded", cause=exc
+                    )
+        except TimeoutError:
+            if not deadline.timeout.expired():
+                raise
+            error = DeadlineExceededError("Request deadline exceeded")
+        if error is None:
+            return
+
+        logger.warning(
+            "Request deadline exceeded",
+            extra={
+                "path": scope["path"],
+                "budget_ms": deadline.budget_ms,
+                "from_header": from_header,
+                "response_started": response_started,
+                "cause_type": type(error.cause).__name__ if error.cause else None,
+            },
+        )
+        if not response_started:
+            await _error_response(error)(scope, receive, send)
+
+    def _budget(self, headers: Headers) -> tuple[float | None, bool]:
+        timeout_value = headers.get(REQUEST_TIMEOUT_HEADER)
+        deadline_value = headers.get(REQUEST_DEADLINE_HEADER)
+        if timeout_value is None and deadline_value is None:
+            return self.default_ms, False
+
+        try:
+            if timeout_value is not None:
+                budget_ms = float(timeout_value)
+            else:
+                budget_ms = (float(deadline_value) - time.time()) * 1000
+        except ValueError as exc:
+            raise BadRequestError("Invalid request deadline header", cause=exc) from exc
+        if budget_ms != budget_ms:  # NaN
+            raise BadRequestError("Invalid request deadline header")
+        return max(0.0, min(budget_ms, self.max_ms)), True
+
+
+def _error_response(exc: AppError) -> JSONResponse:
+    return JSONResponse(status_code=exc.status_code, content={"error": exc.to_dict()})
@@ -0,0 +1,51 @@
+"""Middleware counting in-flight requests and closing connections while draining."""
+
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.lifecycle import LifecycleState
+
+
+class DrainMiddleware:
+    """Track requests in `state`; add `Connection: close` once draining.
+
+    While the process drains, requests are still served (the load balancer
+    may not have noticed the failed readiness yet), but each response closes
+    its connection so keep-alive clients reconnect to another instance.
+    `/health` is not counted as in-flight work.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        state: LifecycleState,
+        exempt_path_prefixes: tuple[str, ...] = ("/health",),
+    ):
+        self.app = app
+        self.state = state
+        self.exempt_path_prefixes = exempt_path_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(
+            self.exempt_path_prefixes
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_closing_when_draining(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.state.draining:
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() != b"connection"
+                ]
+                headers.append((b"connection", b"close"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        self.state.request_started()
+        try:
+            await self.app(scope, receive, send_closing_when_draining)
+        finally:
+            self.state.request_finished()
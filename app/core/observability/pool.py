@@ -0,0 +1,154 @@
+"""OpenTelemetry metrics for SQLAlchemy connection pools.
+
+Exports, per named pool (`pool.name` = primary/replica):
+
+- `db.client.connections.wait_time`: checkout wait histogram (ms): queueing
+  for a slot plus any connect/pre-ping; also summed onto the active request
+  span as `db.pool.wait_ms`.
+- `db.client.connections.usage`: connections by `state` (used/idle).
+- `db.client.connections.overflow`: overflow connections currently open.
+- `db.client.connections.created`: new DBAPI connections (rate = connects/s).
+- `db.client.connections.invalidated`: invalidations by `reason`.
+- `db.client.connections.recycled`: connections replaced at their recycle
+  deadline, by `trigger` (background/checkout); its per-minute rate is the
+  reconnect rate that jittered recycling keeps flat.
+
+Wait time is measured by `InstrumentedAsyncAdaptedQueuePool`, so engines must
+be created with it as `poolclass` for the histogram and gauges to report.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from time import perf_counter
+
+from opentelemetry import metrics, trace
+from opentelemetry.metrics import CallbackOptions, Observation
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Set on `conn_rec.info` before calling `invalidate()` to label the metric;
+# otherwise the reason is the triggering exception type (or "unknown").
+INVALIDATE_REASON_KEY = "invalidate_reason"
+SPAN_WAIT_ATTRIBUTE = "db.pool.wait_ms"
+
+_meter = metrics.get_meter("todo_api.db_pool")
+
+_checkout_wait = _meter.create_histogram(
+    name="db.client.connections.wait_time",
+    unit="ms",
+    description="Time spent waiting to check a connection out of the pool.",
+)
+
+_connections_created = _meter.create_counter(
+    name="db.client.connections.created",
+    unit="1",
+    description="New DBAPI connections opened by the pool.",
+)
+
+_connections_invalidated = _meter.create_counter(
+    name="db.client.connections.invalidated",
+    unit="1",
+    description="Pooled connections invalidated, by reason.",
+)
+
+_connections_recycled = _meter.create_counter(
+    name="db.client.connections.recycled",
+    unit="1",
+    description="Pooled connections replaced at their recycle deadline, by trigger.",
+)
+
+_pools: dict[str, QueuePool] = {}
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that times every checkout, including waits for a slot."""
+
+    pool_name = "primary"
+
+    def connect(self):
+        started = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            record_checkout_wait(self.pool_name, (perf_counter() - started) * 1000)
+
+
+def instrument_pool(engine: AsyncEngine, pool_name: str) -> None:
+    """Register pool listeners and gauges for `engine` under `pool_name`."""
+    pool = engine.sync_engine.pool
+    attributes = {"pool.name": pool_name}
+
+    if isinstance(pool, InstrumentedAsyncAdaptedQueuePool):
+        pool.pool_name = pool_name
+    if isinstance(pool, QueuePool):
+        _pools[pool_name] = pool
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_conn, conn_rec):  # noqa: ARG001
+        _connections_created.add(1, attributes=attributes)
+
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def _on_invalidate(dbapi_conn, conn_rec, exception):  # noqa: ARG001
+        _record_invalidation(attributes, conn_rec, exception)
+
+    @event.listens_for(engine.sync_engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_conn, conn_rec, exception):  # noqa: ARG001
+        _record_invalidation(attributes, conn_rec, exception)
+
+
+def record_checkout_wait(pool_name: str, wait_ms: float) -> None:
+    _checkout_wait.record(wait_ms, attributes={"pool.name": pool_name})
+
+    span = trace.get_current_span()
+    if span.is_recording():
+        previous = (getattr(span, "attributes", None) or {}).get(
+            SPAN_WAIT_ATTRIBUTE, 0.0
+        )
+        span.set_attribute(SPAN_WAIT_ATTRIBUTE, previous + wait_ms)
+
+
+def record_recycle(pool_name: str, trigger: str) -> None:
+    _connections_recycled.add(
+        1, attributes={"pool.name": pool_name, "trigger": trigger}
+    )
+
+
+def _record_invalidation(
+    attributes: dict[str, str],
+    conn_rec,
+    exception: BaseException | None,
+) -> None:
+    info = conn_rec.info if conn_rec is not None else {}
+    reason = info.pop(INVALIDATE_REASON_KEY, None)
+    if reason is None:
+        reason = type(exception).__name__ if exception is not None else "unknown"
+    _connections_invalidated.add(1, attributes={**attributes, "reason": reason})
+
+
+def _observe_usage(_options: CallbackOptions) -> Iterable[Observation]:
+    for pool_name, pool in _pools.items():
+        yield Observation(pool.checkedout(), {"pool.name": pool_name, "state": "used"})
+        yield Observation(pool.checkedin(), {"pool.name": pool_name, "state": "idle"})
+
+
+def _observe_overflow(_options: CallbackOptions) -> Iterable[Observation]:
+    for pool_name, pool in _pools.items():
+        # `overflow()` starts at -pool_size and only goes positive past it.
+        yield Observation(max(pool.overflow(), 0), {"pool.name": pool_name})
+
+
+_meter.create_observable_gauge(
+    name="db.client.connections.usage",
+    callbacks=[_observe_usage],
+    unit="1",
+    description="Pooled connections by state (used/idle).",
+)
+
+_meter.create_observable_gauge(
+    name="db.client.connections.overflow",
+    callbacks=[_observe_overflow],
+    unit="1",
+    description="Overflow connections open beyond the configured pool size.",
+)
@@ -0,0 +1,206 @@
+"""Slow-query log with sampled EXPLAIN capture.
+
+Statements slower than `SLOW_QUERY_THRESHOLD_MS` are logged as structured
+JSON with normalized SQL (literals replaced by `?`), the parameter shape
+(types, never values) and the duration; the JSON formatter adds the trace and
+correlation ids of the request that ran them.
+
+On PostgreSQL a `SLOW_QUERY_EXPLAIN_SAMPLE_RATE` fraction of slow statements
+is re-planned with `EXPLAIN (FORMAT JSON)` in a background task on its own
+connection (never `ANALYZE`, so nothing is executed twice). The plan is logged
+with the same fingerprint, plus the relations it reads by sequential scan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+from collections.abc import Mapping, Sequence
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.logging.logger import get_logger
+
+MAX_LOGGED_SQL_LENGTH = 2000
+EXPLAIN_TIMEOUT_SECONDS = 5.0
+
+logger = get_logger("db.slow_query")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_BOOLEAN_LITERAL = re.compile(r"\b(?:true|false)\b", re.IGNORECASE)
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:\?|\$\d+|%\(\w+\)s)(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s))+\s*\)"
+)
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*(?:select|with|insert|update|delete)\b", re.IGNORECASE)
+
+_STARTED_AT = "_slow_query_started_at"
+
+
+def install_slow_query_log(
+    engine: AsyncEngine,
+    pool_name: str,
+    *,
+    threshold_ms: float | None = None,
+    explain_sample_rate: float | None = None,
+) -> None:
+    """Log statements on `engine` slower than the threshold (0 disables)."""
+    settings = get_settings()
+    if threshold_ms is None:
+        threshold_ms = settings.slow_query_threshold_ms
+    if explain_sample_rate is None:
+        explain_sample_rate = settings.slow_query_explain_sample_rate
+    if threshold_ms <= 0:
+        return
+
+    # At most one EXPLAIN in flight per engine (samples are dropped meanwhile):
+    # diagnosing must not add pool pressure during the incident itself. The set
+    # also keeps a strong reference so the task is not garbage collected.
+    pending_explains: set[asyncio.Task[None]] = set()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _on_before_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):  # noqa: ARG001
+        if context is not None:
+            setattr(context, _STARTED_AT, perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _on_after_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):  # noqa: ARG001
+        started_at = getattr(context, _STARTED_AT, None)
+        if started_at is None:
+            return
+        duration_ms = (perf_counter() - started_at) * 1000
+        if duration_ms < threshold_ms:
+            return
+
+        normalized = normalize_sql(statement)
+        fingerprint = sql_fingerprint(normalized)
+        logger.warning(
+            "Slow query",
+            extra={
+                "db.pool": pool_name,
+                "duration_ms": round(duration_ms, 2),
+                "threshold_ms": threshold_ms,
+                "sql": normalized[:MAX_LOGGED_SQL_LENGTH],
+                "sql_fingerprint": fingerprint,
+                "param_shape": parameter_shape(parameters, executemany),
+            },
+        )
+
+        if (
+            conn.dialect.name == "postgresql"
+            and not executemany
+            and _EXPLAINABLE.match(statement)
+            and not pending_explains
+            and random.random() < explain_sample_rate
+        ):
+            _schedule_explain(
+                engine, pending_explains, statement, parameters, fingerprint, pool_name
+            )
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and replace inline literals so queries group together."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _BOOLEAN_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?, ...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def sql_fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode("utf-8")).hexdigest()[:16]
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Describe bound parameters by type only, e.g. `["int", "datetime"]`."""
+    if executemany and isinstance(parameters, Sequence) and parameters:
+        return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+    if isinstance(parameters, Mapping):
+        return {str(key): type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, Sequence) and not isinstance(parameters, str | bytes):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def seq_scan_relations(plan: Any) -> list[str]:
+    """Relations read by `Seq Scan` anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    relations: list[str] = []
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, list):
+            pending.extend(node)
+        elif isinstance(node, dict):
+            if node.get("Node Type") == "Seq Scan" and node.get("Relation Name"):
+                relations.append(node["Relation Name"])
+            pending.extend(node.get("Plans", []))
+            if "Plan" in node:
+                pending.append(node["Plan"])
+    return sorted(set(relations))
+
+
+def _schedule_explain(
+    engine: AsyncEngine,
+    pending_explains: set[asyncio.Task[None]],
+    statement: str,
+    parameters: Any,
+    fingerprint: str,
+    pool_name: str,
+) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(
+        _explain(engine, statement, parameters, fingerprint, pool_name)
+    )
+    pending_explains.add(task)
+    task.add_done_callback(pending_explains.discard)
+
+
+async def _explain(
+    engine: AsyncEngine,
+    statement: str,
+    parameters: Any,
+    fingerprint: str,
+    pool_name: str,
+) -> None:
+    try:
+        async with asyncio.timeout(EXPLAIN_TIMEOUT_SECONDS):
+            async with engine.connect() as conn:
+                # The statement and parameters are already in driver format.
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                )
+                plan = result.scalar_one()
+    except Exception as exc:
+        logger.info(
+            "Slow query EXPLAIN failed",
+            extra={"sql_fingerprint": fingerprint, "error_type": type(exc).__name__},
+        )
+        return
+    if isinstance(plan, str):
+        # asyncpg hands json columns back undecoded.
+        plan = json.loads(plan)
+
+    logger.warning(
+        "Slow query plan",
+        extra={
+            "db.pool": pool_name,
+            "sql_fingerprint": fingerprint,
+            "seq_scan_relations": seq_scan_relations(plan),
+            "plan": plan,
+        },
+    )
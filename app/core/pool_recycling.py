@@ -0,0 +1,214 @@
+"""Jittered, background recycling of pooled database connections.
+
+Connections opened together (at warm-up, or with the same Entra token) would
+otherwise reach their recycle point together, and every replica would
+reconnect in the same instant. Instead each connection gets its own deadline,
+drawn uniformly from a window before its maximum age (and before its token
+expiry guard, when one is recorded). A connection past its deadline is
+replaced when it is checked out; a `PoolRecycler` task checks idle
+connections out when one is due, so that usually happens in the background
+and requests do not pay for the reconnect.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import time
+import weakref
+from collections.abc import Callable
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.core.logging.logger import get_logger
+from app.core.observability.pool import INVALIDATE_REASON_KEY, record_recycle
+
+logger = get_logger(__name__)
+
+RECYCLE_AT_KEY = "recycle_at"
+RECYCLE_CHECK_INTERVAL_SECONDS = 5.0
+
+Clock = Callable[[], float]
+
+# Set while a `PoolRecycler` pass checks connections out.
+_recycler_pass: ContextVar[bool] = ContextVar("pool_recycler_pass", default=False)
+
+
+def recycle_deadline(
+    connected_at: float,
+    *,
+    max_age_seconds: float,
+    jitter_seconds: float,
+    rng: random.Random | None = None,
+    expires_on: float | None = None,
+    expiry_guard_seconds: float = 0,
+) -> float:
+    """Pick a connection's recycle time within `jitter_seconds` of its limit.
+
+    The limit is `connected_at + max_age_seconds`, or the token expiry minus
+    its guard if that comes first. The window is capped at half the time
+    left, so a short-lived limit never yields an immediate recycle.
+    """
+    limit = connected_at + max_age_seconds
+    if expires_on is not None:
+        limit = min(limit, expires_on - expiry_guard_seconds)
+    window = max(0.0, min(jitter_seconds, (limit - connected_at) / 2))
+    return limit - (rng or random).uniform(0, window)
+
+
+def install_jittered_recycle(
+    engine: AsyncEngine,
+    pool_name: str,
+    *,
+    max_age_seconds: float,
+    jitter_seconds: float,
+    expires_on_key: str | None = None,
+    expiry_guard_seconds: float = 0,
+    clock: Clock = time.time,
+    rng: random.Random | None = None,
+) -> PoolRecycler:
+    """Give every new connection of `engine` a jittered recycle deadline.
+
+    Returns the `PoolRecycler` that replaces due idle connections; start it
+    from a running event loop.
+    """
+    rng = rng or random.Random()
+    recycler = PoolRecycler(engine, pool_name, clock=clock)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _assign_deadline(dbapi_conn, conn_rec):  # noqa: ARG001
+        expires_on = conn_rec.info.get(expires_on_key) if expires_on_key else None
+        conn_rec.info[RECYCLE_AT_KEY] = recycle_deadline(
+            clock(),
+            max_age_seconds=max_age_seconds,
+            jitter_seconds=jitter_seconds,
+            rng=rng,
+            expires_on=float(expires_on) if expires_on is not None else None,
+            expiry_guard_seconds=expiry_guard_seconds,
+        )
+        recycler.track(conn_rec)
+
+    @event.listens_for(engine.sync_engine, "close")
+    def _forget_deadline(dbapi_conn, conn_rec):  # noqa: ARG001
+        recycler.forget(conn_rec)
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _replace_overdue(dbapi_conn, conn_rec, conn_proxy):  # noqa: ARG001
+        if not _due(conn_rec, clock()):
+            return
+        # The pool retries the checkout on a fresh connection. Inside a
+        # recycler pass that reconnect happens in the background task;
+        # otherwise the connection was busy since its deadline and the
+        # request that checked it out pays for it.
+        background = _recycler_pass.get()
+        record_recycle(pool_name, "background" if background else "checkout")
+        if background:
+            recycler.replaced += 1
+        conn_rec.info[INVALIDATE_REASON_KEY] = (
+            "recycle" if background else "recycle_overdue"
+        )
+        conn_rec.invalidate()
+        raise sa_exc.DisconnectionError("Recycling connection past its deadline")
+
+    return recycler
+
+
+class PoolRecycler:
+    """Replaces idle connections past their deadline, in the background.
+
+    Uses only public pool operations: a pass checks idle connections out one
+    at a time and lets the checkout listener replace the due ones. The queue
+    pool hands idle connections out oldest-returned first, so as many
+    checkouts as there are idle connections visit each of them once.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        pool_name: str,
+        *,
+        clock: Clock = time.time,
+        interval_seconds: float = RECYCLE_CHECK_INTERVAL_SECONDS,
+    ):
+        self.engine = engine
+        self.pool_name = pool_name
+        self.clock = clock
+        self.interval_seconds = interval_seconds
+        self.replaced = 0
+        self._deadlines: weakref.WeakKeyDictionary[object, float] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def pool(self):
+        # `engine.dispose()` swaps in a fresh pool; always use the current one.
+        return self.engine.sync_engine.pool
+
+    def track(self, conn_rec) -> None:
+        self._deadlines[conn_rec] = conn_rec.info[RECYCLE_AT_KEY]
+
+    def forget(self, conn_rec) -> None:
+        self._deadlines.pop(conn_rec, None)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def recycle_idle(self) -> int:
+        """Reconnect idle connections past their deadline; returns the count.
+
+        Connections that stay busy for the whole pass are replaced at their
+        next checkout instead.
+        """
+        now = self.clock()
+        pool = self.pool
+        if not isinstance(pool, QueuePool) or not self._any_due(now):
+            return 0
+        replaced_before = self.replaced
+        token = _recycler_pass.set(True)
+        try:
+            for _ in range(pool.checkedin()):
+                if pool.checkedin() == 0 or not self._any_due(now):
+                    break
+                async with self.engine.connect():
+                    pass
+        except Exception:
+            logger.exception(
+                "Background connection recycle failed",
+                extra={"db.pool": self.pool_name},
+            )
+        finally:
+            _recycler_pass.reset(token)
+        return self.replaced - replaced_before
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            recycled = await self.recycle_idle()
+            if recycled:
+                logger.debug(
+                    "Recycled idle connections",
+                    extra={"db.pool": self.pool_name, "recycled": recycled},
+                )
+
+    def _any_due(self, now: float) -> bool:
+        return any(deadline <= now for deadline in self._deadlines.values())
+
+
+def _due(conn_rec, now: float) -> bool:
+    recycle_at = conn_rec.info.get(RECYCLE_AT_KEY)
+    return recycle_at is not None and now >= recycle_at
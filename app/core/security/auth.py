@@ -36,6 +36,10 @@ class _JwksCache:
 
         raise AuthenticationError("Token signing key not found")
 
+    def prime(self, jwks_url: str, ttl_seconds: int) -> int:
+        with self._lock:
+            return len(self._get_keys(jwks_url, ttl_seconds, force_refresh=True))
+
     def _get_keys(
         self,
         jwks_url: str,
@@ -55,6 +59,18 @@ class _JwksCache:
 _jwks_cache = _JwksCache()
 
 
+def prime_jwks_cache(settings: Settings) -> int:
+    """Fetch the tenant's signing keys now; returns how many were cached.
+
+    Called at start-up so the first authenticated request skips the JWKS
+    round trip. Blocking; run it in a worker thread from async code.
+    """
+    _validate_auth_settings(settings)
+    return _jwks_cache.prime(
+        _build_jwks_url(settings), settings.entra_jwks_cache_ttl_seconds
+    )
+
+
 def validate_access_token(token: str, settings: Settings) -> AuthContext:
     """Validate a bearer access token and project claims into AuthContext."""
 
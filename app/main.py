@@ -1,16 +1,37 @@
 """FastAPI application entry point."""
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
 from fastapi import APIRouter, FastAPI, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
 from app.api.v1.routers import todos as todos_router
+from app.core.cache import close_cache_backend
 from app.core.config import get_settings
-from app.core.exceptions import AppError
+from app.core.database import (
+    async_engine,
+    async_session_factory,
+    dispose_engines,
+    prime_db_token,
+    start_pool_recyclers,
+    warm_up_engines,
+)
+from app.core.deadline import is_statement_timeout
+from app.core.exceptions import AppError, DeadlineExceededError, PersistenceError
+from app.core.lifecycle import LifecycleState
 from app.core.logging.logger import get_logger
+from app.core.middleware.admission import AdmissionControlMiddleware
 from app.core.middleware.correlation import CorrelationIdMiddleware
+from app.core.middleware.deadline import DeadlineMiddleware
+from app.core.middleware.drain import DrainMiddleware
 from app.core.observability.telemetry import instrument_app, setup_telemetry
+from app.core.security.auth import prime_jwks_cache
+from app.modules.todos.archival import archive_periodically
+from app.modules.todos.partitions import maintain_partitions_periodically
 
 settings = get_settings()
 logger = get_logger("todo_api.app")
@@ -18,12 +39,79 @@ logger = get_logger("todo_api.app")
 # Initialize telemetry before creating the app
 setup_telemetry()
 
-app = FastAPI(title=settings.app_name, debug=settings.app_debug)
+
+lifecycle = LifecycleState()
+
+
+async def _warm_up() -> None:
+    """Prime credentials and connection pools before reporting ready.
+
+    Failures are logged, not fatal: the first requests then pay the set-up
+    cost themselves, as they would without warm-up.
+    """
+    if settings.require_auth and settings.startup_prime_jwks:
+        try:
+            keys = await asyncio.to_thread(prime_jwks_cache, settings)
+            logger.info("JWKS cache primed", extra={"keys": keys})
+        except Exception:
+            logger.exception("JWKS cache priming failed")
+
+    if not settings.startup_warmup_enabled:
+        return
+    try:
+        await prime_db_token()
+        await warm_up_engines(settings.startup_warmup_connections)
+    except Exception:
+        logger.exception("Connection pool warm-up failed")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await _warm_up()
+    start_pool_recyclers()
+    lifecycle.mark_ready()
+    logger.info("Application ready")
+
+    background_tasks = []
+    if settings.todo_archive_enabled:
+        background_tasks.append(
+            asyncio.create_task(archive_periodically(async_session_factory))
+        )
+    if settings.todo_partition_maintenance_enabled:
+        background_tasks.append(
+            asyncio.create_task(maintain_partitions_periodically(async_engine))
+        )
+    try:
+        yield
+    finally:
+        # Under `app.server` draining began at SIGTERM; under plain uvicorn it
+        # starts here. Let in-flight requests finish, then close the pools so
+        # no query is cut off mid-flight.
+        lifecycle.start_draining()
+        logger.info("Draining requests", extra={"in_flight": lifecycle.in_flight})
+        for task in background_tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        drained = await lifecycle.wait_idle(settings.shutdown_drain_timeout_seconds)
+        if not drained:
+            logger.warning(
+                "Drain timed out; closing pools with requests in flight",
+                extra={"in_flight": lifecycle.in_flight},
+            )
+        await dispose_engines()
+        await close_cache_backend()
+        logger.info("Application shut down", extra={"drained": drained})
+
+
+app = FastAPI(title=settings.app_name, debug=settings.app_debug, lifespan=lifespan)
 
 
 def _configure_exception_handlers(fastapi_app: FastAPI) -> None:
     @fastapi_app.exception_handler(AppError)
     async def handle_app_error(request: Request, exc: AppError) -> JSONResponse:
+        if isinstance(exc, PersistenceError) and is_statement_timeout(exc):
+            exc = DeadlineExceededError("Request deadline exceeded", cause=exc.cause)
         cause = exc.cause
         logger.warning(
             "Handled application error",
@@ -73,7 +161,21 @@ def _configure_exception_handlers(fastapi_app: FastAPI) -> None:
 
 _configure_exception_handlers(app)
 
-# Propagate correlation/trace context via headers and logs
+# Shed excess load before it queues on the DB pool; /health stays exempt.
+# Import latency follows the client's upload, so it does not steer the limit.
+if settings.admission_control_enabled:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        unmeasured_paths=(f"{settings.api_prefix}/todos/import",),
+    )
+
+# Outside admission, so the request budget also covers time queued for admission
+app.add_middleware(DeadlineMiddleware)
+
+# Counts every in-flight request and closes connections on shutdown
+app.add_middleware(DrainMiddleware, state=lifecycle)
+
+# Outermost: shed (503) and deadline (504) responses get correlation headers too
 app.add_middleware(CorrelationIdMiddleware)
 
 # Instrument the app for OpenTelemetry
@@ -88,3 +190,15 @@ app.include_router(api_router, prefix=settings.api_prefix)
 async def health_check() -> dict[str, str]:
     logger.info("Health check invoked")
     return {"status": "ok", "service": settings.app_name}
+
+
+@app.get("/health/ready", tags=["health"])
+async def readiness_check() -> JSONResponse:
+    """503 until start-up warm-up finishes and again once draining starts."""
+    if lifecycle.ready:
+        return JSONResponse({"status": "ready", "service": settings.app_name})
+    status = "draining" if lifecycle.draining else "starting"
+    return JSONResponse(
+        status_code=503,
+        content={"status": status, "service": settings.app_name},
+    )
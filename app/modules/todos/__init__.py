@@ -2,7 +2,15 @@
 
 import app.modules.todos.mapper as mapper
 from app.modules.todos.model import Todo
-from app.modules.todos.schemas import TodoCreate, TodoRead, TodoUpdate
+from app.modules.todos.schemas import TodoCreate, TodoFilter, TodoRead, TodoUpdate
 from app.modules.todos.service import TodoService
 
-__all__ = ["Todo", "TodoCreate", "TodoRead", "TodoUpdate", "TodoService", "mapper"]
+__all__ = [
+    "Todo",
+    "TodoCreate",
+    "TodoFilter",
+    "TodoRead",
+    "TodoUpdate",
+    "TodoService",
+    "mapper",
+]
@@ -0,0 +1,55 @@
+"""Background archival of completed todos into `todos_archive`."""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.logging.logger import get_logger
+from app.modules.todos.service import TodoService
+
+logger = get_logger(__name__)
+
+
+async def run_archival(
+    session_factory: async_sessionmaker[AsyncSession],
+    older_than_days: int,
+    batch_size: int,
+) -> int:
+    """Archive once in a fresh session; returns the number of todos moved."""
+    async with session_factory() as session:
+        return await TodoService(session).archive_completed_todos(
+            older_than_days, batch_size
+        )
+
+
+async def archive_periodically(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Run archival every `TODO_ARCHIVE_INTERVAL_SECONDS` until cancelled.
+
+    A failed run is logged and retried at the next interval. Several app
+    instances may run this concurrently; PostgreSQL batches use SKIP LOCKED
+    so they never move the same rows.
+    """
+    settings = get_settings()
+    interval = settings.todo_archive_interval_seconds
+    logger.info(
+        "Todo archival scheduled",
+        extra={
+            "interval_seconds": interval,
+            "older_than_days": settings.todo_archive_older_than_days,
+        },
+    )
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_archival(
+                session_factory,
+                settings.todo_archive_older_than_days,
+                settings.todo_archive_batch_size,
+            )
+        except Exception:
+            logger.exception("Scheduled todo archival failed")
@@ -0,0 +1,259 @@
+"""In-process read-through cache for single-todo reads.
+
+`TodoService.get_todo` serves hot ids from here instead of a primary-key
+lookup. Entries hold the validated `TodoRead` (no ORM hydration or schema
+validation on a hit) for `TODO_CACHE_TTL_SECONDS`; ids that do not exist are
+remembered as tombstones for the shorter `TODO_CACHE_NEGATIVE_TTL_SECONDS`,
+so scanners probing missing ids do not reach the database either.
+
+The cache is per process and bounded by `TODO_CACHE_MAX_ENTRIES` (LRU). Writes
+through `TodoService` update it precisely. Without a shared tier, writes made
+by other replicas are only picked up once the entry expires, which bounds
+their staleness by the TTL.
+
+With `CACHE_BACKEND` set, `SharedTodoCache` adds a tier shared by all
+replicas (see `app.core.cache`). Every write publishes a new version there;
+local entries remember the version they were read at and are only served
+while it is still current, so a read costs one version lookup and writes on
+any replica are seen at once.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from opentelemetry import metrics
+
+from app.core.cache import (
+    CacheUnavailableError,
+    CircuitBreaker,
+    VersionedCache,
+    cache_backend,
+)
+from app.core.config import get_settings
+from app.core.logging.logger import get_logger
+from app.modules.todos.schemas import TodoRead
+
+logger = get_logger(__name__)
+
+_NOT_FOUND = b"null"
+# Version of a local write the shared tier could not record: matches whatever
+# version the tier reports, so this replica keeps serving its own write.
+ANY_VERSION = "*"
+
+_meter = metrics.get_meter("todo_api.todo_cache")
+
+_lookups = _meter.create_counter(
+    name="todo.cache.lookups",
+    unit="1",
+    description="Todo read cache lookups by result (hit/negative_hit/miss).",
+)
+
+_evictions = _meter.create_counter(
+    name="todo.cache.evictions",
+    unit="1",
+    description="Todo read cache entries dropped, by reason (capacity/expired/stale).",
+)
+
+
+class TodoReadCache:
+    """Bounded LRU of todo id -> `TodoRead`, or None for a tombstone.
+
+    Fills are guarded by a generation counter: a reader takes `generation`
+    before querying and `put` drops the result if any write happened in the
+    meantime, so a read that raced a write cannot cache the old row. Entries
+    also carry the shared-tier version they belong to (None without one).
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.clock = clock
+        self.generation = 0
+        self._entries: OrderedDict[int, tuple[float, TodoRead | None, str | None]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, todo_id: int, version: str | None = None
+    ) -> tuple[bool, TodoRead | None]:
+        """Return `(cached, todo)`; `todo` is None for a cached not-found."""
+        entry = self._entries.get(todo_id)
+        stale = entry is not None and entry[2] not in (version, ANY_VERSION)
+        if entry is not None and (stale or entry[0] <= self.clock()):
+            del self._entries[todo_id]
+            reason = "stale" if stale else "expired"
+            _evictions.add(1, attributes={"reason": reason})
+            entry = None
+        if entry is None:
+            _lookups.add(1, attributes={"result": "miss"})
+            return False, None
+
+        self._entries.move_to_end(todo_id)
+        todo = entry[1]
+        _lookups.add(1, attributes={"result": "hit" if todo else "negative_hit"})
+        return True, todo
+
+    def put(
+        self,
+        todo_id: int,
+        todo: TodoRead | None,
+        generation: int,
+        version: str | None = None,
+    ) -> None:
+        """Cache a read result taken at `generation`, unless a write intervened."""
+        if generation == self.generation:
+            self._store(todo_id, todo, version)
+
+    def write(
+        self, todo_id: int, todo: TodoRead | None, version: str | None = None
+    ) -> None:
+        """Record a committed write: the new row, or None after a delete.
+
+        Storing the written value rather than dropping the entry keeps a
+        lagging read replica from refilling the cache with the old row.
+        """
+        self.generation += 1
+        self._store(todo_id, todo, version)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def _store(self, todo_id: int, todo: TodoRead | None, version: str | None) -> None:
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl_seconds if todo is not None else self.negative_ttl_seconds
+        self._entries[todo_id] = (self.clock() + ttl, todo, version)
+        self._entries.move_to_end(todo_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            _evictions.add(1, attributes={"reason": "capacity"})
+
+
+class SharedTodoCache:
+    """`TodoRead` payloads on the shared, versioned cache tier.
+
+    Not-found ids are cached as `null` for the negative TTL. TTLs are cut by
+    up to 10% at random so entries filled together do not expire together
+    and send every replica to the database at once.
+    """
+
+    def __init__(
+        self,
+        cache: VersionedCache,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+    ):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+    async def version(self, todo_id: int) -> str | None:
+        return await self.cache.version(str(todo_id))
+
+    async def get_or_load(
+        self,
+        todo_id: int,
+        version: str,
+        load: Callable[[], Awaitable[TodoRead | None]],
+    ) -> TodoRead | None:
+        async def load_payload() -> tuple[bytes, float]:
+            todo = await load()
+            return _encode(todo), self._ttl(todo)
+
+        return _decode(
+            await self.cache.get_or_load(str(todo_id), version, load_payload)
+        )
+
+    async def write_many(
+        self, todos: dict[int, TodoRead | None]
+    ) -> dict[int, str | None]:
+        """Publish written rows (None after a delete); returns their versions.
+
+        If the tier is unavailable the versions are None and other replicas
+        keep serving their copies until those expire.
+        """
+        try:
+            versions = await self.cache.write_many(
+                [
+                    (str(todo_id), _encode(todo), self._ttl(todo))
+                    for todo_id, todo in todos.items()
+                ]
+            )
+        except CacheUnavailableError:
+            logger.warning(
+                "Shared todo cache not updated after write",
+                extra={"todo_ids": list(todos)[:20], "count": len(todos)},
+            )
+            return dict.fromkeys(todos)
+        return dict(zip(todos, versions, strict=True))
+
+    async def invalidate_many(self, todo_ids: list[int]) -> None:
+        """Publish new, empty versions so every replica reloads these ids."""
+        try:
+            await self.cache.write_many(
+                [(str(todo_id), None, self.ttl_seconds) for todo_id in todo_ids]
+            )
+        except CacheUnavailableError:
+            logger.warning(
+                "Shared todo cache not invalidated",
+                extra={"todo_ids": todo_ids[:20], "count": len(todo_ids)},
+            )
+
+    def _ttl(self, todo: TodoRead | None) -> float:
+        ttl = self.ttl_seconds if todo is not None else self.negative_ttl_seconds
+        return ttl * random.uniform(0.9, 1.0)
+
+
+def _encode(todo: TodoRead | None) -> bytes:
+    return todo.model_dump_json().encode() if todo is not None else _NOT_FOUND
+
+
+def _decode(payload: bytes) -> TodoRead | None:
+    return None if payload == _NOT_FOUND else TodoRead.model_validate_json(payload)
+
+
+# Bump the suffix whenever the cached `TodoRead` shape changes, so replicas on
+# the new code never decode payloads written by the old one.
+TODO_CACHE_NAMESPACE = "todo:v2"
+
+_settings = get_settings()
+
+todo_read_cache = TodoReadCache(
+    max_entries=_settings.todo_cache_max_entries,
+    ttl_seconds=_settings.todo_cache_ttl_seconds,
+    negative_ttl_seconds=_settings.todo_cache_negative_ttl_seconds,
+)
+
+shared_todo_cache = (
+    SharedTodoCache(
+        VersionedCache(
+            cache_backend,
+            TODO_CACHE_NAMESPACE,
+            op_timeout_seconds=_settings.cache_op_timeout_ms / 1000,
+            breaker=CircuitBreaker(
+                "todo_cache",
+                failure_threshold=_settings.cache_breaker_failure_threshold,
+                reset_timeout_seconds=_settings.cache_breaker_reset_seconds,
+            ),
+        ),
+        ttl_seconds=_settings.todo_shared_cache_ttl_seconds,
+        negative_ttl_seconds=_settings.todo_cache_negative_ttl_seconds,
+    )
+    if cache_backend is not None
+    else None
+)
@@ -0,0 +1,165 @@
+"""Chunk codecs for streamed todo exports and imports.
+
+Encoders take already-serialized rows (JSON-compatible dicts) and return one
+text chunk per batch, so callers can write each chunk to the response as soon
+as it is fetched without holding the full export in memory. The decoder works
+the other way round, turning an upload byte stream into records one at a time.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Sequence
+from typing import Literal
+
+from app.core.exceptions import BadRequestError
+
+ExportFormat = Literal["ndjson", "csv"]
+ImportFormat = ExportFormat
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Longest import record (a line, or a quoted multi-line CSV record) buffered
+# before the upload is rejected, in decoded characters.
+IMPORT_MAX_RECORD_CHARS = 64 * 1024
+
+
+def encode_ndjson(rows: Iterable[dict]) -> str:
+    return "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+
+
+def encode_csv(
+    rows: Iterable[dict],
+    fieldnames: Sequence[str],
+    include_header: bool = False,
+) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator="\n")
+    if include_header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+async def iter_import_records(
+    chunks: AsyncIterable[bytes],
+    import_format: ImportFormat,
+    max_record_chars: int = IMPORT_MAX_RECORD_CHARS,
+) -> AsyncIterator[dict | None]:
+    """Decode an NDJSON or CSV upload into records as bytes arrive.
+
+    Yields one item per data record: a dict of raw field values, or None when
+    the record cannot be decoded. Blank lines are skipped. Only the current
+    partial line (or quoted multi-line CSV record) is buffered; a record
+    longer than `max_record_chars` raises `BadRequestError`.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parse = (
+        _parse_ndjson_lines
+        if import_format == "ndjson"
+        else _CsvLineParser(max_record_chars)
+    )
+    # Fragments of the unterminated last line; each chunk is split on its own
+    # and joined to them only once its first newline arrives.
+    pending: list[str] = []
+    pending_chars = 0
+    async for chunk in chunks:
+        *lines, tail = decoder.decode(chunk).split("\n")
+        if lines:
+            lines[0] = "".join(pending) + lines[0]
+            pending, pending_chars = [], 0
+        pending.append(tail)
+        pending_chars += len(tail)
+        _check_record_size(max([pending_chars, *map(len, lines)]), max_record_chars)
+        for record in parse(lines):
+            yield record
+
+    pending.append(decoder.decode(b"", final=True))
+    last_line = "".join(pending)
+    for record in parse([last_line] if last_line else []):
+        yield record
+    if isinstance(parse, _CsvLineParser):
+        for record in parse.flush():
+            yield record
+
+
+def _check_record_size(chars: int, max_record_chars: int) -> None:
+    if chars > max_record_chars:
+        raise BadRequestError(f"Import record exceeds {max_record_chars} characters")
+
+
+def _parse_ndjson_lines(lines: list[str]) -> Iterable[dict | None]:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield record if isinstance(record, dict) else None
+
+
+class _CsvLineParser:
+    """Group physical lines into CSV records; the first record is the header.
+
+    A record is complete once it holds an even number of quote characters,
+    since quotes inside quoted fields are always doubled.
+    """
+
+    def __init__(self, max_record_chars: int = IMPORT_MAX_RECORD_CHARS):
+        self.max_record_chars = max_record_chars
+        self._fieldnames: list[str] | None = None
+        self._record_lines: list[str] = []
+        self._record_chars = 0
+        self._quotes = 0
+
+    def __call__(self, lines: list[str]) -> Iterable[dict | None]:
+        for line in lines:
+            self._record_lines.append(line)
+            # An unterminated quoted field would otherwise buffer the upload.
+            self._record_chars += len(line) + 1
+            _check_record_size(self._record_chars, self.max_record_chars)
+            self._quotes += line.count('"')
+            if self._quotes % 2 == 0:
+                yield from self._emit()
+
+    def flush(self) -> Iterable[dict | None]:
+        # An unterminated quoted field at end of input is a malformed record.
+        if self._record_lines:
+            self._record_lines = []
+            self._record_chars = 0
+            self._quotes = 0
+            yield None
+
+    def _emit(self) -> Iterable[dict | None]:
+        text = "\n".join(self._record_lines).rstrip("\r")
+        self._record_lines = []
+        self._record_chars = 0
+        self._quotes = 0
+        if not text.strip():
+            return
+        try:
+            values = next(csv.reader(io.StringIO(text)))
+        except (csv.Error, StopIteration):
+            yield None
+            return
+
+        if self._fieldnames is None:
+            self._fieldnames = [name.strip() for name in values]
+            return
+        if len(values) != len(self._fieldnames):
+            yield None
+            return
+        # CSV cannot distinguish null from empty; treat empty cells as missing.
+        yield {
+            name: value
+            for name, value in zip(self._fieldnames, values, strict=True)
+            if value != ""
+        }
@@ -3,12 +3,33 @@
 This layer keeps API schemas and module schemas decoupled on purpose.
 """
 
+from collections.abc import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+
+from app.api.v1.schemas.todos import TodoBatchCreateRequest as ApiTodoBatchCreateRequest
+from app.api.v1.schemas.todos import (
+    TodoBatchCreateResponse as ApiTodoBatchCreateResponse,
+)
+from app.api.v1.schemas.todos import (
+    TodoBatchDeleteResponse as ApiTodoBatchDeleteResponse,
+)
+from app.api.v1.schemas.todos import TodoBatchUpdateItem as ApiTodoBatchUpdateItem
+from app.api.v1.schemas.todos import (
+    TodoBatchUpdateResponse as ApiTodoBatchUpdateResponse,
+)
 from app.api.v1.schemas.todos import TodoCreate as ApiTodoCreate
+from app.api.v1.schemas.todos import TodoFilter as ApiTodoFilter
+from app.api.v1.schemas.todos import TodoImportResponse as ApiTodoImportResponse
 from app.api.v1.schemas.todos import TodoListResponse as ApiTodoListResponse
 from app.api.v1.schemas.todos import TodoRead as ApiTodoRead
+from app.api.v1.schemas.todos import TodoSearchResponse as ApiTodoSearchResponse
+from app.api.v1.schemas.todos import TodoStatsResponse as ApiTodoStatsResponse
 from app.api.v1.schemas.todos import TodoUpdate as ApiTodoUpdate
 from app.modules.todos.schemas import TodoCreate as ModuleTodoCreate
+from app.modules.todos.schemas import TodoFilter as ModuleTodoFilter
 from app.modules.todos.schemas import TodoRead as ModuleTodoRead
+from app.modules.todos.schemas import TodoStats as ModuleTodoStats
 from app.modules.todos.schemas import TodoUpdate as ModuleTodoUpdate
 
 
@@ -16,10 +37,63 @@ def to_module_create(payload: ApiTodoCreate) -> ModuleTodoCreate:
     return ModuleTodoCreate(**payload.model_dump())
 
 
+def to_module_create_batch(
+    payload: ApiTodoBatchCreateRequest,
+) -> tuple[list[ModuleTodoCreate], list[dict]]:
+    """Validate batch items individually, splitting valid creates from errors."""
+    creates: list[ModuleTodoCreate] = []
+    errors: list[dict] = []
+    for index, item in enumerate(payload.items):
+        try:
+            creates.append(to_module_create(ApiTodoCreate.model_validate(item)))
+        except ValidationError as exc:
+            details = exc.errors(
+                include_url=False,
+                include_context=False,
+                include_input=False,
+            )
+            errors.append({"index": index, "details": details})
+    return creates, errors
+
+
+async def to_module_import_rows(
+    records: AsyncIterable[dict | None],
+) -> AsyncIterator[ModuleTodoCreate | dict]:
+    """Validate decoded import records, yielding creates or per-record errors."""
+    index = 0
+    async for record in records:
+        index += 1
+        if record is None:
+            yield {
+                "index": index,
+                "details": [{"type": "decode_error", "msg": "Malformed record"}],
+            }
+            continue
+        try:
+            yield to_module_create(ApiTodoCreate.model_validate(record))
+        except ValidationError as exc:
+            details = exc.errors(
+                include_url=False,
+                include_context=False,
+                include_input=False,
+            )
+            yield {"index": index, "details": details}
+
+
 def to_module_update(payload: ApiTodoUpdate) -> ModuleTodoUpdate:
     return ModuleTodoUpdate(**payload.model_dump(exclude_unset=True))
 
 
+def to_module_batch_updates(
+    items: list[ApiTodoBatchUpdateItem],
+) -> list[tuple[int, ModuleTodoUpdate]]:
+    return [(item.id, to_module_update(item.changes)) for item in items]
+
+
+def to_module_filter(filters: ApiTodoFilter) -> ModuleTodoFilter:
+    return ModuleTodoFilter(**filters.model_dump())
+
+
 def to_api_read(todo: ModuleTodoRead) -> ApiTodoRead:
     return ApiTodoRead.model_validate(todo.model_dump())
 
@@ -29,6 +103,55 @@ def to_api_list_response(data: dict) -> ApiTodoListResponse:
     return ApiTodoListResponse(
         items=items,
         total=data["total"],
+        total_mode=data["total_mode"],
         limit=data["limit"],
         offset=data["offset"],
+        next_cursor=data.get("next_cursor"),
+    )
+
+
+def to_api_search_response(data: dict) -> ApiTodoSearchResponse:
+    return ApiTodoSearchResponse(
+        items=[to_api_read(item) for item in data["items"]],
+        limit=data["limit"],
+        next_cursor=data["next_cursor"],
     )
+
+
+def to_api_stats(stats: ModuleTodoStats) -> ApiTodoStatsResponse:
+    return ApiTodoStatsResponse.model_validate(stats.model_dump())
+
+
+def to_api_batch_create_response(
+    todos: list[ModuleTodoRead],
+    errors: list[dict],
+) -> ApiTodoBatchCreateResponse:
+    return ApiTodoBatchCreateResponse(
+        items=[to_api_read(todo) for todo in todos],
+        errors=errors,
+    )
+
+
+def to_api_batch_update_response(
+    todos: list[ModuleTodoRead],
+    not_found: list[int],
+) -> ApiTodoBatchUpdateResponse:
+    return ApiTodoBatchUpdateResponse(
+        items=[to_api_read(todo) for todo in todos],
+        not_found=not_found,
+    )
+
+
+def to_api_batch_delete_response(
+    deleted: list[int],
+    not_found: list[int],
+) -> ApiTodoBatchDeleteResponse:
+    return ApiTodoBatchDeleteResponse(deleted=deleted, not_found=not_found)
+
+
+def to_api_import_response(
+    imported: int,
+    rejected: int,
+    errors: list[dict],
+) -> ApiTodoImportResponse:
+    return ApiTodoImportResponse(imported=imported, rejected=rejected, errors=errors)
@@ -1,25 +1,163 @@
-"""SQLAlchemy ORM model for todo items."""
+"""SQLAlchemy ORM models for todo items and their summary counters."""
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, func
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    func,
+    text,
+)
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
 
 from app.core.database import Base
 
+# SQLite fills `server_default=func.now()` with second-precision
+# CURRENT_TIMESTAMP text; store bound datetimes in the same format so keyset
+# comparisons on timestamps order consistently with server-generated values.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            "%(year)04d-%(month)02d-%(day)02d " "%(hour)02d:%(minute)02d:%(second)02d"
+        ),
+    ),
+    "sqlite",
+)
+
+
+class NextRowVersion(ColumnElement):
+    """`onupdate` value for `version`: `version + 1` where no trigger bumps it.
+
+    On PostgreSQL `trg_todos_bump_version` sets `version` from `OLD.version`
+    on every UPDATE, whoever issues it, so the statement leaves it alone.
+    """
+
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(NextRowVersion)
+def _next_row_version(element, compiler, **kw):  # noqa: ARG001
+    return "version + 1"
+
+
+@compiles(NextRowVersion, "postgresql")
+def _next_row_version_postgresql(element, compiler, **kw):  # noqa: ARG001
+    return "version"
+
 
 class Todo(Base):
+    """A todo item.
+
+    On PostgreSQL the table is range-partitioned by month on `created_at`
+    (migration `20261017_todos_partitioned`), with primary key
+    `(id, created_at)`; `created_at` is therefore never updated.
+    """
+
     __tablename__ = "todos"
+    __table_args__ = (
+        # Matches the default `created_at DESC, id DESC` ordering so keyset
+        # pages seek directly into the index.
+        Index("ix_todos_created_at_id", "created_at", "id"),
+        # Serves the common "open todos, newest first" list without touching
+        # completed rows.
+        Index(
+            "ix_todos_open_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_completed = false"),
+            sqlite_where=text("is_completed = 0"),
+        ),
+        # Back `sort=updated_at` / `updated_after` and `sort=title` keysets.
+        Index("ix_todos_updated_at_id", "updated_at", "id"),
+        Index("ix_todos_title_id", "title", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(String(1024), nullable=True)
     is_completed = Column(Boolean, default=False, nullable=False)
     created_at = Column(
-        DateTime(timezone=True),
+        Timestamp,
         server_default=func.now(),
         nullable=False,
     )
     updated_at = Column(
-        DateTime(timezone=True),
+        Timestamp,
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
     )
+    # Bumped by every UPDATE: a trigger on PostgreSQL (so raw SQL and manual
+    # fixes count too), ORM flushes and Core `update()` on SQLite. Strong
+    # ETags derive from it, since `updated_at` is only second-precision on
+    # SQLite and can repeat across quick successive writes.
+    version = Column(
+        Integer,
+        server_default=text("1"),
+        onupdate=NextRowVersion(),
+        nullable=False,
+    )
+
+
+class TodoArchive(Base):
+    """Completed todos moved out of `todos` by the archival job.
+
+    Same columns as `todos` plus `archived_at`; ids are preserved, so a todo
+    keeps its id after archival. Rows are read-only through the API.
+    """
+
+    __tablename__ = "todos_archive"
+    __table_args__ = (Index("ix_todos_archive_created_at_id", "created_at", "id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(255), nullable=False)
+    description = Column(String(1024), nullable=True)
+    is_completed = Column(Boolean, nullable=False)
+    created_at = Column(Timestamp, nullable=False)
+    updated_at = Column(Timestamp, nullable=False)
+    version = Column(Integer, server_default=text("1"), nullable=False)
+    archived_at = Column(Timestamp, server_default=func.now(), nullable=False)
+
+
+class TodoLocator(Base):
+    """`todos.id` -> `created_at`, maintained by PostgreSQL triggers on `todos`.
+
+    Lets id lookups name the partition key, so only one partition is read.
+    """
+
+    __tablename__ = "todo_locator"
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(Timestamp, nullable=False)
+
+
+class TodoStatsCounter(Base):
+    """Running totals maintained by PostgreSQL triggers on `todos`.
+
+    Rows are sharded by `slot` to avoid write contention; sum all slots to read.
+    """
+
+    __tablename__ = "todo_stats_counters"
+
+    slot = Column(SmallInteger, primary_key=True)
+    total = Column(BigInteger, nullable=False, server_default="0")
+    completed = Column(BigInteger, nullable=False, server_default="0")
+
+
+class TodoStatsDaily(Base):
+    """Per-day created/completed activity maintained by PostgreSQL triggers."""
+
+    __tablename__ = "todo_stats_daily"
+
+    day = Column(Date, primary_key=True)
+    slot = Column(SmallInteger, primary_key=True)
+    created = Column(BigInteger, nullable=False, server_default="0")
+    completed = Column(BigInteger, nullable=False, server_default="0")
@@ -0,0 +1,66 @@
+"""Opaque keyset cursors for todo list and search pagination.
+
+A cursor captures the sort key and id of the last row on a page so the next
+page can seek with e.g. `(created_at, id) < (:created_at, :id)` instead of
+scanning and discarding `OFFSET` rows. List cursors are bound to the sort they
+were issued for; search pages seek on `(rank, id)`.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from app.core.exceptions import BadRequestError
+
+
+def encode_cursor(sort: str, value: datetime | str, todo_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return _encode({"s": sort, "v": value, "i": todo_id})
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple[datetime | str, int]:
+    """Decode a list cursor, rejecting one issued for a different sort."""
+    payload = _decode(cursor)
+    try:
+        if payload["s"] != sort:
+            raise ValueError("cursor sort mismatch")
+        value = payload["v"]
+        if not isinstance(value, str):
+            raise TypeError("cursor value must be a string")
+        if sort.lstrip("-") != "title":
+            value = datetime.fromisoformat(value)
+        return value, int(payload["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise BadRequestError("Invalid pagination cursor", cause=exc) from exc
+
+
+def encode_search_cursor(rank: float, todo_id: int) -> str:
+    return _encode({"r": rank, "i": todo_id})
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    payload = _decode(cursor)
+    try:
+        return float(payload["r"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise BadRequestError("Invalid pagination cursor", cause=exc) from exc
+
+
+def _encode(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise BadRequestError("Invalid pagination cursor", cause=exc) from exc
+    if not isinstance(payload, dict):
+        raise BadRequestError("Invalid pagination cursor")
+    return payload
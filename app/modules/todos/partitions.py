@@ -0,0 +1,56 @@
+"""Scheduled creation of upcoming monthly `todos` partitions (PostgreSQL)."""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+_ENSURE = text("SELECT todos_ensure_partitions(:months_ahead)")
+
+
+async def ensure_partitions(engine: AsyncEngine, months_ahead: int) -> int:
+    """Create any missing partitions through `months_ahead` months from now.
+
+    Rows that landed in the default partition for a newly created month are
+    moved into it. Returns the number of partitions created.
+    """
+    async with engine.begin() as conn:
+        created = await conn.scalar(_ENSURE, {"months_ahead": months_ahead})
+    if created:
+        logger.info(
+            "Todo partitions created",
+            extra={"created": created, "months_ahead": months_ahead},
+        )
+    return created
+
+
+async def maintain_partitions_periodically(engine: AsyncEngine) -> None:
+    """Ensure partitions now and every `TODO_PARTITION_INTERVAL_SECONDS`.
+
+    Runs until cancelled; a failed run is logged and retried at the next
+    interval. Concurrent runs from several app instances are safe: the
+    function creates each partition under a lock on `todos` and skips months
+    that already exist. Does nothing on SQLite, which has no partitions.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    settings = get_settings()
+    interval = settings.todo_partition_interval_seconds
+    months_ahead = settings.todo_partition_months_ahead
+    logger.info(
+        "Todo partition maintenance scheduled",
+        extra={"interval_seconds": interval, "months_ahead": months_ahead},
+    )
+    while True:
+        try:
+            await ensure_partitions(engine, months_ahead)
+        except Exception:
+            logger.exception("Scheduled todo partition maintenance failed")
+        await asyncio.sleep(interval)
@@ -1,45 +1,396 @@
 """Repository for todo persistence operations."""
 
-from collections.abc import Sequence
+from __future__ import annotations
 
-from sqlalchemy import func, select
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, time
+from typing import Literal
+
+import asyncpg
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Float,
+    Integer,
+    Select,
+    String,
+    any_,
+    case,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.core.exceptions import ConflictError, NotFoundError, PersistenceError
+from app.core.config import get_settings
+from app.core.exceptions import (
+    BadRequestError,
+    ConflictError,
+    NotFoundError,
+    PersistenceError,
+)
 from app.core.logging.logger import get_logger
-from app.modules.todos.model import Todo
-from app.modules.todos.schemas import TodoCreate, TodoUpdate
+from app.modules.todos.model import (
+    Todo,
+    TodoArchive,
+    TodoLocator,
+    TodoStatsCounter,
+    TodoStatsDaily,
+)
+from app.modules.todos.schemas import TodoCreate, TodoFilter, TodoSort, TodoUpdate
 
 logger = get_logger(__name__)
 
+# "returning" issues single-statement INSERT/UPDATE/DELETE ... RETURNING writes;
+# "orm" keeps the SELECT ... FOR UPDATE + flush + refresh unit-of-work path.
+WriteMode = Literal["returning", "orm"]
+
+# Sequence behind `todos.id` (a plain DEFAULT nextval on the partitioned table).
+_ID_SEQUENCE = "todos_id_seq"
+
+# Column order for COPY; `is_completed` has no server default so it is sent.
+_IMPORT_COLUMNS = ("title", "description", "is_completed")
+
+DEFAULT_SORT: TodoSort = "-created_at"
+_SORT_COLUMNS = {
+    "created_at": Todo.created_at,
+    "updated_at": Todo.updated_at,
+    "title": Todo.title,
+}
+
+# Columns shared by `todos` and `todos_archive`, in `todos` order.
+_ROW_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "is_completed",
+    "created_at",
+    "updated_at",
+    "version",
+)
+
+# Archival moves this many rows per transaction by default.
+ARCHIVE_BATCH_SIZE = 1000
+
+# Bulk deletes commit every chunk so no transaction locks a huge id range.
+DELETE_CHUNK_SIZE = 1000
+
+# GIN expression index `ix_todos_search_vector` (PostgreSQL) is built on this
+# exact expression; the planner only uses it when queries repeat it verbatim,
+# so keep it in sync with the migration.
+SEARCH_CONFIG = "english"
+SEARCH_DOCUMENT = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(todos.title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(todos.description, '')), 'B')"
+)
+_SEARCH_VECTOR = literal_column(f"({SEARCH_DOCUMENT})", TSVECTOR)
+
+# `todos` is partitioned on PostgreSQL, so its own reltuples is -1; sum the
+# partitions (still -1 when none has been analyzed yet).
+_RELTUPLES_ESTIMATE = text(
+    """
+    SELECT CASE
+        WHEN bool_and(c.reltuples < 0) THEN -1
+        ELSE sum(greatest(c.reltuples, 0))
+    END::bigint
+    FROM pg_class AS c
+    WHERE (c.oid = to_regclass('todos') AND c.relkind = 'r')
+       OR c.oid IN (
+           SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass('todos')
+       )
+    """
+)
+
+
+# Archived todos count in /todos/stats (all completed) but `todos_archive` has
+# no stats triggers: archival adds back what the `todos` DELETE trigger took
+# off, and deleting from the archive takes it off by hand.
+_ADJUST_ARCHIVED_STATS = text(
+    """
+    INSERT INTO todo_stats_counters AS c (slot, total, completed)
+    VALUES (0, :delta, :delta)
+    ON CONFLICT (slot) DO UPDATE
+    SET total = c.total + EXCLUDED.total,
+        completed = c.completed + EXCLUDED.completed
+    """
+)
+
 
 class TodoRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, write_mode: WriteMode | None = None):
         self.session = session
+        self.write_mode = write_mode or get_settings().todo_write_mode
 
-    async def list(self, limit: int, offset: int) -> Sequence[Todo]:
-        stmt = select(Todo).order_by(Todo.created_at.desc()).limit(limit).offset(offset)
-        logger.info("Fetching todo list")
+    async def list(
+        self,
+        limit: int,
+        offset: int = 0,
+        after: tuple[datetime | str, int] | None = None,
+        filters: TodoFilter | None = None,
+        sort: TodoSort = DEFAULT_SORT,
+        include_archived: bool = False,
+    ) -> Sequence[Todo]:
+        """Fetch one page; `include_archived` merges in `todos_archive` rows."""
+        stmt = self._list_statement(
+            limit=limit,
+            offset=offset,
+            after=after,
+            filters=filters,
+            sort=sort,
+            include_archived=include_archived,
+        )
+        logger.info(
+            "Fetching todo list",
+            extra={
+                "keyset": after is not None,
+                "sort": sort,
+                "include_archived": include_archived,
+            },
+        )
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def count(self) -> int:
-        stmt = select(func.count(Todo.id))
+    async def list_with_total(
+        self,
+        limit: int,
+        offset: int = 0,
+        filters: TodoFilter | None = None,
+        sort: TodoSort = DEFAULT_SORT,
+    ) -> tuple[Sequence[Todo], int | None]:
+        """Fetch a page and the exact row count in a single round trip.
+
+        The count is computed by a window function over the unlimited result
+        set, so it is `None` when the page is empty (e.g. offset past the end).
+        """
+        stmt = self._list_statement(
+            limit=limit, offset=offset, filters=filters, sort=sort
+        ).add_columns(func.count().over().label("total_count"))
+        logger.info("Fetching todo list with total", extra={"sort": sort})
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        total = int(rows[0].total_count) if rows else None
+        return [row[0] for row in rows], total
+
+    async def count(
+        self,
+        filters: TodoFilter | None = None,
+        include_archived: bool = False,
+    ) -> int:
+        entities = [Todo]
+        if _reads_archive(filters, include_archived):
+            entities.append(TodoArchive)
+
+        total = 0
+        for entity in entities:
+            stmt = select(func.count(entity.id))
+            if filters is not None:
+                stmt = stmt.where(*self._filter_clauses(filters, entity))
+            total += int((await self.session.execute(stmt)).scalar_one())
+        return total
+
+    async def estimate_count(
+        self,
+        filters: TodoFilter | None = None,
+        include_archived: bool = False,
+    ) -> int:
+        """Return the planner's row estimate, falling back to an exact count.
+
+        Unfiltered estimates read `pg_class.reltuples`; filtered ones take the
+        top-level row estimate from `EXPLAIN` of the matching count query.
+        The archive, when included, is always estimated through `EXPLAIN`.
+        """
+        if self._dialect_name() != "postgresql":
+            return await self.count(filters, include_archived)
+
+        archived = 0
+        if _reads_archive(filters, include_archived):
+            archive_clauses = (
+                self._filter_clauses(filters, TodoArchive)
+                if filters is not None
+                else []
+            )
+            archived = await self._explain_row_estimate(
+                select(TodoArchive.id).where(*archive_clauses)
+            )
+
+        clauses = self._filter_clauses(filters) if filters is not None else []
+        if clauses:
+            estimate = await self._explain_row_estimate(select(Todo.id).where(*clauses))
+            return estimate + archived
+
+        result = await self.session.execute(_RELTUPLES_ESTIMATE)
+        estimate = result.scalar_one_or_none()
+        # reltuples is -1 (or NULL) until the table has been vacuumed/analyzed.
+        if estimate is None or estimate < 0:
+            return await self.count() + archived
+        return int(estimate) + archived
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        after: tuple[float, int] | None = None,
+    ) -> list[tuple[Todo, float]]:
+        """Return `(todo, rank)` pairs ordered by rank, then id, both descending.
+
+        PostgreSQL matches `websearch_to_tsquery` against the GIN-indexed
+        `SEARCH_DOCUMENT` expression; other dialects fall back to a
+        case-insensitive LIKE with a constant rank.
+        """
+        if self._dialect_name() == "postgresql":
+            tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+            rank = func.ts_rank_cd(_SEARCH_VECTOR, tsquery, type_=Float)
+            match = _SEARCH_VECTOR.op("@@")(tsquery)
+        else:
+            pattern = "%" + _escape_like(query) + "%"
+            rank = literal(0.0, Float)
+            match = or_(
+                Todo.title.ilike(pattern, escape="\\"),
+                Todo.description.ilike(pattern, escape="\\"),
+            )
+
+        stmt = (
+            select(Todo, rank.label("rank"))
+            .where(match)
+            .order_by(rank.desc(), Todo.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            after_rank, after_id = after
+            stmt = stmt.where(
+                tuple_(rank, Todo.id)
+                < tuple_(literal(after_rank, Float), literal(after_id, Todo.id.type))
+            )
+
+        logger.info("Searching todos", extra={"keyset": after is not None})
         result = await self.session.execute(stmt)
-        return int(result.scalar_one())
+        return [(row[0], float(row.rank)) for row in result.all()]
+
+    async def stats(self, since: date) -> dict:
+        """Return totals and per-day activity from `since` (inclusive).
+
+        PostgreSQL reads the trigger-maintained summary tables, which costs a
+        handful of rows regardless of table size. Other dialects have no
+        triggers, so the numbers are computed from `todos` directly.
+        """
+        if self._dialect_name() == "postgresql":
+            return await self._stats_from_summary(since)
+        return await self._stats_from_todos(since)
+
+    async def stream(
+        self,
+        filters: TodoFilter,
+        chunk_size: int,
+    ) -> AsyncIterator[Sequence[Todo]]:
+        """Yield matching todos in id order, `chunk_size` rows per fetch.
+
+        Uses a server-side cursor so only one chunk is buffered at a time.
+        """
+        stmt = (
+            select(Todo)
+            .where(*self._filter_clauses(filters))
+            .order_by(Todo.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream_scalars(stmt)
+        try:
+            async for chunk in result.partitions():
+                yield chunk
+        finally:
+            await result.close()
 
     async def get(self, todo_id: int) -> Todo | None:
         logger.info("Fetching todo", extra={"todo_id": todo_id})
-        return await self.session.get(Todo, todo_id)
+        stmt = select(Todo).where(*self._id_clauses(todo_id))
+        return (await self.session.scalars(stmt)).one_or_none()
+
+    async def get_archived(self, todo_id: int) -> TodoArchive | None:
+        logger.info("Fetching archived todo", extra={"todo_id": todo_id})
+        stmt = select(TodoArchive).where(TodoArchive.id == todo_id)
+        return (await self.session.scalars(stmt)).one_or_none()
+
+    async def get_version(self, todo_id: int) -> tuple[int, datetime] | None:
+        """`(version, updated_at)` of a live or archived todo, without the row."""
+        row = (
+            await self.session.execute(
+                select(Todo.version, Todo.updated_at).where(*self._id_clauses(todo_id))
+            )
+        ).one_or_none()
+        if row is None:
+            row = (
+                await self.session.execute(
+                    select(TodoArchive.version, TodoArchive.updated_at).where(
+                        TodoArchive.id == todo_id
+                    )
+                )
+            ).one_or_none()
+        return tuple(row) if row is not None else None
+
+    async def archive_completed(
+        self,
+        before: datetime,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        """Move completed todos last updated before `before` into the archive.
+
+        Each batch of up to `batch_size` rows is copied and deleted in its own
+        transaction; batches committed before a failure stay archived. Returns
+        the number of rows moved.
+        """
+        victims = (
+            select(Todo.id)
+            .where(Todo.is_completed == true(), Todo.updated_at < before)
+            .order_by(Todo.id)
+            .limit(batch_size)
+        )
+        moved = 0
+        while True:
+            try:
+                if self._dialect_name() == "postgresql":
+                    count = await self._archive_batch_postgres(victims)
+                else:
+                    count = await self._archive_batch(victims)
+                await self.session.commit()
+            except SQLAlchemyError as exc:
+                await self.session.rollback()
+                logger.exception("Archive todos failed due to database error")
+                raise PersistenceError("Failed to archive todos", cause=exc) from exc
+
+            moved += count
+            if count < batch_size:
+                break
+
+        logger.info("Archived completed todos", extra={"count": moved})
+        return moved
 
     async def create(self, payload: TodoCreate) -> Todo:
-        todo = Todo(**payload.model_dump())
-        self.session.add(todo)
+        values = payload.model_dump()
 
         try:
-            await self.session.commit()
-            await self.session.refresh(todo)
+            if self.write_mode == "returning":
+                # INSERT ... RETURNING replaces the INSERT + refresh SELECT pair.
+                stmt = insert(Todo).values(**values).returning(Todo)
+                todo = (await self.session.scalars(stmt)).one()
+                await self.session.commit()
+            else:
+                todo = Todo(**values)
+                self.session.add(todo)
+                await self.session.commit()
+                await self.session.refresh(todo)
         except IntegrityError as exc:
             await self.session.rollback()
             logger.warning("Create todo failed due to integrity error")
@@ -52,8 +403,115 @@ class TodoRepository:
         logger.info("Created todo", extra={"todo_id": todo.id, "title": todo.title})
         return todo
 
+    async def create_many(self, payloads: Sequence[TodoCreate]) -> Sequence[Todo]:
+        """Insert todos with one INSERT ... RETURNING in one transaction.
+
+        Rows are returned in the same order as `payloads`, matched through an
+        explicit ordinal rather than the order ids come out of the sequence.
+        """
+        rows = [payload.model_dump() for payload in payloads]
+        if self._dialect_name() == "postgresql":
+            stmt = self._create_many_postgres(rows)
+            params: list[dict] | None = None
+        else:
+            stmt = insert(Todo).returning(Todo, sort_by_parameter_order=True)
+            params = rows
+
+        try:
+            todos = (await self.session.scalars(stmt, params)).all()
+            await self.session.commit()
+        except IntegrityError as exc:
+            await self.session.rollback()
+            logger.warning("Batch create todos failed due to integrity error")
+            raise ConflictError("Todo batch create conflict", cause=exc) from exc
+        except SQLAlchemyError as exc:
+            await self.session.rollback()
+            logger.exception("Batch create todos failed due to database error")
+            raise PersistenceError("Failed to create todos", cause=exc) from exc
+
+        logger.info("Created todos in batch", extra={"count": len(todos)})
+        return todos
+
+    @staticmethod
+    def _create_many_postgres(rows: Sequence[dict]) -> Select:
+        # Each input row draws its id next to its ordinal in `numbered`, so
+        # joining RETURNING back on id restores request order whatever order
+        # nextval() ran in. The CTE calls a volatile function, so PostgreSQL
+        # evaluates it once for both references.
+        source = (
+            func.unnest(
+                literal([row["title"] for row in rows], ARRAY(String)),
+                literal([row["description"] for row in rows], ARRAY(String)),
+            )
+            .table_valued("title", "description", with_ordinality="ordinal")
+            .render_derived(name="source")
+        )
+        numbered = select(
+            func.nextval(literal_column(f"'{_ID_SEQUENCE}'")).label("id"),
+            source.c.title,
+            source.c.description,
+            source.c.ordinal,
+        ).cte("numbered")
+        inserted = (
+            insert(Todo)
+            .from_select(
+                ["id", "title", "description", "is_completed"],
+                select(
+                    numbered.c.id, numbered.c.title, numbered.c.description, false()
+                ),
+            )
+            .returning(*(getattr(Todo, name) for name in _ROW_COLUMNS))
+            .cte("inserted")
+        )
+        inserted_todo = aliased(Todo, inserted)
+        return (
+            select(inserted_todo)
+            .join(numbered, numbered.c.id == inserted_todo.id)
+            .order_by(numbered.c.ordinal)
+        )
+
+    async def import_many(self, payloads: Sequence[TodoCreate]) -> int:
+        """Bulk-load one chunk of todos and commit it; returns rows written.
+
+        PostgreSQL uses COPY via asyncpg `copy_records_to_table`; other dialects
+        fall back to a single executemany INSERT without RETURNING.
+        """
+        records = [(payload.title, payload.description, False) for payload in payloads]
+        try:
+            if self._dialect_name() == "postgresql":
+                connection = await self.session.connection()
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.copy_records_to_table(
+                    Todo.__tablename__,
+                    records=records,
+                    columns=_IMPORT_COLUMNS,
+                )
+            else:
+                await self.session.execute(
+                    insert(Todo),
+                    [
+                        dict(zip(_IMPORT_COLUMNS, record, strict=True))
+                        for record in records
+                    ],
+                )
+            await self.session.commit()
+        except (IntegrityError, asyncpg.IntegrityConstraintViolationError) as exc:
+            await self.session.rollback()
+            logger.warning("Import todos failed due to integrity error")
+            raise ConflictError("Todo import conflict", cause=exc) from exc
+        except (SQLAlchemyError, asyncpg.PostgresError) as exc:
+            await self.session.rollback()
+            logger.exception("Import todos failed due to database error")
+            raise PersistenceError("Failed to import todos", cause=exc) from exc
+
+        logger.info("Imported todo chunk", extra={"count": len(records)})
+        return len(records)
+
     async def update_by_id(self, todo_id: int, payload: TodoUpdate) -> Todo:
-        stmt = select(Todo).where(Todo.id == todo_id).with_for_update()
+        if self.write_mode == "returning":
+            return await self._update_returning(todo_id, payload)
+
+        stmt = select(Todo).where(*self._id_clauses(todo_id)).with_for_update()
         result = await self.session.execute(stmt)
         todo = result.scalar_one_or_none()
         if not todo:
@@ -78,12 +536,104 @@ class TodoRepository:
         logger.info("Updated todo", extra={"todo_id": todo.id})
         return todo
 
+    async def update_many(
+        self,
+        groups: Sequence[tuple[dict, Sequence[int]]],
+    ) -> Sequence[Todo]:
+        """Apply each `(changes, ids)` group as one set-based UPDATE ... RETURNING.
+
+        All groups run in a single transaction; ids that match no row are simply
+        absent from the result.
+        """
+        todos: list[Todo] = []
+        try:
+            for changes, ids in groups:
+                stmt = (
+                    update(Todo)
+                    .where(self._id_in(ids))
+                    .values(**changes)
+                    .returning(Todo)
+                    .execution_options(synchronize_session=False)
+                )
+                todos.extend((await self.session.scalars(stmt)).all())
+            await self.session.commit()
+        except IntegrityError as exc:
+            await self.session.rollback()
+            logger.warning("Batch update todos failed due to integrity error")
+            raise ConflictError("Todo batch update conflict", cause=exc) from exc
+        except SQLAlchemyError as exc:
+            await self.session.rollback()
+            logger.exception("Batch update todos failed due to database error")
+            raise PersistenceError("Failed to update todos", cause=exc) from exc
+
+        logger.info(
+            "Updated todos in batch",
+            extra={"count": len(todos), "groups": len(groups)},
+        )
+        return todos
+
+    async def update_matching(
+        self,
+        filters: TodoFilter,
+        payload: TodoUpdate,
+        max_rows: int,
+    ) -> Sequence[Todo]:
+        """UPDATE ... RETURNING the rows matching `filters`, at most `max_rows`.
+
+        At most `max_rows + 1` rows are locked; if that many match, the update
+        is rolled back and `BadRequestError` raised, so a broad filter never
+        holds or returns an unbounded set.
+        """
+        candidates = (
+            select(Todo.id)
+            .where(*self._filter_clauses(filters))
+            .order_by(Todo.id)
+            .limit(max_rows + 1)
+        )
+        stmt = (
+            update(Todo)
+            .where(Todo.id.in_(candidates.scalar_subquery()))
+            .values(**payload.model_dump(exclude_unset=True))
+            .returning(Todo)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            todos = (await self.session.scalars(stmt)).all()
+            if len(todos) > max_rows:
+                await self.session.rollback()
+            else:
+                await self.session.commit()
+        except IntegrityError as exc:
+            await self.session.rollback()
+            logger.warning("Filtered update todos failed due to integrity error")
+            raise ConflictError("Todo batch update conflict", cause=exc) from exc
+        except SQLAlchemyError as exc:
+            await self.session.rollback()
+            logger.exception("Filtered update todos failed due to database error")
+            raise PersistenceError("Failed to update todos", cause=exc) from exc
+
+        if len(todos) > max_rows:
+            logger.warning(
+                "Filtered update todos rejected", extra={"max_rows": max_rows}
+            )
+            raise BadRequestError(
+                f"Filter matches more than {max_rows} todos; narrow it or "
+                "update by ids"
+            )
+        logger.info("Updated todos matching filter", extra={"count": len(todos)})
+        return todos
+
     async def delete_by_id(self, todo_id: int) -> None:
-        stmt = select(Todo).where(Todo.id == todo_id).with_for_update()
+        if self.write_mode == "returning":
+            await self._delete_returning(todo_id)
+            return
+
+        stmt = select(Todo).where(*self._id_clauses(todo_id)).with_for_update()
         result = await self.session.execute(stmt)
         todo = result.scalar_one_or_none()
         if not todo:
-            raise NotFoundError("Todo not found")
+            await self._delete_archived_by_id(todo_id)
+            return
 
         await self.session.delete(todo)
 
@@ -95,3 +645,418 @@ class TodoRepository:
             raise PersistenceError("Failed to delete todo", cause=exc) from exc
 
         logger.info("Deleted todo", extra={"todo_id": todo.id})
+
+    async def delete_many(
+        self,
+        ids: Sequence[int],
+        chunk_size: int = DELETE_CHUNK_SIZE,
+    ) -> list[int]:
+        """Delete `ids` in chunks of `DELETE ... RETURNING id`, one commit each.
+
+        Ids missing from `todos` are deleted from `todos_archive` in the same
+        transaction. Chunks committed before a failure stay deleted.
+        """
+        deleted: list[int] = []
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start : start + chunk_size]
+            stmt = (
+                delete(Todo)
+                .where(self._id_in(chunk))
+                .returning(Todo.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted.extend(await self._delete_chunk(stmt, archived_ids=chunk))
+
+        logger.info("Deleted todos in batch", extra={"count": len(deleted)})
+        return deleted
+
+    async def delete_matching(
+        self,
+        filters: TodoFilter,
+        chunk_size: int = DELETE_CHUNK_SIZE,
+    ) -> list[int]:
+        """Delete rows matching `filters`, `chunk_size` rows per transaction.
+
+        Archived todos matching `filters` are deleted the same way afterwards.
+        """
+        victims = (
+            select(Todo.id)
+            .where(*self._filter_clauses(filters))
+            .order_by(Todo.id)
+            .limit(chunk_size)
+        )
+        stmt = (
+            delete(Todo)
+            .where(Todo.id.in_(victims.scalar_subquery()))
+            .returning(Todo.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        deleted: list[int] = []
+        while True:
+            chunk = await self._delete_chunk(stmt)
+            deleted.extend(chunk)
+            if len(chunk) < chunk_size:
+                break
+
+        if _reads_archive(filters, include_archived=True):
+            archived_victims = (
+                select(TodoArchive.id)
+                .where(*self._filter_clauses(filters, TodoArchive))
+                .order_by(TodoArchive.id)
+                .limit(chunk_size)
+            )
+            while True:
+                chunk = await self._delete_archived_chunk(
+                    TodoArchive.id.in_(archived_victims.scalar_subquery())
+                )
+                deleted.extend(chunk)
+                if len(chunk) < chunk_size:
+                    break
+
+        logger.info("Deleted todos matching filter", extra={"count": len(deleted)})
+        return deleted
+
+    async def _update_returning(self, todo_id: int, payload: TodoUpdate) -> Todo:
+        changes = payload.model_dump(exclude_unset=True)
+        if not changes:
+            # Nothing to write (and no `updated_at` bump, matching the ORM path).
+            todo = await self.get(todo_id)
+            if not todo:
+                raise NotFoundError("Todo not found")
+            return todo
+
+        stmt = (
+            update(Todo)
+            .where(*self._id_clauses(todo_id))
+            .values(**changes)
+            .returning(Todo)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        try:
+            todo = (await self.session.scalars(stmt)).one_or_none()
+            await self.session.commit()
+        except IntegrityError as exc:
+            await self.session.rollback()
+            logger.warning("Update todo failed due to integrity error")
+            raise ConflictError("Todo update conflict", cause=exc) from exc
+        except SQLAlchemyError as exc:
+            await self.session.rollback()
+            logger.exception("Update todo failed due to database error")
+            raise PersistenceError("Failed to update todo", cause=exc) from exc
+
+        if not todo:
+            raise NotFoundError("Todo not found")
+
+        logger.info("Updated todo", extra={"todo_id": todo.id})
+        return todo
+
+    async def _delete_returning(self, todo_id: int) -> None:
+        stmt = (
+            delete(Todo)
+            .where(*self._id_clauses(todo_id))
+            .returning(Todo.id)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            deleted_id = (await self.session.scalars(stmt)).one_or_none()
+            await self.session.commit()
+        except SQLAlchemyError as exc:
+            await self.session.rollback()
+            logger.exception("Delete todo failed due to database error")
+            raise PersistenceError("Failed to delete todo", cause=exc) from exc
+
+        if deleted_id is None:
+            await self._delete_archived_by_id(todo_id)
+            return
+
+        logger.info("Deleted todo", extra={"todo_id": deleted_id})
+
+    async def _delete_archived_by_id(self, todo_id: int) -> None:
+        try:
+            deleted = await self._delete_archived(TodoArchive.id == todo_id)
+            await self.session.commit()
+        except SQLAlchemyError as exc:
+            await self.session.rollback()
+            logger.exception("Delete archived todo failed due to database error")
+            raise PersistenceError("Failed to delete todo", cause=exc) from exc
+
+        if not deleted:
+            raise NotFoundError("Todo not found")
+
+        logger.info("Deleted archived todo", extra={"todo_id": todo_id})
+
+    async def _delete_archived(self, where: ColumnElement[bool]) -> Sequence[int]:
+        stmt = (
+            delete(TodoArchive)
+            .where(where)
+            .returning(TodoArchive.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = (await self.session.scalars(stmt)).all()
+        if deleted and self._dialect_name() == "postgresql":
+            await self.session.execute(_ADJUST_ARCHIVED_STATS, {"delta": -len(deleted)})
+        return deleted
+
+    async def _archive_batch_postgres(self, victims: Select) -> int:
+        # One statement: DELETE ... RETURNING feeds the archive INSERT. SKIP
+        # LOCKED lets concurrent archivers (one per replica) take disjoint
+        # batches and never waits on rows an API request is writing.
+        moved = (
+            delete(Todo)
+            .where(
+                Todo.id.in_(victims.with_for_update(skip_locked=True).scalar_subquery())
+            )
+            .returning(*(getattr(Todo, name) for name in _ROW_COLUMNS))
+            .cte("moved")
+        )
+        stmt = (
+            insert(TodoArchive)
+            .from_select(list(_ROW_COLUMNS), select(moved))
+            .returning(TodoArchive.id)
+        )
+        count = len((await self.session.scalars(stmt)).all())
+        if count:
+            # The stats triggers counted the DELETE as removals; archived todos
+            # still count towards /todos/stats, so add them back.
+            await self.session.execute(_ADJUST_ARCHIVED_STATS, {"delta": count})
+        return count
+
+    async def _archive_batch(self, victims: Select) -> int:
+        ids = (await self.session.scalars(victims)).all()
+        if not ids:
+            return 0
+        await self.session.execute(
+            insert(TodoArchive).from_select(
+                list(_ROW_COLUMNS),
+                select(*(getattr(Todo, name) for name in _ROW_COLUMNS)).where(
+                    Todo.id.in_(ids)
+                ),
+            )
+        )
+        await self.session.execute(
+            delete(Todo)
+            .where(Todo.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        return len(ids)
+
+    async def _delete_chunk(self, stmt, archived_ids: Sequence[int] = ()) -> list[int]:
+        try:
+            deleted = list((await self.session.scalars(stmt)).all())
+            live = set(deleted)
+            missing = [todo_id for todo_id in archived_ids if todo_id not in live]
+            if missing:
+                deleted.extend(await self._delete_archived(TodoArchive.id.in_(missing)))
+            await self.session.commit()
+        except SQLAlchemyError as exc:
+            await self.session.rollback()
+            logger.exception("Batch delete todos failed due to database error")
+            raise PersistenceError("Failed to delete todos", cause=exc) from exc
+        return deleted
+
+    async def _delete_archived_chunk(self, where: ColumnElement[bool]) -> Sequence[int]:
+        try:
+            deleted = await self._delete_archived(where)
+            await self.session.commit()
+        except SQLAlchemyError as exc:
+            await self.session.rollback()
+            logger.exception("Batch delete archived todos failed due to database error")
+            raise PersistenceError("Failed to delete todos", cause=exc) from exc
+        return deleted
+
+    def _dialect_name(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def _list_statement(
+        self,
+        limit: int,
+        offset: int = 0,
+        after: tuple[datetime | str, int] | None = None,
+        filters: TodoFilter | None = None,
+        sort: TodoSort = DEFAULT_SORT,
+        include_archived: bool = False,
+    ) -> Select:
+        if not _reads_archive(filters, include_archived):
+            stmt = self._sorted(select(Todo), Todo, after, filters, sort)
+            return stmt.limit(limit).offset(offset)
+
+        # Cut each table to the rows this page could need before merging, so
+        # both still seek their own `(sort column, id)` index.
+        branches = [
+            select(
+                self._sorted(
+                    select(*(getattr(entity, name) for name in _ROW_COLUMNS)),
+                    entity,
+                    after,
+                    filters,
+                    sort,
+                )
+                .limit(limit + offset)
+                .subquery()
+            )
+            for entity in (Todo, TodoArchive)
+        ]
+        merged = aliased(
+            Todo,
+            union_all(*branches).subquery("todos_with_archive"),
+            adapt_on_names=True,
+        )
+        stmt = self._sorted(select(merged), merged, None, None, sort)
+        return stmt.limit(limit).offset(offset)
+
+    def _sorted(
+        self,
+        stmt: Select,
+        entity,
+        after: tuple[datetime | str, int] | None,
+        filters: TodoFilter | None,
+        sort: TodoSort,
+    ) -> Select:
+        descending = sort.startswith("-")
+        column = getattr(entity, _SORT_COLUMNS[sort.lstrip("-")].key)
+        if descending:
+            stmt = stmt.order_by(column.desc(), entity.id.desc())
+        else:
+            stmt = stmt.order_by(column.asc(), entity.id.asc())
+        if filters is not None:
+            stmt = stmt.where(*self._filter_clauses(filters, entity))
+        if after is not None:
+            # Row-value comparison lets PostgreSQL seek on the matching
+            # `(sort column, id)` index instead of scanning past OFFSET rows.
+            value, todo_id = after
+            row = tuple_(column, entity.id)
+            anchor = tuple_(
+                literal(value, column.type),
+                literal(todo_id, entity.id.type),
+            )
+            stmt = stmt.where(row < anchor if descending else row > anchor)
+        return stmt
+
+    async def _explain_row_estimate(self, stmt: Select) -> int:
+        connection = await self.session.connection()
+        # Filter values are datetimes/booleans only, so inlining them is safe
+        # and lets EXPLAIN run without driver-specific parameter plumbing.
+        compiled = stmt.compile(
+            dialect=connection.dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def _stats_from_summary(self, since: date) -> dict:
+        totals_stmt = select(
+            func.coalesce(func.sum(TodoStatsCounter.total), 0),
+            func.coalesce(func.sum(TodoStatsCounter.completed), 0),
+        )
+        total, completed = (await self.session.execute(totals_stmt)).one()
+
+        daily_stmt = (
+            select(
+                TodoStatsDaily.day,
+                func.sum(TodoStatsDaily.created),
+                func.sum(TodoStatsDaily.completed),
+            )
+            .where(TodoStatsDaily.day >= since)
+            .group_by(TodoStatsDaily.day)
+            .order_by(TodoStatsDaily.day.desc())
+        )
+        result = await self.session.execute(daily_stmt)
+        daily = [
+            {"day": day, "created": int(created), "completed": int(done)}
+            for day, created, done in result.all()
+        ]
+        return {"total": int(total), "completed": int(completed), "daily": daily}
+
+    async def _stats_from_todos(self, since: date) -> dict:
+        # Archived todos are completed todos too; count both tables, matching
+        # the PostgreSQL counters.
+        total = completed = 0
+        buckets: dict[date, dict[str, int]] = {}
+        since_at = datetime.combine(since, time.min)
+        for entity in (Todo, TodoArchive):
+            totals_stmt = select(
+                func.count(entity.id),
+                func.coalesce(func.sum(case((entity.is_completed, 1), else_=0)), 0),
+            )
+            entity_total, entity_completed = (
+                await self.session.execute(totals_stmt)
+            ).one()
+            total += int(entity_total)
+            completed += int(entity_completed)
+
+            created_day = func.date(entity.created_at)
+            completed_day = func.date(entity.updated_at)
+            created_stmt = (
+                select(created_day, func.count(entity.id))
+                .where(entity.created_at >= since_at)
+                .group_by(created_day)
+            )
+            completed_stmt = (
+                select(completed_day, func.count(entity.id))
+                .where(entity.is_completed.is_(True), entity.updated_at >= since_at)
+                .group_by(completed_day)
+            )
+            for stmt, key in ((created_stmt, "created"), (completed_stmt, "completed")):
+                for day, count in (await self.session.execute(stmt)).all():
+                    bucket_day = date.fromisoformat(str(day))
+                    bucket = buckets.setdefault(
+                        bucket_day, {"created": 0, "completed": 0}
+                    )
+                    bucket[key] += int(count)
+
+        daily = [
+            {"day": day, **counts}
+            for day, counts in sorted(buckets.items(), reverse=True)
+        ]
+        return {"total": total, "completed": completed, "daily": daily}
+
+    def _id_clauses(self, todo_id: int) -> list[ColumnElement[bool]]:
+        clauses: list[ColumnElement[bool]] = [Todo.id == todo_id]
+        if self._dialect_name() == "postgresql":
+            # Name the partition key via the locator so the executor prunes the
+            # lookup to a single partition instead of probing every one.
+            clauses.append(
+                Todo.created_at
+                == select(TodoLocator.created_at)
+                .where(TodoLocator.id == todo_id)
+                .scalar_subquery()
+            )
+        return clauses
+
+    def _id_in(self, ids: Sequence[int]) -> ColumnElement[bool]:
+        if self._dialect_name() == "postgresql":
+            # `= ANY($1)` binds one array parameter, so the statement text (and
+            # asyncpg's prepared statement) is the same for every batch size.
+            return Todo.id == any_(literal(list(ids), ARRAY(Integer)))
+        return Todo.id.in_(ids)
+
+    @staticmethod
+    def _filter_clauses(filters: TodoFilter, entity=Todo) -> list[ColumnElement[bool]]:
+        clauses: list[ColumnElement[bool]] = []
+        if filters.is_completed is not None:
+            # Inline the boolean so PostgreSQL can match the partial indexes
+            # (a bound parameter defeats them under generic plans).
+            flag = true() if filters.is_completed else false()
+            clauses.append(entity.is_completed == flag)
+        if filters.created_after is not None:
+            clauses.append(entity.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            clauses.append(entity.created_at < filters.created_before)
+        if filters.updated_after is not None:
+            clauses.append(entity.updated_at >= filters.updated_after)
+        return clauses
+
+
+def _reads_archive(filters: TodoFilter | None, include_archived: bool) -> bool:
+    # Only completed todos are archived, so an open-only filter never needs it.
+    return include_archived and not (
+        filters is not None and filters.is_completed is False
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
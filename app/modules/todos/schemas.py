@@ -7,10 +7,22 @@ contracts.
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+TotalMode = Literal["exact", "estimated", "none"]
+# Whitelisted list orderings; a leading "-" sorts descending.
+TodoSort = Literal[
+    "created_at",
+    "-created_at",
+    "updated_at",
+    "-updated_at",
+    "title",
+    "-title",
+]
+
 
 class TodoBase(BaseModel):
     title: str = Field(..., max_length=255)
@@ -53,17 +65,40 @@ class TodoUpdate(BaseModel):
         return self
 
 
+class TodoFilter(BaseModel):
+    is_completed: bool | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+
+
 class TodoRead(TodoBase):
     id: int
     is_completed: bool
     created_at: datetime
     updated_at: datetime
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class TodoListResponse(BaseModel):
     items: list[TodoRead]
-    total: int
+    total: int | None
+    total_mode: TotalMode = "exact"
     limit: int
     offset: int
+    next_cursor: str | None = None
+
+
+class TodoDailyStats(BaseModel):
+    day: date
+    created: int
+    completed: int
+
+
+class TodoStats(BaseModel):
+    total: int
+    completed: int
+    open: int
+    daily: list[TodoDailyStats]
@@ -1,32 +1,133 @@
 """Application service encapsulating todo workflows."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 from time import perf_counter
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import BadRequestError, ConflictError, NotFoundError
 from app.core.logging.logger import get_logger
 from app.core.observability import emit_business_event, record_todo_operation_metric
-from app.modules.todos.repository import TodoRepository
-from app.modules.todos.schemas import TodoCreate, TodoRead, TodoUpdate
+from app.modules.todos.cache import (
+    ANY_VERSION,
+    SharedTodoCache,
+    TodoReadCache,
+    shared_todo_cache,
+    todo_read_cache,
+)
+from app.modules.todos.pagination import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from app.modules.todos.repository import (
+    ARCHIVE_BATCH_SIZE,
+    DEFAULT_SORT,
+    TodoRepository,
+)
+from app.modules.todos.schemas import (
+    TodoCreate,
+    TodoFilter,
+    TodoRead,
+    TodoSort,
+    TodoStats,
+    TodoUpdate,
+    TotalMode,
+)
 
 logger = get_logger(__name__)
 
+EXPORT_CHUNK_SIZE = 1000
+IMPORT_CHUNK_SIZE = 5000
+# Rejected import rows beyond this are counted but not itemized.
+IMPORT_MAX_REPORTED_ERRORS = 100
+
 
 class TodoService:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: TodoReadCache | None = None,
+        shared_cache: SharedTodoCache | None = None,
+    ):
         self.repository = TodoRepository(session)
+        self.cache = cache if cache is not None else todo_read_cache
+        self.shared_cache = (
+            shared_cache if shared_cache is not None else shared_todo_cache
+        )
 
-    async def list_todos(self, limit: int, offset: int):
+    async def list_todos(
+        self,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
+        filters: TodoFilter | None = None,
+        sort: TodoSort = DEFAULT_SORT,
+        include_archived: bool = False,
+    ):
         started = perf_counter()
-        logger.info("List todos invoked", extra={"limit": limit, "offset": offset})
-        todos = await self.repository.list(limit=limit, offset=offset)
-        total = await self.repository.count()
+        logger.info(
+            "List todos invoked",
+            extra={
+                "limit": limit,
+                "offset": offset,
+                "keyset": cursor is not None,
+                "total_mode": total_mode,
+                "sort": sort,
+                "include_archived": include_archived,
+                "filters": (
+                    filters.model_dump(mode="json", exclude_none=True)
+                    if filters is not None
+                    else None
+                ),
+            },
+        )
+        if cursor is not None and offset:
+            raise BadRequestError("cursor and offset cannot be combined")
+
+        after = decode_cursor(cursor, sort) if cursor is not None else None
+        # Fetch one extra row to learn whether another page exists without a
+        # second query.
+        total: int | None = None
+        # The window count cannot see past the per-table cut of an archive
+        # merge, so those pages count separately.
+        if total_mode == "exact" and after is None and not include_archived:
+            rows, total = await self.repository.list_with_total(
+                limit=limit + 1, offset=offset, filters=filters, sort=sort
+            )
+            if total is None:
+                # Empty page: the window count has no row to ride on.
+                total = await self.repository.count(filters) if offset else 0
+        else:
+            rows = await self.repository.list(
+                limit=limit + 1,
+                offset=offset,
+                after=after,
+                filters=filters,
+                sort=sort,
+                include_archived=include_archived,
+            )
+            if total_mode == "exact":
+                total = await self.repository.count(filters, include_archived)
+            elif total_mode == "estimated":
+                total = await self.repository.estimate_count(filters, include_archived)
+
+        todos = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = todos[-1]
+            sort_value = getattr(last, sort.lstrip("-"))
+            next_cursor = encode_cursor(sort, sort_value, last.id)
         logger.info(
             "List todos completed",
             extra={
                 "returned": len(todos),
                 "total": total,
+                "total_mode": total_mode,
                 "limit": limit,
                 "offset": offset,
             },
@@ -35,25 +136,120 @@ class TodoService:
         record_todo_operation_metric(
             action="list", outcome="success", duration_ms=duration_ms
         )
-        emit_business_event(
-            "todo.list.completed",
-            {
-                "todo.action": "list",
-                "todo.returned": len(todos),
-                "todo.total": total,
-            },
-        )
+        event_attributes: dict[str, object] = {
+            "todo.action": "list",
+            "todo.returned": len(todos),
+            "todo.total_mode": total_mode,
+        }
+        if total is not None:
+            event_attributes["todo.total"] = total
+        emit_business_event("todo.list.completed", event_attributes)
         return {
             "items": [TodoRead.model_validate(todo) for todo in todos],
             "total": total,
+            "total_mode": total_mode,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_cursor,
         }
 
+    async def search_todos(self, query: str, limit: int, cursor: str | None = None):
+        started = perf_counter()
+        logger.info(
+            "Search todos invoked",
+            extra={"limit": limit, "keyset": cursor is not None},
+        )
+        after = decode_search_cursor(cursor) if cursor is not None else None
+        rows = await self.repository.search(query, limit=limit + 1, after=after)
+
+        hits = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last, rank = hits[-1]
+            next_cursor = encode_search_cursor(rank, last.id)
+        logger.info("Search todos completed", extra={"returned": len(hits)})
+        duration_ms = (perf_counter() - started) * 1000
+        record_todo_operation_metric(
+            action="search", outcome="success", duration_ms=duration_ms
+        )
+        emit_business_event(
+            "todo.search.completed",
+            {"todo.action": "search", "todo.returned": len(hits)},
+        )
+        return {
+            "items": [TodoRead.model_validate(todo) for todo, _ in hits],
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
+
+    async def get_stats(self, days: int) -> TodoStats:
+        started = perf_counter()
+        logger.info("Todo stats invoked", extra={"days": days})
+        since = datetime.now(UTC).date() - timedelta(days=days - 1)
+        data = await self.repository.stats(since)
+        stats = TodoStats(
+            total=data["total"],
+            completed=data["completed"],
+            open=data["total"] - data["completed"],
+            daily=data["daily"],
+        )
+        logger.info(
+            "Todo stats completed",
+            extra={"total": stats.total, "completed": stats.completed},
+        )
+        duration_ms = (perf_counter() - started) * 1000
+        record_todo_operation_metric(
+            action="stats", outcome="success", duration_ms=duration_ms
+        )
+        return stats
+
+    async def export_todos(
+        self,
+        filters: TodoFilter,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[list[TodoRead]]:
+        """Stream matching todos chunk by chunk for export."""
+        started = perf_counter()
+        logger.info(
+            "Export todos invoked",
+            extra={"filters": filters.model_dump(mode="json", exclude_none=True)},
+        )
+        exported = 0
+        outcome = "aborted"
+        try:
+            async for chunk in self.repository.stream(filters, chunk_size):
+                exported += len(chunk)
+                yield [TodoRead.model_validate(todo) for todo in chunk]
+            outcome = "success"
+        finally:
+            logger.info(
+                "Export todos finished",
+                extra={"exported": exported, "outcome": outcome},
+            )
+            duration_ms = (perf_counter() - started) * 1000
+            record_todo_operation_metric(
+                action="export", outcome=outcome, duration_ms=duration_ms
+            )
+            emit_business_event(
+                "todo.export.completed",
+                {
+                    "todo.action": "export",
+                    "todo.exported": exported,
+                    "todo.outcome": outcome,
+                },
+            )
+
     async def get_todo(self, todo_id: int) -> TodoRead:
         started = perf_counter()
         logger.info("Get todo invoked", extra={"todo_id": todo_id})
-        todo = await self.repository.get(todo_id)
+        version = (
+            await self.shared_cache.version(todo_id)
+            if self.shared_cache is not None
+            else None
+        )
+        cached, todo = self.cache.get(todo_id, version)
+        if not cached:
+            todo = await self._load_todo(todo_id, version)
         if not todo:
             duration_ms = (perf_counter() - started) * 1000
             record_todo_operation_metric(
@@ -61,24 +257,78 @@ class TodoService:
             )
             emit_business_event(
                 "todo.get.not_found",
-                {"todo.action": "get", "todo.id": todo_id},
+                {"todo.action": "get", "todo.id": todo_id, "todo.cached": cached},
             )
             raise NotFoundError("Todo not found")
-        logger.info("Get todo completed", extra={"todo_id": todo_id})
+        logger.info("Get todo completed", extra={"todo_id": todo_id, "cached": cached})
         duration_ms = (perf_counter() - started) * 1000
         record_todo_operation_metric(
             action="get", outcome="success", duration_ms=duration_ms
         )
         emit_business_event(
             "todo.get.completed",
-            {"todo.action": "get", "todo.id": todo_id},
+            {"todo.action": "get", "todo.id": todo_id, "todo.cached": cached},
+        )
+        return todo
+
+    async def get_todo_version(self, todo_id: int) -> tuple[int, datetime]:
+        """`(version, updated_at)` of a todo, for answering conditional GETs.
+
+        Served from the local cache when it holds the current version, else
+        by a single-column query; the row is never hydrated or validated.
+        """
+        started = perf_counter()
+        version = (
+            await self.shared_cache.version(todo_id)
+            if self.shared_cache is not None
+            else None
+        )
+        cached, todo = self.cache.get(todo_id, version)
+        if cached:
+            row_version = (todo.version, todo.updated_at) if todo else None
+        else:
+            row_version = await self.repository.get_version(todo_id)
+        duration_ms = (perf_counter() - started) * 1000
+        if row_version is None:
+            record_todo_operation_metric(
+                action="get_version", outcome="not_found", duration_ms=duration_ms
+            )
+            raise NotFoundError("Todo not found")
+        record_todo_operation_metric(
+            action="get_version", outcome="success", duration_ms=duration_ms
         )
-        return TodoRead.model_validate(todo)
+        return row_version
+
+    async def _load_todo(self, todo_id: int, version: str | None) -> TodoRead | None:
+        """Read a todo through the shared tier and cache the result locally.
+
+        `version` is the todo's shared-tier version, or None when there is no
+        shared tier or it is unavailable; then the database is read directly.
+        """
+        generation = self.cache.generation
+        if self.shared_cache is not None and version is not None:
+            todo = await self.shared_cache.get_or_load(
+                todo_id, version, lambda: self._read_todo(todo_id)
+            )
+        else:
+            todo = await self._read_todo(todo_id)
+        self.cache.put(todo_id, todo, generation, version)
+        return todo
+
+    async def _read_todo(self, todo_id: int) -> TodoRead | None:
+        row = await self.repository.get(todo_id)
+        if not row:
+            # Completed todos may have been moved to the archive.
+            row = await self.repository.get_archived(todo_id)
+            if row:
+                logger.info("Get todo served from archive", extra={"todo_id": todo_id})
+        return TodoRead.model_validate(row) if row else None
 
     async def create_todo(self, payload: TodoCreate) -> TodoRead:
         started = perf_counter()
         logger.info("Create todo invoked")
-        todo = await self.repository.create(payload)
+        todo = TodoRead.model_validate(await self.repository.create(payload))
+        await self._record_writes({todo.id: todo})
         logger.info("Create todo completed", extra={"todo_id": todo.id})
         duration_ms = (perf_counter() - started) * 1000
         record_todo_operation_metric(
@@ -88,7 +338,90 @@ class TodoService:
             "todo.create.completed",
             {"todo.action": "create", "todo.id": todo.id},
         )
-        return TodoRead.model_validate(todo)
+        return todo
+
+    async def create_todos(
+        self,
+        payloads: list[TodoCreate],
+        rejected: int = 0,
+    ) -> list[TodoRead]:
+        started = perf_counter()
+        logger.info(
+            "Batch create todos invoked",
+            extra={"count": len(payloads), "rejected": rejected},
+        )
+        rows = await self.repository.create_many(payloads) if payloads else []
+        todos = [TodoRead.model_validate(todo) for todo in rows]
+        await self._record_writes({todo.id: todo for todo in todos})
+        logger.info("Batch create todos completed", extra={"created_count": len(todos)})
+        duration_ms = (perf_counter() - started) * 1000
+        record_todo_operation_metric(
+            action="create_batch",
+            outcome="success" if not rejected else "partial",
+            duration_ms=duration_ms,
+        )
+        emit_business_event(
+            "todo.create_batch.completed",
+            {
+                "todo.action": "create_batch",
+                "todo.created": len(todos),
+                "todo.rejected": rejected,
+            },
+        )
+        return todos
+
+    async def import_todos(
+        self,
+        rows: AsyncIterator[TodoCreate | dict],
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> tuple[int, int, list[dict]]:
+        """Load validated rows in committed chunks as they stream in.
+
+        `rows` yields a `TodoCreate` per valid record or an error dict per
+        rejected one. Returns (imported, rejected, reported errors).
+        """
+        started = perf_counter()
+        logger.info("Import todos invoked")
+        imported = 0
+        rejected = 0
+        errors: list[dict] = []
+        chunk: list[TodoCreate] = []
+        async for row in rows:
+            if isinstance(row, dict):
+                rejected += 1
+                if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                    errors.append(row)
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                imported += await self.repository.import_many(chunk)
+                chunk = []
+        if chunk:
+            imported += await self.repository.import_many(chunk)
+        if imported:
+            # New ids are not returned by the bulk load; drop any tombstones.
+            # Shared-tier tombstones expire within the negative TTL.
+            self.cache.clear()
+
+        logger.info(
+            "Import todos completed",
+            extra={"imported": imported, "rejected": rejected},
+        )
+        duration_ms = (perf_counter() - started) * 1000
+        record_todo_operation_metric(
+            action="import",
+            outcome="success" if not rejected else "partial",
+            duration_ms=duration_ms,
+        )
+        emit_business_event(
+            "todo.import.completed",
+            {
+                "todo.action": "import",
+                "todo.imported": imported,
+                "todo.rejected": rejected,
+            },
+        )
+        return imported, rejected, errors
 
     async def update_todo(self, todo_id: int, payload: TodoUpdate) -> TodoRead:
         started = perf_counter()
@@ -96,15 +429,24 @@ class TodoService:
         try:
             updated = await self.repository.update_by_id(todo_id, payload)
         except NotFoundError:
+            # Archived todos are readable, so a 404 would contradict GET.
+            archived = await self.repository.get_archived(todo_id) is not None
+            outcome = "archived" if archived else "not_found"
             duration_ms = (perf_counter() - started) * 1000
             record_todo_operation_metric(
-                action="update", outcome="not_found", duration_ms=duration_ms
+                action="update", outcome=outcome, duration_ms=duration_ms
             )
             emit_business_event(
-                "todo.update.not_found",
+                f"todo.update.{outcome}",
                 {"todo.action": "update", "todo.id": todo_id},
             )
+            if archived:
+                raise ConflictError(
+                    "Todo is archived and read-only; it can only be deleted"
+                ) from None
             raise
+        todo = TodoRead.model_validate(updated)
+        await self._record_writes({todo_id: todo})
         logger.info("Update todo completed", extra={"todo_id": todo_id})
         duration_ms = (perf_counter() - started) * 1000
         record_todo_operation_metric(
@@ -114,7 +456,88 @@ class TodoService:
             "todo.update.completed",
             {"todo.action": "update", "todo.id": todo_id},
         )
-        return TodoRead.model_validate(updated)
+        return todo
+
+    async def update_todos(
+        self,
+        updates: list[tuple[int, TodoUpdate]],
+    ) -> tuple[list[TodoRead], list[int]]:
+        """Apply per-id changes, grouping identical change sets into one UPDATE.
+
+        Returns the updated todos in request order and the ids that were not
+        found.
+        """
+        started = perf_counter()
+        ids = [todo_id for todo_id, _ in updates]
+        logger.info("Batch update todos invoked", extra={"count": len(ids)})
+        if len(set(ids)) != len(ids):
+            raise BadRequestError("Duplicate todo ids in batch update")
+
+        groups: dict[tuple, tuple[dict, list[int]]] = {}
+        for todo_id, payload in updates:
+            changes = payload.model_dump(exclude_unset=True)
+            key = tuple(sorted(changes.items()))
+            groups.setdefault(key, (changes, []))[1].append(todo_id)
+
+        updated = await self.repository.update_many(list(groups.values()))
+        by_id = {todo.id: TodoRead.model_validate(todo) for todo in updated}
+        await self._record_writes(by_id)
+        not_found = [todo_id for todo_id in ids if todo_id not in by_id]
+
+        logger.info(
+            "Batch update todos completed",
+            extra={"updated": len(updated), "not_found": len(not_found)},
+        )
+        duration_ms = (perf_counter() - started) * 1000
+        record_todo_operation_metric(
+            action="update_batch",
+            outcome="success" if not not_found else "partial",
+            duration_ms=duration_ms,
+        )
+        emit_business_event(
+            "todo.update_batch.completed",
+            {
+                "todo.action": "update_batch",
+                "todo.updated": len(updated),
+                "todo.not_found": len(not_found),
+                "todo.groups": len(groups),
+            },
+        )
+        todos = [by_id[i] for i in ids if i in by_id]
+        return todos, not_found
+
+    async def update_todos_matching(
+        self,
+        filters: TodoFilter,
+        payload: TodoUpdate,
+        max_rows: int,
+    ) -> list[TodoRead]:
+        """Apply one change set to every matching todo, if at most `max_rows`."""
+        started = perf_counter()
+        logger.info(
+            "Filtered update todos invoked",
+            extra={"filters": filters.model_dump(exclude_none=True)},
+        )
+        try:
+            rows = await self.repository.update_matching(filters, payload, max_rows)
+        except BadRequestError:
+            duration_ms = (perf_counter() - started) * 1000
+            record_todo_operation_metric(
+                action="update_batch", outcome="rejected", duration_ms=duration_ms
+            )
+            raise
+        updated = [TodoRead.model_validate(todo) for todo in rows]
+        await self._record_writes({todo.id: todo for todo in updated})
+        logger.info("Filtered update todos completed", extra={"updated": len(updated)})
+        duration_ms = (perf_counter() - started) * 1000
+        record_todo_operation_metric(
+            action="update_batch", outcome="success", duration_ms=duration_ms
+        )
+        emit_business_event(
+            "todo.update_batch.completed",
+            {"todo.action": "update_batch", "todo.updated": len(updated)},
+        )
+        return updated
 
     async def delete_todo(self, todo_id: int) -> None:
         started = perf_counter()
@@ -131,6 +554,7 @@ class TodoService:
                 {"todo.action": "delete", "todo.id": todo_id},
             )
             raise
+        await self._record_writes({todo_id: None})
         logger.info("Delete todo completed", extra={"todo_id": todo_id})
         duration_ms = (perf_counter() - started) * 1000
         record_todo_operation_metric(
@@ -140,3 +564,103 @@ class TodoService:
             "todo.delete.completed",
             {"todo.action": "delete", "todo.id": todo_id},
         )
+
+    async def delete_todos(self, ids: list[int]) -> tuple[list[int], list[int]]:
+        """Delete ids in chunks; returns (deleted, not_found) in request order."""
+        started = perf_counter()
+        logger.info("Batch delete todos invoked", extra={"count": len(ids)})
+        unique_ids = list(dict.fromkeys(ids))
+        async with self._invalidate_cache_on_error(unique_ids):
+            deleted_set = set(await self.repository.delete_many(unique_ids))
+        await self._record_writes(dict.fromkeys(deleted_set))
+        deleted = [todo_id for todo_id in unique_ids if todo_id in deleted_set]
+        not_found = [todo_id for todo_id in unique_ids if todo_id not in deleted_set]
+        self._record_batch_delete(started, deleted, not_found)
+        return deleted, not_found
+
+    async def delete_todos_matching(self, filters: TodoFilter) -> list[int]:
+        started = perf_counter()
+        logger.info(
+            "Filtered delete todos invoked",
+            extra={"filters": filters.model_dump(exclude_none=True)},
+        )
+        async with self._invalidate_cache_on_error([]):
+            deleted = await self.repository.delete_matching(filters)
+        await self._record_writes(dict.fromkeys(deleted))
+        self._record_batch_delete(started, deleted, [])
+        return deleted
+
+    async def archive_completed_todos(
+        self,
+        older_than_days: int,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        """Move todos completed more than `older_than_days` ago to the archive."""
+        started = perf_counter()
+        before = datetime.now(UTC) - timedelta(days=older_than_days)
+        logger.info(
+            "Archive todos invoked",
+            extra={"older_than_days": older_than_days, "batch_size": batch_size},
+        )
+        archived = await self.repository.archive_completed(before, batch_size)
+        logger.info("Archive todos completed", extra={"archived": archived})
+        duration_ms = (perf_counter() - started) * 1000
+        record_todo_operation_metric(
+            action="archive", outcome="success", duration_ms=duration_ms
+        )
+        emit_business_event(
+            "todo.archive.completed",
+            {"todo.action": "archive", "todo.archived": archived},
+        )
+        return archived
+
+    async def _record_writes(self, todos: dict[int, TodoRead | None]) -> None:
+        """Update both cache tiers after committed writes (None = deleted)."""
+        if not todos:
+            return
+        if self.shared_cache is None:
+            for todo_id, todo in todos.items():
+                self.cache.write(todo_id, todo)
+            return
+        versions = await self.shared_cache.write_many(todos)
+        for todo_id, todo in todos.items():
+            self.cache.write(todo_id, todo, versions[todo_id] or ANY_VERSION)
+
+    @asynccontextmanager
+    async def _invalidate_cache_on_error(
+        self, todo_ids: list[int]
+    ) -> AsyncIterator[None]:
+        # Chunked deletes commit as they go; after a failure part-way through
+        # the caches cannot tell which ids are gone.
+        try:
+            yield
+        except Exception:
+            self.cache.clear()
+            if self.shared_cache is not None and todo_ids:
+                await self.shared_cache.invalidate_many(todo_ids)
+            raise
+
+    def _record_batch_delete(
+        self,
+        started: float,
+        deleted: list[int],
+        not_found: list[int],
+    ) -> None:
+        logger.info(
+            "Batch delete todos completed",
+            extra={"deleted": len(deleted), "not_found": len(not_found)},
+        )
+        duration_ms = (perf_counter() - started) * 1000
+        record_todo_operation_metric(
+            action="delete_batch",
+            outcome="success" if not not_found else "partial",
+            duration_ms=duration_ms,
+        )
+        emit_business_event(
+            "todo.delete_batch.completed",
+            {
+                "todo.action": "delete_batch",
+                "todo.deleted": len(deleted),
+                "todo.not_found": len(not_found),
+            },
+        )
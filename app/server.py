@@ -0,0 +1,97 @@
+"""Production entrypoint: uvicorn with a readiness-first shutdown.
+
+uvicorn handles SIGTERM itself. It stops accepting connections at once and
+runs the lifespan shutdown only after open connections have finished, so
+without help a replica disappears before the load balancer ever sees its
+readiness fail. `DrainingServer` puts a step in front of that. The first
+SIGTERM/SIGINT marks the process draining: `/health/ready` returns 503 and
+responses close their connections. uvicorn's own shutdown starts
+`SHUTDOWN_READINESS_DELAY_SECONDS` later. A second signal skips the wait.
+
+Usage:
+    python -m app.server --host 0.0.0.0 --port 8000 --timeout-graceful-shutdown 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+import socket
+from types import FrameType
+
+import uvicorn
+
+from app.core.config import get_settings
+from app.core.lifecycle import LifecycleState
+from app.core.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DrainingServer(uvicorn.Server):
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        state: LifecycleState,
+        readiness_delay_seconds: float,
+    ):
+        super().__init__(config)
+        self.state = state
+        self.readiness_delay_seconds = readiness_delay_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def serve(self, sockets: list[socket.socket] | None = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        await super().serve(sockets)
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        if (
+            self.state.draining
+            or self._loop is None
+            or self.readiness_delay_seconds <= 0
+        ):
+            super().handle_exit(sig, frame)
+            return
+        # Runs as a signal handler: flip the flag and hand over to the loop.
+        self.state.start_draining()
+        self._loop.call_soon_threadsafe(self._exit_after_delay, sig, frame)
+
+    def _exit_after_delay(self, sig: int, frame: FrameType | None) -> None:
+        logger.info(
+            "Shutdown signal received; failing readiness before stopping",
+            extra={
+                "signal": signal.Signals(sig).name,
+                "delay_seconds": self.readiness_delay_seconds,
+            },
+        )
+        self._loop.call_later(
+            self.readiness_delay_seconds, super().handle_exit, sig, frame
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--timeout-graceful-shutdown", type=int, default=None)
+    args = parser.parse_args()
+
+    from app.main import app, lifecycle
+
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        timeout_graceful_shutdown=args.timeout_graceful_shutdown,
+    )
+    server = DrainingServer(
+        config,
+        lifecycle,
+        readiness_delay_seconds=get_settings().shutdown_readiness_delay_seconds,
+    )
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
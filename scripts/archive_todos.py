@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Move completed todos older than N days from `todos` into `todos_archive`.
+
+Rows move in batches of `--batch-size`, one transaction per batch, so the job
+can be interrupted and rerun at any time. Archived todos are still served by
+`GET /todos/{id}` and by `GET /todos/?include_archived=true`.
+
+Usage:
+    python scripts/archive_todos.py --older-than-days 90
+    python scripts/archive_todos.py --older-than-days 30 --batch-size 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure the project root is importable even when the script is invoked directly.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import async_engine, async_session_factory  # noqa: E402
+from app.modules.todos.archival import run_archival  # noqa: E402
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=settings.todo_archive_older_than_days,
+        help="Archive todos completed (last updated) more than this many days ago",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.todo_archive_batch_size,
+        help="Rows moved per transaction",
+    )
+    args = parser.parse_args()
+    if args.older_than_days < 0:
+        parser.error("--older-than-days must not be negative")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    async def _main() -> None:
+        try:
+            archived = await run_archival(
+                async_session_factory, args.older_than_days, args.batch_size
+            )
+            print(f"archived {archived} todo(s)")
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
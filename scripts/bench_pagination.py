@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark offset vs keyset pagination latency across page depths.
+
+Seeds the configured PostgreSQL database with synthetic todos (default one
+million rows) and times `TodoRepository.list` at increasing page depths in both
+modes. Offset latency grows with depth; keyset latency should stay flat.
+
+Usage:
+    python scripts/bench_pagination.py --rows 1000000 --limit 20 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+from pathlib import Path
+from time import perf_counter
+
+# Ensure the project root is importable even when the script is invoked directly.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import func, select, text  # noqa: E402
+
+from app.core.database import async_session_factory  # noqa: E402
+from app.modules.todos.model import Todo  # noqa: E402
+from app.modules.todos.repository import TodoRepository  # noqa: E402
+
+DEFAULT_DEPTHS = (0, 10, 100, 1_000, 10_000, 49_000)
+
+SEED_SQL = text(
+    """
+    INSERT INTO todos (title, description, is_completed, created_at, updated_at)
+    SELECT
+        'bench todo ' || g,
+        'synthetic row for pagination benchmark',
+        g % 3 = 0,
+        now() - make_interval(secs => g),
+        now() - make_interval(secs => g)
+    FROM generate_series(1, :missing) AS g
+    """
+)
+
+
+async def seed(rows: int) -> None:
+    async with async_session_factory() as session:
+        existing = int((await session.execute(select(func.count(Todo.id)))).scalar())
+        missing = rows - existing
+        if missing <= 0:
+            print(f"Table already holds {existing} rows; skipping seed.")
+            return
+        print(f"Seeding {missing} rows...")
+        await session.execute(SEED_SQL, {"missing": missing})
+        await session.commit()
+        await session.execute(text("ANALYZE todos"))
+        await session.commit()
+
+
+async def _time(call, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = perf_counter()
+        await call()
+        samples.append((perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def run(limit: int, depths: tuple[int, ...], repeat: int) -> None:
+    print(f"{'page':>8} {'offset ms':>12} {'keyset ms':>12}")
+    async with async_session_factory() as session:
+        repository = TodoRepository(session)
+        for page in depths:
+            offset = page * limit
+            anchor = None
+            if offset:
+                # Locate the keyset anchor once (untimed), as a client holding
+                # `next_cursor` from the previous page would.
+                stmt = (
+                    select(Todo.created_at, Todo.id)
+                    .order_by(Todo.created_at.desc(), Todo.id.desc())
+                    .offset(offset - 1)
+                    .limit(1)
+                )
+                row = (await session.execute(stmt)).one_or_none()
+                if row is None:
+                    break
+                anchor = (row.created_at, row.id)
+
+            offset_ms = await _time(
+                lambda o=offset: repository.list(limit=limit, offset=o), repeat
+            )
+            keyset_ms = await _time(
+                lambda a=anchor: repository.list(limit=limit, after=a), repeat
+            )
+            print(f"{page:>8} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    async def _main() -> None:
+        if not args.skip_seed:
+            await seed(args.rows)
+        await run(args.limit, DEFAULT_DEPTHS, args.repeat)
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
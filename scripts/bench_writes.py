@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Compare round trips and latency per write for each todo write mode.
+
+Runs create, update and delete through `TodoRepository` in both the `orm`
+(lock/flush/refresh) and `returning` (single-statement ... RETURNING) modes.
+Round trips are counted from engine events: each BEGIN, statement and COMMIT
+sent to the configured database counts as one.
+
+Usage:
+    python scripts/bench_writes.py --iterations 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+from collections import Counter
+from pathlib import Path
+from time import perf_counter
+
+# Ensure the project root is importable even when the script is invoked directly.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import event  # noqa: E402
+
+from app.core.database import async_engine, async_session_factory  # noqa: E402
+from app.modules.todos.repository import TodoRepository  # noqa: E402
+from app.modules.todos.schemas import TodoCreate, TodoUpdate  # noqa: E402
+
+WRITE_MODES = ("orm", "returning")
+OPERATIONS = ("create", "update", "delete")
+
+round_trips: Counter[str] = Counter()
+
+
+def _install_round_trip_counter() -> None:
+    engine = async_engine.sync_engine
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):  # noqa: ARG001
+        round_trips["total"] += 1
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _on_execute(
+        conn, cursor, statement, params, context, executemany
+    ):  # noqa: ARG001
+        round_trips["total"] += 1
+
+    @event.listens_for(engine, "commit")
+    def _on_commit(conn):  # noqa: ARG001
+        round_trips["total"] += 1
+
+
+async def _measure(call) -> tuple[object, float, int]:
+    before = round_trips["total"]
+    started = perf_counter()
+    result = await call()
+    elapsed_ms = (perf_counter() - started) * 1000
+    return result, elapsed_ms, round_trips["total"] - before
+
+
+async def run_mode(write_mode: str, iterations: int) -> dict[str, tuple[float, float]]:
+    latencies: dict[str, list[float]] = {operation: [] for operation in OPERATIONS}
+    trips: dict[str, list[int]] = {operation: [] for operation in OPERATIONS}
+
+    async with async_session_factory() as session:
+        repository = TodoRepository(session, write_mode=write_mode)
+        for i in range(iterations):
+            todo, ms, count = await _measure(
+                lambda i=i: repository.create(TodoCreate(title=f"bench write {i}"))
+            )
+            latencies["create"].append(ms)
+            trips["create"].append(count)
+
+            _, ms, count = await _measure(
+                lambda todo_id=todo.id: repository.update_by_id(
+                    todo_id, TodoUpdate(is_completed=True)
+                )
+            )
+            latencies["update"].append(ms)
+            trips["update"].append(count)
+
+            _, ms, count = await _measure(
+                lambda todo_id=todo.id: repository.delete_by_id(todo_id)
+            )
+            latencies["delete"].append(ms)
+            trips["delete"].append(count)
+
+    return {
+        operation: (
+            statistics.mean(trips[operation]),
+            statistics.median(latencies[operation]),
+        )
+        for operation in OPERATIONS
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    async def _main() -> None:
+        _install_round_trip_counter()
+        print(f"{'mode':>10} {'operation':>10} {'round trips':>12} {'p50 ms':>10}")
+        for write_mode in WRITE_MODES:
+            results = await run_mode(write_mode, args.iterations)
+            for operation, (trip_count, p50_ms) in results.items():
+                print(
+                    f"{write_mode:>10} {operation:>10} "
+                    f"{trip_count:>12.1f} {p50_ms:>10.2f}"
+                )
+        await async_engine.dispose()
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Measure goodput under overload with and without admission control.
+
+Drives an open-loop request rate above what the backend can serve and counts
+goodput: responses that succeed within the client deadline. By default the
+backend is simulated in-process (a fixed number of "connections", each request
+holding one for `--service-ms`), so the comparison runs without a database.
+With `--url`, the same load is sent to a running deployment instead.
+
+Usage:
+    python scripts/load_test_admission.py --rate 400 --capacity 10 --service-ms 50
+    python scripts/load_test_admission.py --url http://localhost:8000/api/v1/todos/
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+from collections import Counter
+from pathlib import Path
+from time import perf_counter
+
+import httpx
+
+# Ensure the project root is importable even when the script is invoked directly.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.core.middleware.admission import (  # noqa: E402
+    AdaptiveConcurrencyLimiter,
+    AdmissionControlMiddleware,
+)
+
+
+def build_simulated_backend(capacity: int, service_ms: float):
+    """ASGI app whose requests queue on `capacity` slots, like a DB pool."""
+    slots = asyncio.Semaphore(capacity)
+
+    async def app(scope, receive, send):  # noqa: ARG001
+        async with slots:
+            await asyncio.sleep(service_ms / 1000)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    return app
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    url: str,
+    rate: float,
+    duration: float,
+    deadline_ms: float,
+) -> tuple[Counter[str], list[float]]:
+    outcomes: Counter[str] = Counter()
+    good_latencies: list[float] = []
+
+    async def one_request() -> None:
+        started = perf_counter()
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError:
+            outcomes["error"] += 1
+            return
+        elapsed_ms = (perf_counter() - started) * 1000
+        if response.status_code == 503:
+            outcomes["shed"] += 1
+        elif response.status_code >= 400:
+            outcomes["error"] += 1
+        elif elapsed_ms > deadline_ms:
+            outcomes["late"] += 1
+        else:
+            outcomes["good"] += 1
+            good_latencies.append(elapsed_ms)
+
+    tasks: list[asyncio.Task[None]] = []
+    interval = 1 / rate
+    started = perf_counter()
+    while perf_counter() - started < duration:
+        tasks.append(asyncio.create_task(one_request()))
+        await asyncio.sleep(interval)
+    await asyncio.gather(*tasks)
+    return outcomes, good_latencies
+
+
+def _report(
+    label: str,
+    outcomes: Counter[str],
+    good_latencies: list[float],
+    duration: float,
+) -> None:
+    total = sum(outcomes.values())
+    p50 = statistics.median(good_latencies) if good_latencies else 0.0
+    print(
+        f"{label:>12} {total:>8} {outcomes['good']:>8} {outcomes['late']:>8} "
+        f"{outcomes['shed']:>8} {outcomes['error']:>8} "
+        f"{outcomes['good'] / duration:>12.1f} {p50:>10.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Target a running deployment instead")
+    parser.add_argument("--rate", type=float, default=400, help="Requests/second")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds")
+    parser.add_argument("--deadline-ms", type=float, default=500)
+    parser.add_argument("--capacity", type=int, default=10)
+    parser.add_argument("--service-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    async def _main() -> None:
+        print(
+            f"{'setup':>12} {'sent':>8} {'good':>8} {'late':>8} {'shed':>8} "
+            f"{'error':>8} {'goodput/s':>12} {'p50 ms':>10}"
+        )
+        if args.url:
+            async with httpx.AsyncClient(timeout=None) as client:
+                outcomes, latencies = await run_load(
+                    client, args.url, args.rate, args.duration, args.deadline_ms
+                )
+            _report("remote", outcomes, latencies, args.duration)
+            return
+
+        setups = {
+            "unprotected": build_simulated_backend(args.capacity, args.service_ms),
+            "admission": AdmissionControlMiddleware(
+                build_simulated_backend(args.capacity, args.service_ms),
+                limiter=AdaptiveConcurrencyLimiter(
+                    initial_limit=args.capacity,
+                    min_limit=1,
+                    max_limit=args.capacity * 4,
+                    target_latency_ms=args.deadline_ms / 2,
+                    max_queue=args.capacity * 2,
+                    max_queue_ms=args.deadline_ms / 4,
+                ),
+            ),
+        }
+        for label, app in setups.items():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=None
+            ) as client:
+                outcomes, latencies = await run_load(
+                    client, "/load", args.rate, args.duration, args.deadline_ms
+                )
+            _report(label, outcomes, latencies, args.duration)
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Create upcoming monthly `todos` partitions and optionally retire old ones.
+
+Calls the `todos_ensure_partitions` / `todos_drop_partitions_before` functions
+installed by migration `20261017_todos_partitioned`. The app already creates
+partitions on a schedule (`TODO_PARTITION_MAINTENANCE_ENABLED`); use this for
+retention, or to create partitions by hand.
+
+Usage:
+    python scripts/manage_partitions.py --months-ahead 3
+    python scripts/manage_partitions.py --retain-months 24
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+# Ensure the project root is importable even when the script is invoked directly.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core.database import async_engine  # noqa: E402
+from app.modules.todos.partitions import ensure_partitions  # noqa: E402
+
+_DROP_BEFORE = text("SELECT todos_drop_partitions_before(:cutoff)")
+
+
+def retention_cutoff(retain_months: int, now: datetime | None = None) -> datetime:
+    """Start of the oldest month to keep (UTC): the current month counts as one."""
+    now = now or datetime.now(UTC)
+    month_index = now.year * 12 + (now.month - 1) - (retain_months - 1)
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=UTC)
+
+
+async def run(months_ahead: int, retain_months: int | None) -> None:
+    if async_engine.dialect.name != "postgresql":
+        print("todos is only partitioned on PostgreSQL; nothing to do")
+        return
+
+    created = await ensure_partitions(async_engine, months_ahead)
+    print(f"created {created} partition(s)")
+
+    if retain_months is not None:
+        cutoff = retention_cutoff(retain_months)
+        async with async_engine.begin() as conn:
+            dropped = await conn.scalar(_DROP_BEFORE, {"cutoff": cutoff})
+        print(f"dropped {dropped} partition(s) before {cutoff:%Y-%m-%d}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months-ahead", type=int, default=3)
+    parser.add_argument(
+        "--retain-months",
+        type=int,
+        help="Drop partitions older than this many months (current month included)",
+    )
+    args = parser.parse_args()
+    if args.retain_months is not None and args.retain_months < 1:
+        parser.error("--retain-months must be at least 1")
+
+    async def _main() -> None:
+        try:
+            await run(args.months_ahead, args.retain_months)
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
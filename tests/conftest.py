@@ -1,12 +1,22 @@
 import os
 import tempfile
 
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.core.database import Base, get_db
+from app.core.database import Base, apply_consistency_token, get_db
 from app.main import app
+from app.modules.todos.cache import todo_read_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_todo_cache():
+    # Every test gets a fresh database whose ids restart at 1.
+    todo_read_cache.clear()
+    yield
+    todo_read_cache.clear()
 
 
 @pytest_asyncio.fixture()
@@ -42,6 +52,7 @@ async def client(
 ) -> AsyncClient:
     async def override_get_db():
         async with async_session_factory() as session:
+            apply_consistency_token(session)
             yield session
 
     app.dependency_overrides[get_db] = override_get_db
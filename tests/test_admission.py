@@ -0,0 +1,203 @@
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import app.core.middleware.admission as admission
+from app.core.middleware.admission import (
+    AdaptiveConcurrencyLimiter,
+    AdmissionControlMiddleware,
+)
+from app.core.middleware.correlation import CorrelationIdMiddleware
+from app.core.middleware.drain import DrainMiddleware
+from app.main import app as main_app
+
+
+def _limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    options = {
+        "initial_limit": 1,
+        "min_limit": 1,
+        "max_limit": 10,
+        "target_latency_ms": 100,
+        "max_queue": 1,
+        "max_queue_ms": 200,
+    }
+    options.update(overrides)
+    return AdaptiveConcurrencyLimiter(**options)
+
+
+def _blocking_app(gate: asyncio.Event):
+    async def app(scope, receive, send):  # noqa: ARG001
+        await gate.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_queued_request_is_admitted_when_a_slot_frees():
+    limiter = _limiter()
+
+    assert await limiter.acquire() == "admitted"
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    limiter.release(latency_ms=1)
+
+    assert await waiter == "queued"
+    assert limiter.in_flight == 1
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_and_queue_timeout_shed():
+    limiter = _limiter(max_queue_ms=20)
+
+    assert await limiter.acquire() == "admitted"
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # Queue holds one request, so the next is shed without waiting.
+    assert await limiter.acquire() == "shed"
+    # The queued one gives up after max_queue_ms.
+    assert await waiter == "shed"
+    assert limiter.queued == 0
+    assert limiter.in_flight == 1
+
+
+def _clock(monkeypatch: pytest.MonkeyPatch, start: float = 100.0) -> list[float]:
+    now = [start]
+    monkeypatch.setattr(admission, "perf_counter", lambda: now[0])
+    return now
+
+
+def test_limit_grows_additively_and_backs_off_multiplicatively(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    now = _clock(monkeypatch)
+    limiter = _limiter(initial_limit=4, max_queue=0)
+
+    limiter.in_flight = 4
+    limiter.release(latency_ms=10)
+    assert limiter.limit == pytest.approx(4.25)
+
+    limiter.in_flight = 4
+    limiter.release(latency_ms=500)
+    assert limiter.limit == pytest.approx(4.25 * 0.9)
+
+    now[0] += 1
+    limiter.in_flight = 1
+    limiter.release(latency_ms=10, failed=True)
+    assert limiter.limit == pytest.approx(4.25 * 0.81)
+
+    # Fast completions while mostly idle do not raise the limit.
+    before = limiter.limit
+    limiter.in_flight = 1
+    limiter.release(latency_ms=10)
+    assert limiter.limit == before
+
+
+def test_limit_backs_off_at_most_once_per_round_trip(monkeypatch: pytest.MonkeyPatch):
+    now = _clock(monkeypatch)
+    limiter = _limiter(initial_limit=10, max_queue=0)
+    limiter.in_flight = 10
+
+    # A burst of slow completions, all admitted before the first decrease.
+    for _ in range(5):
+        limiter.release(latency_ms=500)
+        now[0] += 0.01
+    assert limiter.limit == pytest.approx(9)
+
+    # Admitted after that decrease: its latency reflects the new limit.
+    limiter.release(latency_ms=10, failed=True)
+    assert limiter.limit == pytest.approx(8.1)
+
+    # Unmeasured requests back off on failure, but also once per round trip.
+    limiter.release(latency_ms=10, failed=True, measured=False)
+    assert limiter.limit == pytest.approx(8.1)
+    limiter.release(latency_ms=10_000, measured=False)
+    assert limiter.limit == pytest.approx(8.1)
+
+
+@pytest.mark.asyncio
+async def test_latency_is_measured_to_first_byte_and_skips_unmeasured_paths():
+    async def slow_body_app(scope, receive, send):  # noqa: ARG001
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def slow_headers_app(scope, receive, send):  # noqa: ARG001
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    limiter = _limiter(initial_limit=4, target_latency_ms=20)
+    for inner in (slow_body_app, slow_headers_app):
+        app = AdmissionControlMiddleware(
+            inner, limiter=limiter, unmeasured_paths=("/upload",)
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            assert (await client.get("/export")).status_code == 200
+            assert (await client.post("/upload")).status_code == 200
+        # A streamed body and an unmeasured path leave the limit alone.
+        if inner is slow_body_app:
+            assert limiter.limit == 4
+
+    # Only the slow-headers GET backs off.
+    assert limiter.limit == pytest.approx(3.6)
+
+
+@pytest.mark.asyncio
+async def test_shed_responses_carry_the_correlation_id():
+    # Registered last, so it wraps admission, deadline and drain.
+    order = [middleware.cls for middleware in main_app.user_middleware]
+    assert order.index(CorrelationIdMiddleware) < order.index(DrainMiddleware)
+
+    gate = asyncio.Event()
+    app = CorrelationIdMiddleware(
+        AdmissionControlMiddleware(_blocking_app(gate), limiter=_limiter(max_queue=0))
+    )
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        in_flight = asyncio.create_task(client.get("/api/v1/todos/"))
+        await asyncio.sleep(0.05)
+
+        shed = await client.get(
+            "/api/v1/todos/", headers={"x-correlation-id": "req-123"}
+        )
+        assert shed.status_code == 503
+        assert shed.headers["x-correlation-id"] == "req-123"
+
+        gate.set()
+        assert (await in_flight).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_with_retry_after_and_exempts_health():
+    gate = asyncio.Event()
+    app = AdmissionControlMiddleware(
+        _blocking_app(gate),
+        limiter=_limiter(max_queue=0, max_queue_ms=1500),
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        in_flight = asyncio.create_task(client.get("/api/v1/todos/"))
+        await asyncio.sleep(0.05)
+
+        shed = await client.get("/api/v1/todos/")
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "2"
+        assert shed.json()["error"]["code"] == "overloaded"
+
+        health = asyncio.create_task(client.get("/health"))
+        await asyncio.sleep(0.05)
+        gate.set()
+        assert (await health).status_code == 200
+        assert (await in_flight).status_code == 200
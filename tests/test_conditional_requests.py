@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import get_settings
+from app.modules.todos.cache import todo_read_cache
+from app.modules.todos.model import Todo
+from app.modules.todos.repository import TodoRepository
+
+BASE_URL = get_settings().api_prefix + "/todos"
+
+
+@pytest.mark.asyncio
+async def test_get_todo_revalidates_without_hydrating_the_row(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    created = await client.post(f"{BASE_URL}/", json={"title": "Etag"})
+    assert created.headers["cache-control"] == "no-store"
+    todo_id = created.json()["id"]
+
+    first = await client.get(f"{BASE_URL}/{todo_id}")
+    etag = first.headers["etag"]
+    assert not etag.startswith("W/")
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    hydrated: list[int] = []
+    original_get = TodoRepository.get
+
+    async def counting_get(self, todo_id: int):
+        hydrated.append(todo_id)
+        return await original_get(self, todo_id)
+
+    monkeypatch.setattr(TodoRepository, "get", counting_get)
+    # Cold cache: the version comes from the single-column query.
+    todo_read_cache.clear()
+
+    for headers in (
+        {"If-None-Match": etag},
+        {"If-None-Match": f'"other", W/{etag}'},
+        {"If-None-Match": "*"},
+        {"If-Modified-Since": first.headers["last-modified"]},
+    ):
+        response = await client.get(f"{BASE_URL}/{todo_id}", headers=headers)
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == "private, no-cache"
+    assert hydrated == []
+
+    # If-None-Match wins over If-Modified-Since.
+    response = await client.get(
+        f"{BASE_URL}/{todo_id}",
+        headers={
+            "If-None-Match": '"stale"',
+            "If-Modified-Since": first.headers["last-modified"],
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+    assert hydrated == [todo_id]
+
+    missing = await client.get(f"{BASE_URL}/999", headers={"If-None-Match": etag})
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_pages_get_weak_etags_that_follow_their_rows(client: AsyncClient):
+    for title in ("A", "B"):
+        await client.post(f"{BASE_URL}/", json={"title": title})
+
+    page = await client.get(f"{BASE_URL}/", params={"limit": 5})
+    etag = page.headers["etag"]
+    assert etag.startswith('W/"')
+    assert page.headers["cache-control"] == "private, no-cache"
+    assert "last-modified" not in page.headers
+
+    unchanged = await client.get(
+        f"{BASE_URL}/", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    # A different page of the same rows is a different representation.
+    other = await client.get(
+        f"{BASE_URL}/", params={"limit": 1}, headers={"If-None-Match": etag}
+    )
+    assert other.status_code == 200
+
+    await client.post(f"{BASE_URL}/", json={"title": "C"})
+    changed = await client.get(
+        f"{BASE_URL}/", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(changed.json()["items"]) == 3
+
+    stats = await client.get(f"{BASE_URL}/stats")
+    assert stats.headers["cache-control"] == "private, max-age=60"
+
+
+@pytest.mark.asyncio
+async def test_update_in_the_same_second_changes_the_etag(client: AsyncClient):
+    # SQLite stores `updated_at` to the second, so only the row version can
+    # tell these representations apart.
+    created = await client.post(f"{BASE_URL}/", json={"title": "Before"})
+    todo_id = created.json()["id"]
+    etags = [(await client.get(f"{BASE_URL}/{todo_id}")).headers["etag"]]
+
+    await client.put(f"{BASE_URL}/{todo_id}", json={"title": "After"})
+    etags.append((await client.get(f"{BASE_URL}/{todo_id}")).headers["etag"])
+    await client.patch(
+        f"{BASE_URL}:batch",
+        json={"items": [{"id": todo_id, "changes": {"is_completed": True}}]},
+    )
+    todo_read_cache.clear()
+
+    stale = await client.get(
+        f"{BASE_URL}/{todo_id}", headers={"If-None-Match": ", ".join(etags)}
+    )
+    assert stale.status_code == 200
+    assert stale.json()["is_completed"] is True
+    assert stale.headers["etag"] not in etags
+    assert len(set(etags)) == 2
+
+    current = await client.get(
+        f"{BASE_URL}/{todo_id}", headers={"If-None-Match": stale.headers["etag"]}
+    )
+    assert current.status_code == 304
+
+
+def test_postgres_leaves_the_version_bump_to_the_trigger():
+    # The trigger also covers writes that never go through SQLAlchemy.
+    stmt = update(Todo).where(Todo.id == 1).values(title="x")
+    assert "version=version + 1" in str(stmt.compile(dialect=sqlite.dialect()))
+    assert "version=version " in str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+
+    path = (
+        Path(__file__).resolve().parents[1]
+        / "alembic"
+        / "versions"
+        / "20261017_add_todos_row_version.py"
+    )
+    source = path.read_text()
+    assert "NEW.version = OLD.version + 1" in source
+    assert "BEFORE UPDATE ON {table}" in source
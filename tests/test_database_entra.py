@@ -1,13 +1,13 @@
 import asyncio
-import sys
 import time
-from types import SimpleNamespace
 
 import pytest
 from sqlalchemy import exc as sa_exc
+from sqlalchemy.util import greenlet_spawn
 
 import app.core.database as database
 from app.core.config import Settings
+from app.core.pool_recycling import RECYCLE_AT_KEY
 
 
 class _Token:
@@ -16,16 +16,24 @@ class _Token:
         self.expires_on = expires_on
 
 
-class _CredentialStub:
-    def __init__(self, tokens: list[_Token]):
+class _AsyncCredentialStub:
+    """Async credential returning `tokens` in order after `latency` seconds."""
+
+    def __init__(self, tokens: list[_Token], latency: float = 0.0):
         self._tokens = tokens
+        self.latency = latency
         self.calls = 0
+        self.closed = False
 
-    def get_token(self, _scope: str) -> _Token:
+    async def get_token(self, _scope: str) -> _Token:
         value = self._tokens[min(self.calls, len(self._tokens) - 1)]
         self.calls += 1
+        await asyncio.sleep(self.latency)
         return value
 
+    async def close(self) -> None:
+        self.closed = True
+
 
 class _ConnRecStub:
     def __init__(self):
@@ -36,26 +44,10 @@ class _ConnRecStub:
         self.invalidated = True
 
 
-def _install_azure_identity_stub(
+def _provider(
     monkeypatch: pytest.MonkeyPatch,
-    credential: object,
-) -> None:
-    identity_module = SimpleNamespace(
-        DefaultAzureCredential=lambda **kwargs: credential,
-        ManagedIdentityCredential=lambda **kwargs: credential,
-    )
-    monkeypatch.setitem(sys.modules, "azure.identity", identity_module)
-
-
-def test_postgres_token_provider_reuses_cached_token(monkeypatch: pytest.MonkeyPatch):
-    now = time.time()
-    credential = _CredentialStub(
-        [
-            _Token("token-1", now + 3600),
-            _Token("token-2", now + 7200),
-        ]
-    )
-    _install_azure_identity_stub(monkeypatch, credential)
+    credential: _AsyncCredentialStub,
+) -> database._PostgresTokenProvider:
     monkeypatch.setattr(
         database,
         "get_settings",
@@ -64,43 +56,124 @@ def test_postgres_token_provider_reuses_cached_token(monkeypatch: pytest.MonkeyP
             ENTRA_DB_TOKEN_REFRESH_SKEW_SECONDS=300,
         ),
     )
+    return database._PostgresTokenProvider(credential)
 
-    provider = database._PostgresTokenProvider()
-    token_1, _ = provider.get_token()
-    token_2, _ = provider.get_token()
 
-    assert token_1 == "token-1"
-    assert token_2 == "token-1"
-    assert credential.calls == 1
+async def _connect_token(provider: database._PostgresTokenProvider) -> str:
+    # `do_connect` runs in the async engine's greenlet; mirror that here.
+    token, _ = await greenlet_spawn(provider.get_token)
+    return token
+
+
+@pytest.mark.asyncio
+async def test_postgres_token_provider_reuses_cached_token(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    now = time.time()
+    credential = _AsyncCredentialStub(
+        [
+            _Token("token-1", now + 3600),
+            _Token("token-2", now + 7200),
+        ]
+    )
+    provider = _provider(monkeypatch, credential)
+    try:
+        assert await _connect_token(provider) == "token-1"
+        assert await _connect_token(provider) == "token-1"
+        assert credential.calls == 1
+        # Next background refresh is two skews ahead of expiry.
+        assert provider._next_refresh_delay(now) == pytest.approx(3000, abs=1)
+    finally:
+        await provider.close()
+    assert credential.closed is True
 
 
-def test_postgres_token_provider_refreshes_near_expiry(monkeypatch: pytest.MonkeyPatch):
+@pytest.mark.asyncio
+async def test_postgres_token_provider_refreshes_near_expiry(
+    monkeypatch: pytest.MonkeyPatch,
+):
     now = time.time()
-    credential = _CredentialStub(
+    credential = _AsyncCredentialStub(
         [
             _Token("token-1", now + 120),
             _Token("token-2", now + 3600),
         ]
     )
-    _install_azure_identity_stub(monkeypatch, credential)
-    monkeypatch.setattr(
-        database,
-        "get_settings",
-        lambda: Settings(
-            DB_AUTH_MODE="aad",
-            ENTRA_DB_TOKEN_REFRESH_SKEW_SECONDS=300,
-        ),
-    )
-
-    provider = database._PostgresTokenProvider()
-    first, _ = provider.get_token()
-    second, _ = provider.get_token()
+    provider = _provider(monkeypatch, credential)
+    try:
+        first = await _connect_token(provider)
+        second = await _connect_token(provider)
+    finally:
+        await provider.close()
 
     assert first == "token-1"
     assert second == "token-2"
     assert credential.calls == 2
 
 
+@pytest.mark.asyncio
+async def test_connects_are_not_blocked_by_background_token_refresh(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    now = time.time()
+    credential = _AsyncCredentialStub(
+        [
+            _Token("token-1", now + 3600),
+            _Token("token-2", now + 7200),
+        ]
+    )
+    provider = _provider(monkeypatch, credential)
+    try:
+        await provider.start()
+        credential.latency = 0.3
+
+        # What the background refresher runs once the lead time is reached.
+        refresh = asyncio.create_task(provider._fetch(force=True))
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        tokens = await asyncio.gather(*(_connect_token(provider) for _ in range(20)))
+        elapsed = time.perf_counter() - started
+
+        assert not refresh.done()
+        assert tokens == ["token-1"] * 20
+        assert elapsed < 0.05
+
+        await refresh
+        assert await _connect_token(provider) == "token-2"
+        assert credential.calls == 2
+    finally:
+        await provider.close()
+
+
+@pytest.mark.asyncio
+async def test_cold_token_fetch_yields_to_the_loop_and_is_shared(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    credential = _AsyncCredentialStub(
+        [_Token("token-1", time.time() + 3600)], latency=0.2
+    )
+    provider = _provider(monkeypatch, credential)
+    ticks = 0
+
+    async def heartbeat() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        tokens = await asyncio.gather(*(_connect_token(provider) for _ in range(5)))
+    finally:
+        beat.cancel()
+        await provider.close()
+
+    assert tokens == ["token-1"] * 5
+    assert credential.calls == 1
+    # A blocking fetch would have frozen the loop for the whole 200 ms.
+    assert ticks >= 10
+
+
 def test_safe_entra_pool_recycle_is_clamped(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(
         database,
@@ -116,7 +189,7 @@ def test_safe_entra_pool_recycle_is_clamped(monkeypatch: pytest.MonkeyPatch):
     assert database._safe_entra_pool_recycle_seconds() == 3300
 
 
-def test_engine_events_inject_token_and_invalidate_stale_checkout(
+def test_engine_events_inject_token_and_recycle_overdue_checkout(
     monkeypatch: pytest.MonkeyPatch,
 ):
     callbacks: dict[str, object] = {}
@@ -146,6 +219,7 @@ def test_engine_events_inject_token_and_invalidate_stale_checkout(
     monkeypatch.setattr(database.event, "listens_for", fake_listens_for)
     monkeypatch.setattr(database, "create_async_engine", fake_create_async_engine)
     monkeypatch.setattr(database, "_PostgresTokenProvider", _ProviderStub)
+    monkeypatch.setattr(database, "_pool_recyclers", {})
     monkeypatch.setattr(
         database,
         "get_settings",
@@ -158,6 +232,7 @@ def test_engine_events_inject_token_and_invalidate_stale_checkout(
             DATABASE_MAX_OVERFLOW=5,
             DATABASE_POOL_TIMEOUT=20,
             DATABASE_POOL_RECYCLE=7200,
+            DATABASE_POOL_RECYCLE_JITTER_SECONDS=300,
             ENTRA_DB_TOKEN_LIFETIME_SECONDS=3600,
             ENTRA_DB_TOKEN_REFRESH_SKEW_SECONDS=300,
         ),
@@ -167,23 +242,31 @@ def test_engine_events_inject_token_and_invalidate_stale_checkout(
 
     assert created_engine is engine
     assert engine_kwargs["pool_recycle"] == 3300
-    assert "do_connect" in callbacks
-    assert "checkout" in callbacks
+    assert {"do_connect", "connect", "checkout"} <= callbacks.keys()
+    assert set(database._pool_recyclers) == {"primary"}
 
     conn_rec = _ConnRecStub()
     cparams: dict[str, object] = {}
     callbacks["do_connect"](None, conn_rec, [], cparams)
+    callbacks["connect"](None, conn_rec)
     assert cparams["password"] == "entra-token"
-    assert conn_rec.info["entra_token_expires_on"] > time.time()
+    expires_on = conn_rec.info["entra_token_expires_on"]
+    assert expires_on > time.time()
+    # Deadline falls in the jitter window before the token's expiry guard.
+    recycle_at = conn_rec.info[RECYCLE_AT_KEY]
+    guard = database.CONNECTION_EXPIRY_GUARD_SECONDS
+    assert expires_on - guard - 300 <= recycle_at <= expires_on - guard
 
-    conn_rec.info["entra_token_expires_on"] = time.time() + 10
+    callbacks["checkout"](None, conn_rec, None)
+    assert conn_rec.invalidated is False
+
+    conn_rec.info[RECYCLE_AT_KEY] = time.time() - 1
     with pytest.raises(sa_exc.DisconnectionError):
         callbacks["checkout"](None, conn_rec, None)
     assert conn_rec.invalidated is True
 
 
-@pytest.mark.asyncio
-async def test_checkout_invalidates_near_expiry_connections_concurrently(
+def test_connections_opened_together_get_spread_deadlines(
     monkeypatch: pytest.MonkeyPatch,
 ):
     callbacks: dict[str, object] = {}
@@ -192,11 +275,9 @@ async def test_checkout_invalidates_near_expiry_connections_concurrently(
         def __init__(self):
             self.sync_engine = object()
 
-    engine = _EngineStub()
-
     class _ProviderStub:
         def get_token(self) -> tuple[str, float]:
-            return "entra-token", time.time() + 900
+            return "entra-token", 0.0
 
     def fake_listens_for(_target: object, event_name: str):
         def decorator(fn):
@@ -205,48 +286,28 @@ async def test_checkout_invalidates_near_expiry_connections_concurrently(
 
         return decorator
 
-    def _fake_create_async_engine(*_args, **_kwargs):
-        return engine
-
     monkeypatch.setattr(database.event, "listens_for", fake_listens_for)
-    monkeypatch.setattr(database, "create_async_engine", _fake_create_async_engine)
-    monkeypatch.setattr(database, "_PostgresTokenProvider", _ProviderStub)
+    monkeypatch.setattr(database, "create_async_engine", lambda *_, **__: _EngineStub())
+    monkeypatch.setattr(database, "_pool_recyclers", {})
     monkeypatch.setattr(
         database,
         "get_settings",
         lambda: Settings(
             DB_AUTH_MODE="aad",
-            DATABASE_HOST="db.contoso.local",
-            DATABASE_NAME="postgres",
-            DATABASE_USER="uami-principal",
-            DATABASE_POOL_SIZE=5,
-            DATABASE_MAX_OVERFLOW=5,
-            DATABASE_POOL_TIMEOUT=20,
-            DATABASE_POOL_RECYCLE=7200,
-            ENTRA_DB_TOKEN_LIFETIME_SECONDS=3600,
-            ENTRA_DB_TOKEN_REFRESH_SKEW_SECONDS=300,
+            DATABASE_POOL_RECYCLE=1800,
+            DATABASE_POOL_RECYCLE_JITTER_SECONDS=300,
         ),
     )
 
-    database._create_engine_with_entra()
-    checkout = callbacks["checkout"]
+    database._create_engine_with_entra(token_provider=_ProviderStub())
 
-    async def attempt_checkout(expires_in_seconds: int) -> tuple[str, bool]:
+    deadlines = []
+    for _ in range(20):
         conn_rec = _ConnRecStub()
-        conn_rec.info["entra_token_expires_on"] = time.time() + expires_in_seconds
-        await asyncio.sleep(0)
-        try:
-            checkout(None, conn_rec, None)
-            return ("ok", conn_rec.invalidated)
-        except sa_exc.DisconnectionError:
-            return ("disconnected", conn_rec.invalidated)
-
-    windows = [10, 20, 45, 120, 300, 900]
-    results = await asyncio.gather(*(attempt_checkout(v) for v in windows))
-
-    assert results[0] == ("disconnected", True)
-    assert results[1] == ("disconnected", True)
-    assert results[2] == ("disconnected", True)
-    assert results[3] == ("ok", False)
-    assert results[4] == ("ok", False)
-    assert results[5] == ("ok", False)
+        # Same token for every connection, as after a warm-up.
+        conn_rec.info["entra_token_expires_on"] = time.time() + 3600
+        callbacks["connect"](None, conn_rec)
+        deadlines.append(conn_rec.info[RECYCLE_AT_KEY] - time.time())
+
+    assert all(1800 - 300 - 1 <= deadline <= 1800 for deadline in deadlines)
+    assert max(deadlines) - min(deadlines) > 60
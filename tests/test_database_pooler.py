@@ -0,0 +1,130 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+import app.core.database as database
+from app.core.config import Settings
+
+PGBOUNCER_URL = os.getenv("PGBOUNCER_TEST_DATABASE_URL")
+
+
+def _capture_engine_kwargs(monkeypatch: pytest.MonkeyPatch) -> dict[str, object]:
+    captured: dict[str, object] = {}
+
+    def fake_create_async_engine(_url: str, **kwargs):
+        captured.update(kwargs)
+        return SimpleNamespace(sync_engine=object())
+
+    monkeypatch.setattr(database, "create_async_engine", fake_create_async_engine)
+    return captured
+
+
+def test_password_engine_defaults_keep_statement_cache(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    captured = _capture_engine_kwargs(monkeypatch)
+    monkeypatch.setattr(database, "get_settings", lambda: Settings())
+
+    database._create_engine_with_password("postgresql+asyncpg://u:p@db/app")
+
+    # Only the startup statement_timeout; prepared statement caches stay on.
+    assert captured["connect_args"] == {
+        "server_settings": {"statement_timeout": "15000"}
+    }
+    assert captured["pool_size"] == 5
+
+
+def test_transaction_pooler_mode_disables_prepared_statement_caches(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    captured = _capture_engine_kwargs(monkeypatch)
+    monkeypatch.setattr(
+        database,
+        "get_settings",
+        lambda: Settings(DATABASE_POOLER_MODE="transaction", DATABASE_POOL_SIZE=2),
+    )
+
+    database._create_engine_with_password("postgresql+asyncpg://u:p@pgbouncer/app")
+
+    connect_args = captured["connect_args"]
+    assert "server_settings" not in connect_args
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+    assert captured["pool_size"] == 2
+    assert captured["poolclass"] is not NullPool
+
+
+def test_transaction_pooler_null_pool_drops_client_pool_options(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    captured = _capture_engine_kwargs(monkeypatch)
+    monkeypatch.setattr(
+        database,
+        "get_settings",
+        lambda: Settings(
+            DATABASE_POOLER_MODE="transaction",
+            DATABASE_POOLER_NULL_POOL=True,
+        ),
+    )
+
+    database._create_engine_with_password("postgresql+asyncpg://u:p@pgbouncer/app")
+
+    assert captured["poolclass"] is NullPool
+    assert "pool_size" not in captured
+    assert "max_overflow" not in captured
+    assert "pool_timeout" not in captured
+
+
+def test_entra_engine_honours_pooler_mode(monkeypatch: pytest.MonkeyPatch):
+    captured = _capture_engine_kwargs(monkeypatch)
+
+    class _ProviderStub:
+        def get_token(self) -> tuple[str, float]:
+            return "entra-token", 0.0
+
+    monkeypatch.setattr(database.event, "listens_for", lambda *_: lambda fn: fn)
+    monkeypatch.setattr(database, "_pool_recyclers", {})
+    monkeypatch.setattr(
+        database,
+        "get_settings",
+        lambda: Settings(DB_AUTH_MODE="aad", DATABASE_POOLER_MODE="transaction"),
+    )
+
+    database._create_engine_with_entra(
+        "postgresql+asyncpg://uami@pgbouncer/app", _ProviderStub()
+    )
+
+    assert captured["connect_args"]["statement_cache_size"] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    PGBOUNCER_URL is None,
+    reason="set PGBOUNCER_TEST_DATABASE_URL (docker compose --profile pgbouncer)",
+)
+async def test_repeated_statements_through_pgbouncer_transaction_mode(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(
+        database,
+        "get_settings",
+        lambda: Settings(DATABASE_POOLER_MODE="transaction", DATABASE_POOL_SIZE=4),
+    )
+    engine = database._create_engine_with_password(PGBOUNCER_URL)
+    try:
+        # Enough round trips on several client connections that, without the
+        # pooler settings, a cached prepared statement would be reused on a
+        # server connection that never prepared it.
+        for attempt in range(50):
+            async with engine.connect() as conn:
+                value = await conn.scalar(
+                    text("SELECT CAST(:value AS integer)"), {"value": attempt}
+                )
+                assert value == attempt
+    finally:
+        await engine.dispose()
@@ -0,0 +1,167 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+import app.core.database as database
+from app.core.deadline import (
+    REQUEST_DEADLINE_HEADER,
+    REQUEST_TIMEOUT_HEADER,
+    is_statement_timeout,
+    remaining_ms,
+    request_deadline,
+    route_deadline,
+)
+from app.core.exceptions import PersistenceError
+from app.core.middleware.deadline import DeadlineMiddleware
+
+
+def _slow_app(default_ms: int | None = 1000) -> DeadlineMiddleware:
+    app = FastAPI()
+    budgets: list[float | None] = []
+
+    @app.get("/slow")
+    async def slow(delay_ms: int = 0) -> dict[str, bool]:
+        budgets.append(remaining_ms())
+        await asyncio.sleep(delay_ms / 1000)
+        return {"done": True}
+
+    @app.get("/unbounded", dependencies=[Depends(route_deadline(None))])
+    async def unbounded(delay_ms: int = 0) -> dict[str, bool]:
+        budgets.append(remaining_ms())
+        await asyncio.sleep(delay_ms / 1000)
+        return {"done": True}
+
+    middleware = DeadlineMiddleware(app, default_ms=default_ms, max_ms=5000)
+    middleware.budgets = budgets
+    return middleware
+
+
+def _client(app) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_header_cancels_handler_with_504():
+    app = _slow_app()
+    async with _client(app) as client:
+        response = await client.get(
+            "/slow", params={"delay_ms": 2000}, headers={REQUEST_TIMEOUT_HEADER: "50"}
+        )
+
+    assert response.status_code == 504
+    assert response.json()["error"]["code"] == "deadline_exceeded"
+    assert 0 < app.budgets[0] <= 50
+
+
+@pytest.mark.asyncio
+async def test_default_deadline_applies_and_header_is_capped():
+    app = _slow_app(default_ms=50)
+    async with _client(app) as client:
+        timed_out = await client.get("/slow", params={"delay_ms": 500})
+        capped = await client.get("/slow", headers={REQUEST_TIMEOUT_HEADER: "999999"})
+
+    assert timed_out.status_code == 504
+    assert capped.status_code == 200
+    assert app.budgets[1] <= 5000
+
+
+@pytest.mark.asyncio
+async def test_route_default_overrides_server_default_but_not_header():
+    app = _slow_app(default_ms=50)
+    async with _client(app) as client:
+        unbounded = await client.get("/unbounded", params={"delay_ms": 100})
+        client_bound = await client.get(
+            "/unbounded",
+            params={"delay_ms": 500},
+            headers={REQUEST_TIMEOUT_HEADER: "50"},
+        )
+
+    assert unbounded.status_code == 200
+    assert app.budgets[0] is None
+    assert client_bound.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_invalid_or_expired_deadline_headers():
+    app = _slow_app()
+    async with _client(app) as client:
+        invalid = await client.get("/slow", headers={REQUEST_DEADLINE_HEADER: "soon"})
+        expired = await client.get("/slow", headers={REQUEST_DEADLINE_HEADER: "1"})
+
+    assert invalid.status_code == 400
+    assert expired.status_code == 504
+    assert app.budgets == []
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_is_set_from_remaining_budget():
+    statements: list[str] = []
+    connection = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        exec_driver_sql=statements.append,
+    )
+
+    database._set_statement_timeout(None, None, connection)
+    async with request_deadline(250):
+        database._set_statement_timeout(None, None, connection)
+
+    [statement] = statements
+    timeout_ms = int(statement.rsplit(" ", 1)[1])
+    assert statement.startswith("SET LOCAL statement_timeout = ")
+    assert 0 < timeout_ms <= 250
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_keeps_the_connection_default_when_close(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    statements: list[str] = []
+    connection = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        exec_driver_sql=statements.append,
+    )
+    monkeypatch.setattr(database, "_connection_statement_timeout_ms", lambda: 15000)
+
+    # Default budget: the connection's own statement_timeout already fits.
+    async with request_deadline(15000):
+        database._set_statement_timeout(None, None, connection)
+    assert statements == []
+
+    async with request_deadline(30000):
+        database._set_statement_timeout(None, None, connection)
+    async with request_deadline(None):
+        database._set_statement_timeout(None, None, connection)
+    raised, lifted = (int(statement.rsplit(" ", 1)[1]) for statement in statements)
+    assert 15000 < raised <= 30000
+    assert lifted == 0
+
+    # Behind a transaction pooler connections carry no default to rely on.
+    statements.clear()
+    monkeypatch.setattr(database, "_connection_statement_timeout_ms", lambda: None)
+    async with request_deadline(15000):
+        database._set_statement_timeout(None, None, connection)
+    async with request_deadline(None):
+        database._set_statement_timeout(None, None, connection)
+    assert len(statements) == 1
+
+
+def test_statement_timeout_errors_are_recognised():
+    class _QueryCanceled(Exception):
+        sqlstate = "57014"
+
+    wrapped = PersistenceError("Failed to update todo", cause=_QueryCanceled())
+    other = PersistenceError("Failed", cause=RuntimeError("boom"))
+
+    assert is_statement_timeout(wrapped)
+    assert not is_statement_timeout(other)
+
+
+@pytest.mark.asyncio
+async def test_api_requests_succeed_within_deadline(client: AsyncClient):
+    response = await client.get(
+        "/api/v1/todos/", headers={REQUEST_TIMEOUT_HEADER: "5000"}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,138 @@
+import asyncio
+import signal
+
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+import app.main as main
+from app.core.lifecycle import LifecycleState, warm_up_pool, warm_up_size
+from app.core.middleware.drain import DrainMiddleware
+from app.server import DrainingServer
+
+
+def _client(app) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_leaves_distinct_connections_checked_in(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=3,
+        max_overflow=2,
+    )
+    try:
+        assert warm_up_size(engine, None) == 3
+        assert warm_up_size(engine, 10) == 3
+
+        assert await warm_up_pool(engine, "primary", 3) == 3
+        assert engine.pool.checkedin() == 3
+        assert engine.pool.checkedout() == 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_drain_closes_connections_and_waits_for_in_flight():
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.get("/slow")
+    async def slow() -> dict[str, bool]:
+        await release.wait()
+        return {"done": True}
+
+    @app.get("/fast")
+    async def fast() -> dict[str, bool]:
+        return {"done": True}
+
+    state = LifecycleState()
+    async with _client(DrainMiddleware(app, state=state)) as client:
+        assert "connection" not in (await client.get("/fast")).headers
+        in_flight = asyncio.create_task(client.get("/slow"))
+        while state.in_flight == 0:
+            await asyncio.sleep(0)
+
+        state.start_draining()
+        # Still served until uvicorn stops listening, but not kept alive.
+        late = await client.get("/fast")
+        assert late.status_code == 200
+        assert late.headers["connection"] == "close"
+
+        assert await state.wait_idle(0.05) is False
+        release.set()
+        assert await state.wait_idle(1) is True
+        finished = await in_flight
+        assert finished.status_code == 200
+        assert finished.headers["connection"] == "close"
+
+    state.mark_ready()
+    assert state.ready and not state.draining
+
+
+@pytest.mark.asyncio
+async def test_server_fails_readiness_before_uvicorn_stops():
+    state = LifecycleState()
+    state.mark_ready()
+    server = DrainingServer(
+        uvicorn.Config(FastAPI()), state, readiness_delay_seconds=0.05
+    )
+    server._loop = asyncio.get_running_loop()
+
+    server.handle_exit(signal.SIGTERM, None)
+    assert state.draining and not state.ready
+    await asyncio.sleep(0.01)
+    assert server.should_exit is False
+
+    await asyncio.sleep(0.1)
+    assert server.should_exit is True
+
+    # A second signal does not wait again.
+    state.mark_ready()
+    server.should_exit = False
+    server.handle_exit(signal.SIGTERM, None)
+    server.handle_exit(signal.SIGTERM, None)
+    assert server.should_exit is True
+
+
+@pytest.mark.asyncio
+async def test_lifespan_warms_up_before_ready_and_disposes_after_drain(monkeypatch):
+    calls: list[str] = []
+
+    async def fake_warm_up(connections):
+        calls.append("warm_up")
+
+    async def fake_dispose():
+        calls.append("dispose")
+
+    async def fake_prime():
+        calls.append("prime_token")
+        return False
+
+    monkeypatch.setattr(main, "warm_up_engines", fake_warm_up)
+    monkeypatch.setattr(main, "dispose_engines", fake_dispose)
+    monkeypatch.setattr(main, "prime_db_token", fake_prime)
+    monkeypatch.setattr(main.settings, "startup_warmup_enabled", True)
+    monkeypatch.setattr(main.settings, "todo_archive_enabled", False)
+    monkeypatch.setattr(main.settings, "todo_partition_maintenance_enabled", False)
+    monkeypatch.setattr(main.lifecycle, "ready", False)
+    monkeypatch.setattr(main.lifecycle, "draining", False)
+
+    async with _client(main.app) as client:
+        starting = await client.get("/health/ready")
+        assert starting.status_code == 503
+        assert starting.json()["status"] == "starting"
+
+        async with main.app.router.lifespan_context(main.app):
+            assert calls == ["prime_token", "warm_up"]
+            assert (await client.get("/health/ready")).status_code == 200
+
+        assert calls[-1] == "dispose"
+        draining = await client.get("/health/ready")
+        assert draining.status_code == 503
+        assert draining.json()["status"] == "draining"
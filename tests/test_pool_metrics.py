@@ -0,0 +1,127 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+from opentelemetry.metrics import CallbackOptions
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.core.observability.pool as pool_metrics
+
+
+class _InstrumentStub:
+    def __init__(self):
+        self.calls: list[tuple[float, dict]] = []
+
+    def record(self, value: float, attributes: dict) -> None:
+        self.calls.append((value, attributes))
+
+    add = record
+
+
+@pytest.fixture()
+def instruments(monkeypatch: pytest.MonkeyPatch) -> dict[str, _InstrumentStub]:
+    stubs = {
+        "wait": _InstrumentStub(),
+        "created": _InstrumentStub(),
+        "invalidated": _InstrumentStub(),
+    }
+    monkeypatch.setattr(pool_metrics, "_checkout_wait", stubs["wait"])
+    monkeypatch.setattr(pool_metrics, "_connections_created", stubs["created"])
+    monkeypatch.setattr(pool_metrics, "_connections_invalidated", stubs["invalidated"])
+    monkeypatch.setattr(pool_metrics, "_pools", {})
+    return stubs
+
+
+@pytest_asyncio.fixture()
+async def engine():
+    fd, db_path = tempfile.mkstemp(prefix="todo-pool-", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        poolclass=pool_metrics.InstrumentedAsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=5,
+    )
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+        os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_checkout_wait_is_recorded_when_pool_is_exhausted(
+    engine,
+    instruments: dict[str, _InstrumentStub],
+):
+    pool_metrics.instrument_pool(engine, "primary")
+
+    async with engine.connect() as holder:
+        await holder.execute(text("SELECT 1"))
+
+        async def waiter() -> None:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        task = asyncio.create_task(waiter())
+        await asyncio.sleep(0.1)
+        # Pool holds one connection, so the waiter is still queued.
+        assert not task.done()
+
+    await task
+
+    waits = [value for value, _ in instruments["wait"].calls]
+    assert len(waits) == 2
+    assert max(waits) >= 90
+    assert instruments["wait"].calls[0][1] == {"pool.name": "primary"}
+    assert len(instruments["created"].calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_gauges_report_used_idle_and_overflow(
+    engine,
+    instruments: dict[str, _InstrumentStub],
+):
+    pool_metrics.instrument_pool(engine, "replica")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        usage = {
+            obs.attributes["state"]: obs.value
+            for obs in pool_metrics._observe_usage(CallbackOptions())
+        }
+        assert usage == {"used": 1, "idle": 0}
+
+    usage = {
+        obs.attributes["state"]: obs.value
+        for obs in pool_metrics._observe_usage(CallbackOptions())
+    }
+    assert usage == {"used": 0, "idle": 1}
+    [overflow] = list(pool_metrics._observe_overflow(CallbackOptions()))
+    assert overflow.value == 0
+    assert overflow.attributes == {"pool.name": "replica"}
+
+
+@pytest.mark.asyncio
+async def test_invalidations_are_counted_by_reason(
+    engine,
+    instruments: dict[str, _InstrumentStub],
+):
+    pool_metrics.instrument_pool(engine, "primary")
+
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        raw._connection_record.info[pool_metrics.INVALIDATE_REASON_KEY] = (
+            "entra_token_near_expiry"
+        )
+        await conn.invalidate()
+
+    async with engine.connect() as conn:
+        await conn.invalidate(RuntimeError("boom"))
+
+    reasons = [attrs["reason"] for _, attrs in instruments["invalidated"].calls]
+    assert reasons == ["entra_token_near_expiry", "RuntimeError"]
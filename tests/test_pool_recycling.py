@@ -0,0 +1,154 @@
+import asyncio
+import heapq
+import random
+from collections import Counter
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.core.pool_recycling as pool_recycling
+from app.core.lifecycle import warm_up_pool
+from app.core.observability.pool import InstrumentedAsyncAdaptedQueuePool
+from app.core.pool_recycling import install_jittered_recycle, recycle_deadline
+
+TOKEN_LIFETIME = 3600
+REFRESH_LEAD = 600
+EXPIRY_GUARD = 60
+MAX_AGE = 3300
+JITTER = 300
+
+
+class _FakeCredential:
+    """Per-replica token source on a fake clock, refreshed ahead of expiry."""
+
+    def __init__(self):
+        self.expires_on = None
+        self.fetches = 0
+
+    def expires_on_at(self, now: float) -> float:
+        if self.expires_on is None or now >= self.expires_on - REFRESH_LEAD:
+            self.fetches += 1
+            self.expires_on = now + TOKEN_LIFETIME
+        return self.expires_on
+
+
+def _reconnects_per_minute(jitter_seconds: float, *, replicas=6, pool_size=10):
+    """Simulate four hours of replicas that all warmed up at t=0."""
+    rng = random.Random(42)
+    credentials = [_FakeCredential() for _ in range(replicas)]
+    due: list[tuple[float, int]] = []
+
+    def connect(replica: int, now: float) -> None:
+        expires_on = credentials[replica].expires_on_at(now)
+        deadline = recycle_deadline(
+            now,
+            max_age_seconds=MAX_AGE,
+            jitter_seconds=jitter_seconds,
+            rng=rng,
+            expires_on=expires_on,
+            expiry_guard_seconds=EXPIRY_GUARD,
+        )
+        heapq.heappush(due, (deadline, replica))
+
+    for replica in range(replicas):
+        for _ in range(pool_size):
+            connect(replica, 0.0)
+
+    per_minute: Counter[int] = Counter()
+    while due[0][0] < 4 * 3600:
+        now, replica = heapq.heappop(due)
+        per_minute[int(now // 60)] += 1
+        connect(replica, now)
+    return per_minute, credentials
+
+
+def test_jittered_deadlines_flatten_the_reconnect_spike():
+    lockstep, _ = _reconnects_per_minute(jitter_seconds=0)
+    jittered, credentials = _reconnects_per_minute(jitter_seconds=JITTER)
+
+    # Without jitter every connection of every replica retires in one minute.
+    assert max(lockstep.values()) == 60
+    assert sum(jittered.values()) == pytest.approx(sum(lockstep.values()), rel=0.2)
+    assert max(jittered.values()) <= 60 / 3
+    # Spreading reconnects does not multiply token fetches.
+    assert all(credential.fetches <= 6 for credential in credentials)
+
+
+def test_recycle_deadline_window_is_capped_by_the_time_left():
+    rng = random.Random(1)
+    for _ in range(100):
+        deadline = recycle_deadline(
+            100.0,
+            max_age_seconds=3300,
+            jitter_seconds=300,
+            rng=rng,
+            expires_on=400.0,
+            expiry_guard_seconds=60,
+        )
+        assert 100 + 120 <= deadline <= 340
+
+
+@pytest.mark.asyncio
+async def test_recycler_replaces_due_idle_connections_in_background(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    recycled: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        pool_recycling,
+        "record_recycle",
+        lambda pool_name, trigger: recycled.append((pool_name, trigger)),
+    )
+    now = [1000.0]
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'recycle.db'}",
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=3,
+        max_overflow=0,
+    )
+    connects: list[float] = []
+    event.listen(engine.sync_engine, "connect", lambda *_: connects.append(now[0]))
+    recycler = install_jittered_recycle(
+        engine,
+        "primary",
+        max_age_seconds=600,
+        jitter_seconds=120,
+        clock=lambda: now[0],
+        rng=random.Random(3),
+    )
+    pool = engine.sync_engine.pool
+    try:
+        await warm_up_pool(engine, "primary", 3)
+        held = await engine.connect()
+        assert pool.checkedin() == 2
+
+        now[0] += 1
+        assert await recycler.recycle_idle() == 0
+
+        now[0] += 600
+        assert await recycler.recycle_idle() == 2
+        assert recycled == [("primary", "background")] * 2
+        assert len(connects) == 3 + 2
+        # Only public pool operations: the pool is intact.
+        assert pool.checkedin() == 2
+        assert pool.checkedout() == 1
+        assert pool.overflow() == 0
+        assert await recycler.recycle_idle() == 0
+
+        # The busy connection is left alone until it is checked back in.
+        await held.close()
+        recycler.interval_seconds = 0.01
+        recycler.start()
+        while len(recycled) < 3:
+            await asyncio.sleep(0.01)
+        await recycler.stop()
+        assert recycled[2] == ("primary", "background")
+        assert pool.checkedin() == 3
+
+        # Anything still overdue when a request checks it out is replaced there.
+        now[0] += 1000
+        assert await warm_up_pool(engine, "primary", 3) == 3
+        assert recycled[3:] == [("primary", "checkout")] * 3
+    finally:
+        await recycler.stop()
+        await engine.dispose()
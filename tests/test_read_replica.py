@@ -0,0 +1,125 @@
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.core.database as database
+from app.core.database import CONSISTENCY_TOKEN_HEADER, Base
+from app.modules.todos.cache import todo_read_cache
+
+API_PREFIX = "/api/v1"
+
+
+@pytest_asyncio.fixture()
+async def replica_session_factory(
+    monkeypatch: pytest.MonkeyPatch,
+) -> async_sessionmaker[AsyncSession]:
+    """An empty replica database that never sees primary writes."""
+    fd, db_path = tempfile.mkstemp(prefix="todo-replica-", suffix=".db")
+    os.close(fd)
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+    factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    def _fake_wal_insert_lsn(_connection) -> str:
+        return "0/16B3748"
+
+    monkeypatch.setattr(database, "replica_session_factory", factory)
+    monkeypatch.setattr(database, "wal_insert_lsn", _fake_wal_insert_lsn)
+    try:
+        yield factory
+    finally:
+        await engine.dispose()
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica_and_writes_return_token(
+    client: AsyncClient,
+    replica_session_factory: async_sessionmaker[AsyncSession],
+):
+    created = await client.post(f"{API_PREFIX}/todos/", json={"title": "Primary"})
+    assert created.status_code == 201
+    assert created.headers[CONSISTENCY_TOKEN_HEADER] == "0/16B3748"
+
+    # The replica has not seen the write, so an untokened read that gets
+    # past this process's write-through cache misses it.
+    todo_read_cache.clear()
+    response = await client.get(f"{API_PREFIX}/todos/{created.json()['id']}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary_for_token(
+    client: AsyncClient,
+    replica_session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    waits: list[str] = []
+
+    async def _never_caught_up(_session, lsn: str, timeout_seconds: float) -> bool:
+        waits.append(lsn)
+        return False
+
+    monkeypatch.setattr(database, "wait_for_replica_lsn", _never_caught_up)
+
+    created = await client.post(f"{API_PREFIX}/todos/", json={"title": "Primary"})
+    token = created.headers[CONSISTENCY_TOKEN_HEADER]
+
+    response = await client.get(
+        f"{API_PREFIX}/todos/{created.json()['id']}",
+        headers={CONSISTENCY_TOKEN_HEADER: token},
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Primary"
+    assert waits == [token]
+
+
+@pytest.mark.asyncio
+async def test_invalid_consistency_token_is_rejected(
+    client: AsyncClient,
+    replica_session_factory: async_sessionmaker[AsyncSession],
+):
+    response = await client.get(
+        f"{API_PREFIX}/todos/",
+        headers={CONSISTENCY_TOKEN_HEADER: "not-an-lsn"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_no_replica_reads_primary_without_token(client: AsyncClient):
+    created = await client.post(f"{API_PREFIX}/todos/", json={"title": "Primary"})
+    assert CONSISTENCY_TOKEN_HEADER not in created.headers
+
+    response = await client.get(f"{API_PREFIX}/todos/{created.json()['id']}")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_token_is_minted_inside_the_write_transaction(
+    client: AsyncClient,
+    replica_session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    minted: list[bool] = []
+
+    def _in_transaction_lsn(connection) -> str:
+        minted.append(connection.in_transaction())
+        return "0/16B3750"
+
+    monkeypatch.setattr(database, "wal_insert_lsn", _in_transaction_lsn)
+
+    created = await client.post(f"{API_PREFIX}/todos/", json={"title": "Primary"})
+    deleted = await client.delete(f"{API_PREFIX}/todos/{created.json()['id']}")
+
+    assert created.headers[CONSISTENCY_TOKEN_HEADER] == "0/16B3750"
+    assert deleted.headers[CONSISTENCY_TOKEN_HEADER] == "0/16B3750"
+    # Once per write, before its COMMIT; no query after it.
+    assert minted == [True, True]
@@ -0,0 +1,167 @@
+import asyncio
+
+import fakeredis
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.cache import (
+    CircuitBreaker,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    VersionedCache,
+)
+from app.core.exceptions import NotFoundError
+from app.modules.todos.cache import SharedTodoCache, TodoReadCache
+from app.modules.todos.repository import TodoRepository
+from app.modules.todos.schemas import TodoCreate, TodoUpdate
+from app.modules.todos.service import TodoService
+
+
+def _breaker(clock=None, **kwargs) -> CircuitBreaker:
+    options = {"failure_threshold": 2, "reset_timeout_seconds": 30, **kwargs}
+    if clock is not None:
+        options["clock"] = clock
+    return CircuitBreaker("test", **options)
+
+
+def _versioned(backend, breaker=None, timeout=0.05) -> VersionedCache:
+    return VersionedCache(
+        backend, "todo", op_timeout_seconds=timeout, breaker=breaker or _breaker()
+    )
+
+
+class _SlowBackend(MemoryCacheBackend):
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.calls = 0
+
+    async def get(self, key: str) -> bytes | None:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return await super().get(key)
+
+
+@pytest.mark.asyncio
+async def test_replicas_share_reads_and_see_each_others_writes(
+    async_session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    lookups: list[int] = []
+    original_get = TodoRepository.get
+
+    async def counting_get(self, todo_id: int):
+        lookups.append(todo_id)
+        return await original_get(self, todo_id)
+
+    monkeypatch.setattr(TodoRepository, "get", counting_get)
+    shared = SharedTodoCache(
+        _versioned(RedisCacheBackend(fakeredis.aioredis.FakeRedis())),
+        ttl_seconds=300,
+        negative_ttl_seconds=5,
+    )
+
+    def replica(session: AsyncSession, local: TodoReadCache) -> TodoService:
+        return TodoService(session, cache=local, shared_cache=shared)
+
+    local_a = TodoReadCache(max_entries=100, ttl_seconds=30, negative_ttl_seconds=5)
+    local_b = TodoReadCache(max_entries=100, ttl_seconds=30, negative_ttl_seconds=5)
+    async with (
+        async_session_factory() as session_a,
+        async_session_factory() as session_b,
+    ):
+        a, b = replica(session_a, local_a), replica(session_b, local_b)
+        todo = await a.create_todo(TodoCreate(title="Shared"))
+
+        # The write published the row, so neither replica reads the database.
+        assert (await b.get_todo(todo.id)).title == "Shared"
+        assert (await a.get_todo(todo.id)).title == "Shared"
+        assert lookups == []
+
+        await a.update_todo(todo.id, TodoUpdate(title="Renamed"))
+        assert (await b.get_todo(todo.id)).title == "Renamed"
+
+        await b.delete_todo(todo.id)
+        with pytest.raises(NotFoundError):
+            await a.get_todo(todo.id)
+
+        # Misses are shared too: one replica's lookup serves the other.
+        for service in (a, b, a):
+            with pytest.raises(NotFoundError):
+                await service.get_todo(424242)
+        assert lookups == [424242]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = _versioned(MemoryCacheBackend())
+    loads = 0
+
+    async def load() -> tuple[bytes, float]:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.02)
+        return b"payload", 60
+
+    version = await cache.version("1")
+    results = await asyncio.gather(
+        *(cache.get_or_load("1", version, load) for _ in range(20))
+    )
+
+    assert results == [b"payload"] * 20
+    assert loads == 1
+    assert await cache.get_or_load("1", version, load) == b"payload"
+    assert loads == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_the_load_to_one_follower():
+    cache = _versioned(MemoryCacheBackend())
+    loads = 0
+
+    async def load() -> tuple[bytes, float]:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.05)
+        return b"payload", 60
+
+    leader = asyncio.create_task(cache.get_or_load("1", "0", load))
+    await asyncio.sleep(0)
+    followers = [
+        asyncio.create_task(cache.get_or_load("1", "0", load)) for _ in range(3)
+    ]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    results = await asyncio.gather(*followers, return_exceptions=True)
+
+    assert results == [b"payload"] * 3
+    # The cancelled leader's load plus exactly one follower's.
+    assert loads == 2
+    assert cache._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_slow_cache_opens_the_breaker_and_reads_fall_through():
+    now = [0.0]
+    backend = _SlowBackend(delay=0.2)
+    breaker = _breaker(clock=lambda: now[0])
+    cache = _versioned(backend, breaker, timeout=0.01)
+
+    async def load() -> tuple[bytes, float]:
+        return b"from-db", 60
+
+    for _ in range(2):
+        assert await cache.version("1") is None
+    assert breaker.state == "open"
+
+    # Open: the backend is not touched at all and the loader still answers.
+    assert await cache.version("1") is None
+    assert await cache.get_or_load("1", "0", load) == b"from-db"
+    assert backend.calls == 2
+
+    # After the reset period one trial goes through; success closes it.
+    backend.delay = 0
+    now[0] = 31
+    assert await cache.version("1") == "0"
+    assert breaker.state == "closed"
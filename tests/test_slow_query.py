@@ -0,0 +1,107 @@
+import logging
+import os
+import tempfile
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.observability.slow_query import (
+    install_slow_query_log,
+    normalize_sql,
+    parameter_shape,
+    seq_scan_relations,
+)
+
+
+@pytest_asyncio.fixture()
+async def engine():
+    fd, db_path = tempfile.mkstemp(prefix="todo-slow-", suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+        os.remove(db_path)
+
+
+def test_normalize_sql_replaces_literals_and_collapses_lists():
+    statement = """
+        SELECT todos.id FROM todos
+        WHERE todos.is_completed = false AND todos.title = 'it''s'
+          AND todos.id IN ($1, $2, $3)
+        LIMIT 50
+    """
+
+    assert normalize_sql(statement) == (
+        "SELECT todos.id FROM todos WHERE todos.is_completed = ? "
+        "AND todos.title = ? AND todos.id IN (?, ...) LIMIT ?"
+    )
+
+
+def test_parameter_shape_reports_types_not_values():
+    assert parameter_shape((1, "secret", datetime(2026, 1, 1))) == [
+        "int",
+        "str",
+        "datetime",
+    ]
+    assert parameter_shape({"title": "secret"}) == {"title": "str"}
+    assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == {
+        "rows": 2,
+        "row": ["int", "str"],
+    }
+
+
+def test_seq_scan_relations_walks_nested_plans():
+    plan = [
+        {
+            "Plan": {
+                "Node Type": "Limit",
+                "Plans": [
+                    {
+                        "Node Type": "Sort",
+                        "Plans": [{"Node Type": "Seq Scan", "Relation Name": "todos"}],
+                    },
+                    {"Node Type": "Index Scan", "Relation Name": "todos_archive"},
+                ],
+            }
+        }
+    ]
+
+    assert seq_scan_relations(plan) == ["todos"]
+
+
+@pytest.mark.asyncio
+async def test_statements_over_threshold_are_logged(
+    engine,
+    caplog: pytest.LogCaptureFixture,
+):
+    install_slow_query_log(engine, "primary", threshold_ms=0.001)
+
+    with caplog.at_level(logging.WARNING, logger="todo_api.db.slow_query"):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT :value + 41"), {"value": 1})
+
+    [record] = [r for r in caplog.records if r.getMessage() == "Slow query"]
+    assert record.sql == "SELECT ? + ?"
+    assert record.param_shape == ["int"]
+    assert record.duration_ms >= 0
+    assert getattr(record, "db.pool") == "primary"
+
+
+@pytest.mark.asyncio
+async def test_fast_statements_and_disabled_threshold_are_not_logged(
+    engine,
+    caplog: pytest.LogCaptureFixture,
+):
+    install_slow_query_log(engine, "primary", threshold_ms=10_000)
+    install_slow_query_log(engine, "primary", threshold_ms=0)
+
+    with caplog.at_level(logging.WARNING, logger="todo_api.db.slow_query"):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    assert not [r for r in caplog.records if r.getMessage() == "Slow query"]
@@ -0,0 +1,173 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.modules.todos.repository import TodoRepository
+
+API_PREFIX = "/api/v1"
+
+
+async def _create(client: AsyncClient, titles: list[str]) -> list[dict]:
+    response = await client.post(
+        f"{API_PREFIX}/todos:batch",
+        json={"items": [{"title": title} for title in titles]},
+    )
+    return response.json()["items"]
+
+
+async def _archive_completed(
+    session_factory: async_sessionmaker[AsyncSession], batch_size: int = 1000
+) -> int:
+    # SQLite timestamps have second precision; a cutoff in the future makes
+    # rows completed within this second eligible.
+    before = datetime.now(UTC) + timedelta(minutes=1)
+    async with session_factory() as session:
+        return await TodoRepository(session).archive_completed(before, batch_size)
+
+
+@pytest.mark.asyncio
+async def test_archived_todo_is_served_by_get_and_refuses_updates(
+    client: AsyncClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+):
+    """Test archival moves completed todos and GET falls back to the archive."""
+    done, still_open = await _create(client, ["done", "open"])
+    await client.put(f"{API_PREFIX}/todos/{done['id']}", json={"is_completed": True})
+
+    assert await _archive_completed(async_session_factory) == 1
+
+    fetched = await client.get(f"{API_PREFIX}/todos/{done['id']}")
+    assert fetched.status_code == 200
+    assert fetched.json()["title"] == "done"
+    assert fetched.json()["is_completed"] is True
+
+    listed = (await client.get(f"{API_PREFIX}/todos/")).json()
+    assert [item["id"] for item in listed["items"]] == [still_open["id"]]
+    assert listed["total"] == 1
+
+    update = await client.put(
+        f"{API_PREFIX}/todos/{done['id']}", json={"title": "renamed"}
+    )
+    assert update.status_code == 409
+    assert update.json()["error"]["code"] == "conflict"
+
+    stats = (await client.get(f"{API_PREFIX}/todos/stats")).json()
+    assert (stats["total"], stats["completed"]) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_archived_todos_can_be_deleted(
+    client: AsyncClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+):
+    """Test single and batch deletes remove archived todos and their stats."""
+    first, second, live = await _create(client, ["first", "second", "live"])
+    await client.patch(
+        f"{API_PREFIX}/todos:batch",
+        json={
+            "items": [
+                {"id": todo["id"], "changes": {"is_completed": True}}
+                for todo in (first, second)
+            ]
+        },
+    )
+    assert await _archive_completed(async_session_factory) == 2
+
+    deleted = await client.delete(f"{API_PREFIX}/todos/{first['id']}")
+    assert deleted.status_code == 204
+    assert (await client.get(f"{API_PREFIX}/todos/{first['id']}")).status_code == 404
+    again = await client.delete(f"{API_PREFIX}/todos/{first['id']}")
+    assert again.status_code == 404
+
+    batch = await client.delete(
+        f"{API_PREFIX}/todos:batch",
+        params={"ids": [second["id"], live["id"], first["id"]]},
+    )
+    assert batch.json() == {
+        "deleted": [second["id"], live["id"]],
+        "not_found": [first["id"]],
+    }
+
+    stats = (await client.get(f"{API_PREFIX}/todos/stats")).json()
+    assert (stats["total"], stats["completed"]) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_list_include_archived_merges_pages_in_order(
+    client: AsyncClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+):
+    """Test include_archived walks keyset pages across both tables."""
+    todos = await _create(client, ["a", "b", "c", "d", "e"])
+    ids = [todo["id"] for todo in todos if todo["title"] in {"b", "c", "e"}]
+    await client.patch(
+        f"{API_PREFIX}/todos:batch",
+        json={
+            "items": [
+                {"id": todo_id, "changes": {"is_completed": True}} for todo_id in ids
+            ]
+        },
+    )
+
+    assert await _archive_completed(async_session_factory, batch_size=2) == 3
+
+    titles: list[str] = []
+    params: dict[str, object] = {
+        "sort": "title",
+        "limit": 2,
+        "include_archived": True,
+    }
+    first = (await client.get(f"{API_PREFIX}/todos/", params=params)).json()
+    assert first["total"] == 5
+    data = first
+    while True:
+        titles.extend(item["title"] for item in data["items"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+        data = (await client.get(f"{API_PREFIX}/todos/", params=params)).json()
+    assert titles == ["a", "b", "c", "d", "e"]
+
+    open_only = (
+        await client.get(
+            f"{API_PREFIX}/todos/",
+            params={"include_archived": True, "is_completed": False},
+        )
+    ).json()
+    assert sorted(item["title"] for item in open_only["items"]) == ["a", "d"]
+    assert open_only["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_filter_mode_batch_delete_reaches_the_archive(
+    client: AsyncClient,
+    async_session_factory: async_sessionmaker[AsyncSession],
+):
+    """Test a filter-mode batch delete removes matching archived todos too."""
+    archived, live_done, still_open = await _create(client, ["old", "new", "open"])
+    await client.put(
+        f"{API_PREFIX}/todos/{archived['id']}", json={"is_completed": True}
+    )
+    assert await _archive_completed(async_session_factory) == 1
+    await client.put(
+        f"{API_PREFIX}/todos/{live_done['id']}", json={"is_completed": True}
+    )
+
+    response = await client.delete(
+        f"{API_PREFIX}/todos:batch", params={"is_completed": True}
+    )
+    assert response.status_code == 200
+    assert sorted(response.json()["deleted"]) == sorted(
+        [archived["id"], live_done["id"]]
+    )
+
+    gone = await client.get(f"{API_PREFIX}/todos/{archived['id']}")
+    assert gone.status_code == 404
+    listed = (
+        await client.get(f"{API_PREFIX}/todos/", params={"include_archived": True})
+    ).json()
+    assert [item["id"] for item in listed["items"]] == [still_open["id"]]
+    stats = (await client.get(f"{API_PREFIX}/todos/stats")).json()
+    assert (stats["total"], stats["completed"]) == (1, 0)
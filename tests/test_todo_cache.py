@@ -0,0 +1,136 @@
+from datetime import UTC, datetime
+
+import pytest
+from httpx import AsyncClient
+
+import app.modules.todos.cache as todo_cache
+from app.core.config import get_settings
+from app.modules.todos.cache import TodoReadCache
+from app.modules.todos.repository import TodoRepository
+from app.modules.todos.schemas import TodoRead
+
+BASE_URL = get_settings().api_prefix + "/todos"
+BATCH_URL = BASE_URL + ":batch"
+
+
+class _CounterStub:
+    def __init__(self):
+        self.calls: list[dict] = []
+
+    def add(self, _value: int, attributes: dict) -> None:
+        self.calls.append(attributes)
+
+
+def _todo(todo_id: int) -> TodoRead:
+    now = datetime.now(UTC)
+    return TodoRead(
+        id=todo_id,
+        title=f"todo {todo_id}",
+        description=None,
+        is_completed=False,
+        created_at=now,
+        updated_at=now,
+        version=1,
+    )
+
+
+def test_cache_is_lru_bounded_with_separate_negative_ttl(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    lookups, evictions = _CounterStub(), _CounterStub()
+    monkeypatch.setattr(todo_cache, "_lookups", lookups)
+    monkeypatch.setattr(todo_cache, "_evictions", evictions)
+    now = [0.0]
+    cache = TodoReadCache(
+        max_entries=2, ttl_seconds=30, negative_ttl_seconds=5, clock=lambda: now[0]
+    )
+
+    cache.put(1, _todo(1), cache.generation)
+    cache.put(2, None, cache.generation)
+    assert cache.get(1)[1].id == 1
+    cache.put(3, _todo(3), cache.generation)
+    # 2 was least recently used.
+    assert len(cache) == 2
+    assert cache.get(2) == (False, None)
+
+    cache.put(4, None, cache.generation)
+    assert cache.get(4) == (True, None)
+    now[0] = 10
+    assert cache.get(4) == (False, None)
+    assert cache.get(3)[0] is True
+
+    assert [call["result"] for call in lookups.calls] == [
+        "hit",
+        "miss",
+        "negative_hit",
+        "miss",
+        "hit",
+    ]
+    assert [call["reason"] for call in evictions.calls] == [
+        "capacity",
+        "capacity",
+        "expired",
+    ]
+
+
+def test_fill_is_dropped_when_a_write_raced_the_read():
+    cache = TodoReadCache(max_entries=10, ttl_seconds=30, negative_ttl_seconds=5)
+    generation = cache.generation
+
+    cache.write(1, _todo(1))
+    cache.put(1, None, generation)
+
+    assert cache.get(1)[1].id == 1
+
+
+@pytest.mark.asyncio
+async def test_get_todo_is_served_from_cache_and_kept_fresh_by_writes(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    lookups: list[int] = []
+    original_get = TodoRepository.get
+
+    async def counting_get(self, todo_id: int):
+        lookups.append(todo_id)
+        return await original_get(self, todo_id)
+
+    monkeypatch.setattr(TodoRepository, "get", counting_get)
+
+    created = await client.post(f"{BASE_URL}/", json={"title": "Hot"})
+    todo_id = created.json()["id"]
+
+    for _ in range(3):
+        response = await client.get(f"{BASE_URL}/{todo_id}")
+        assert response.status_code == 200
+        assert response.json()["title"] == "Hot"
+    assert lookups == []
+
+    await client.put(f"{BASE_URL}/{todo_id}", json={"title": "Updated"})
+    assert (await client.get(f"{BASE_URL}/{todo_id}")).json()["title"] == "Updated"
+
+    await client.delete(f"{BASE_URL}/{todo_id}")
+    assert (await client.get(f"{BASE_URL}/{todo_id}")).status_code == 404
+    assert lookups == []
+
+    # Missing ids hit the database once, then the tombstone answers.
+    for _ in range(3):
+        assert (await client.get(f"{BASE_URL}/999")).status_code == 404
+    assert lookups == [999]
+
+
+@pytest.mark.asyncio
+async def test_batch_writes_update_cached_todos(client: AsyncClient):
+    created = await client.post(
+        BATCH_URL, json={"items": [{"title": "A"}, {"title": "B"}]}
+    )
+    first, second = (item["id"] for item in created.json()["items"])
+    assert (await client.get(f"{BASE_URL}/{first}")).status_code == 200
+
+    await client.patch(
+        BATCH_URL,
+        json={"items": [{"id": first, "changes": {"is_completed": True}}]},
+    )
+    assert (await client.get(f"{BASE_URL}/{first}")).json()["is_completed"] is True
+
+    await client.delete(BATCH_URL, params={"ids": [second]})
+    assert (await client.get(f"{BASE_URL}/{second}")).status_code == 404
@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+import app.modules.todos.partitions as partitions
+from app.modules.todos.model import Todo
+from app.modules.todos.repository import TodoRepository
+
+
+def _repository(dialect_name: str) -> TodoRepository:
+    bind = SimpleNamespace(dialect=SimpleNamespace(name=dialect_name))
+    session = SimpleNamespace(get_bind=lambda: bind)
+    return TodoRepository(session, write_mode="returning")
+
+
+def test_postgres_id_lookup_names_partition_key_through_locator():
+    stmt = select(Todo).where(*_repository("postgresql")._id_clauses(42))
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "todos.created_at = (SELECT todo_locator.created_at" in sql
+    assert "WHERE todo_locator.id = %(id_2)s" in sql
+
+
+def test_sqlite_id_lookup_is_plain_primary_key():
+    stmt = select(Todo).where(*_repository("sqlite")._id_clauses(42))
+
+    sql = str(stmt.compile(dialect=sqlite.dialect()))
+
+    assert "todo_locator" not in sql
+    assert "WHERE todos.id = ?" in sql
+
+
+@pytest.mark.asyncio
+async def test_partition_maintenance_runs_at_once_and_survives_failures(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    engine = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+    runs: list[int] = []
+    sleeps: list[float] = []
+
+    async def flaky_ensure(_engine, months_ahead: int) -> int:
+        runs.append(months_ahead)
+        if len(runs) == 1:
+            raise RuntimeError("database unavailable")
+        if len(runs) == 3:
+            raise asyncio.CancelledError
+        return 1
+
+    async def record_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(partitions, "ensure_partitions", flaky_ensure)
+    monkeypatch.setattr(partitions.asyncio, "sleep", record_sleep)
+
+    with pytest.raises(asyncio.CancelledError):
+        await partitions.maintain_partitions_periodically(engine)
+
+    assert runs == [3, 3, 3]
+    assert sleeps == [3600, 3600]
+
+
+@pytest.mark.asyncio
+async def test_partition_maintenance_is_a_no_op_on_sqlite():
+    engine = SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+
+    await partitions.maintain_partitions_periodically(engine)
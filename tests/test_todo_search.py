@@ -0,0 +1,31 @@
+import importlib.util
+from pathlib import Path
+
+from app.modules.todos.repository import SEARCH_DOCUMENT
+
+VERSIONS_DIR = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+
+
+def _load_migration(filename: str):
+    spec = importlib.util.spec_from_file_location(
+        filename.removesuffix(".py"), VERSIONS_DIR / filename
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_search_query_repeats_the_indexed_expression():
+    # PostgreSQL only uses an expression index for a verbatim match.
+    query_expression = SEARCH_DOCUMENT.replace("todos.", "")
+
+    search_migration = _load_migration("20261017_add_todos_search_vector.py")
+    partition_migration = _load_migration("20261017_partition_todos_by_created_at.py")
+    [partitioned_expression] = next(
+        columns
+        for name, columns, _ in partition_migration.INDEXES
+        if name == "ix_todos_search_vector"
+    )
+
+    assert search_migration.SEARCH_DOCUMENT == query_expression
+    assert partitioned_expression.text == query_expression
@@ -1,5 +1,14 @@
+import csv
+import io
+import json
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+
+import app.api.v1.routers.todos as todos_router
+from app.core.config import get_settings
+from app.modules.todos.repository import TodoRepository
 
 API_PREFIX = "/api/v1"
 
@@ -278,3 +287,569 @@ async def test_concurrent_creates(client: AsyncClient):
     # All should have unique IDs
     ids = {r.json()["id"] for r in responses}
     assert len(ids) == 5
+
+
+@pytest.mark.asyncio
+async def test_list_todos_cursor_pagination(client: AsyncClient):
+    """Test keyset pagination walks every todo exactly once, newest first."""
+    for i in range(5):
+        await client.post(f"{API_PREFIX}/todos/", json={"title": f"Todo {i}"})
+
+    seen: list[int] = []
+    response = await client.get(f"{API_PREFIX}/todos/?limit=2")
+    data = response.json()
+    seen.extend(item["id"] for item in data["items"])
+    while data["next_cursor"]:
+        response = await client.get(
+            f"{API_PREFIX}/todos/?limit=2&cursor={data['next_cursor']}"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 5
+    assert data["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_list_todos_invalid_cursor(client: AsyncClient):
+    """Test a malformed cursor is rejected as a bad request."""
+    response = await client.get(f"{API_PREFIX}/todos/?limit=2&cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "bad_request"
+
+
+@pytest.mark.asyncio
+async def test_list_todos_cursor_with_offset_rejected(client: AsyncClient):
+    """Test cursor and offset pagination cannot be mixed."""
+    for i in range(3):
+        await client.post(f"{API_PREFIX}/todos/", json={"title": f"Todo {i}"})
+    first = (await client.get(f"{API_PREFIX}/todos/?limit=1")).json()
+
+    response = await client.get(
+        f"{API_PREFIX}/todos/?limit=1&offset=1&cursor={first['next_cursor']}"
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("mode", "expected_total"),
+    [("exact", 3), ("estimated", 3), ("none", None)],
+)
+async def test_list_todos_total_modes(
+    client: AsyncClient, mode: str, expected_total: int | None
+):
+    """Test each include_total mode reports its total and the mode used."""
+    for i in range(3):
+        await client.post(f"{API_PREFIX}/todos/", json={"title": f"Todo {i}"})
+
+    response = await client.get(f"{API_PREFIX}/todos/?limit=2&include_total={mode}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == expected_total
+    assert data["total_mode"] == mode
+    assert len(data["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_todos_exact_total_past_last_page(client: AsyncClient):
+    """Test exact totals stay correct when the offset skips every row."""
+    for i in range(2):
+        await client.post(f"{API_PREFIX}/todos/", json={"title": f"Todo {i}"})
+
+    response = await client.get(f"{API_PREFIX}/todos/?limit=2&offset=10")
+    data = response.json()
+    assert data["items"] == []
+    assert data["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_todo_stats(client: AsyncClient):
+    """Test stats report open/completed totals and today's activity bucket."""
+    ids = []
+    for i in range(3):
+        created = await client.post(f"{API_PREFIX}/todos/", json={"title": f"T{i}"})
+        ids.append(created.json()["id"])
+    await client.put(
+        f"{API_PREFIX}/todos/{ids[0]}",
+        json={"title": "T0", "is_completed": True},
+    )
+
+    response = await client.get(f"{API_PREFIX}/todos/stats?days=7")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["completed"] == 1
+    assert data["open"] == 2
+    assert data["daily"][0]["created"] == 3
+    assert data["daily"][0]["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_todo_stats_empty(client: AsyncClient):
+    """Test stats on an empty table return zeros and no buckets."""
+    response = await client.get(f"{API_PREFIX}/todos/stats")
+    assert response.status_code == 200
+    assert response.json() == {"total": 0, "completed": 0, "open": 0, "daily": []}
+
+
+@pytest.mark.asyncio
+async def test_batch_create_todos(client: AsyncClient):
+    """Test batch create returns rows in order and reports invalid items."""
+    response = await client.post(
+        f"{API_PREFIX}/todos:batch",
+        json={
+            "items": [
+                {"title": "  First  "},
+                {"title": "   "},
+                {"title": "Second", "description": "desc"},
+                "not-an-object",
+            ]
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["title"] for item in data["items"]] == ["First", "Second"]
+    assert [error["index"] for error in data["errors"]] == [1, 3]
+
+    listing = (await client.get(f"{API_PREFIX}/todos/?limit=10")).json()
+    assert listing["total"] == 2
+
+
+def test_batch_create_orders_postgres_rows_by_ordinal():
+    """Test the PostgreSQL batch insert orders by input ordinal, not by id."""
+    stmt = TodoRepository._create_many_postgres(
+        [
+            {"title": "First", "description": None},
+            {"title": "Second", "description": "desc"},
+        ]
+    )
+    sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+
+    assert "WITH ORDINALITY AS source(title, description, ordinal)" in sql
+    assert "nextval('todos_id_seq') AS id" in sql
+    assert sql.rstrip().endswith("ORDER BY numbered.ordinal")
+
+
+@pytest.mark.asyncio
+async def test_batch_create_todos_rejects_empty_batch(client: AsyncClient):
+    """Test an empty batch fails request validation."""
+    response = await client.post(f"{API_PREFIX}/todos:batch", json={"items": []})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_update_todos_by_id(client: AsyncClient):
+    """Test per-id batch updates group changes and report missing ids."""
+    created = (
+        await client.post(
+            f"{API_PREFIX}/todos:batch",
+            json={"items": [{"title": f"Todo {i}"} for i in range(3)]},
+        )
+    ).json()["items"]
+    ids = [item["id"] for item in created]
+
+    response = await client.patch(
+        f"{API_PREFIX}/todos:batch",
+        json={
+            "items": [
+                {"id": ids[0], "changes": {"is_completed": True}},
+                {"id": 99999, "changes": {"is_completed": True}},
+                {"id": ids[2], "changes": {"is_completed": True}},
+                {"id": ids[1], "changes": {"title": "  Renamed "}},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [ids[0], ids[2], ids[1]]
+    assert [item["is_completed"] for item in data["items"]] == [True, True, False]
+    assert data["items"][2]["title"] == "Renamed"
+    assert data["not_found"] == [99999]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_todos_by_filter(client: AsyncClient):
+    """Test filter-mode batch updates apply one change set to matching rows."""
+    first = (await client.post(f"{API_PREFIX}/todos/", json={"title": "A"})).json()
+    await client.post(f"{API_PREFIX}/todos/", json={"title": "B"})
+    await client.put(
+        f"{API_PREFIX}/todos/{first['id']}",
+        json={"is_completed": True},
+    )
+
+    response = await client.patch(
+        f"{API_PREFIX}/todos:batch",
+        json={"filter": {"is_completed": False}, "changes": {"is_completed": True}},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["title"] for item in data["items"]] == ["B"]
+    assert data["not_found"] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_update_todos_by_filter_is_capped(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    """Test a filter matching more rows than the batch cap changes nothing."""
+    monkeypatch.setattr(todos_router, "TODO_BATCH_MAX_ITEMS", 2)
+    for title in ("A", "B", "C"):
+        await client.post(f"{API_PREFIX}/todos/", json={"title": title})
+
+    response = await client.patch(
+        f"{API_PREFIX}/todos:batch",
+        json={"filter": {"is_completed": False}, "changes": {"is_completed": True}},
+    )
+    assert response.status_code == 400
+    listed = (await client.get(f"{API_PREFIX}/todos/")).json()["items"]
+    assert not any(item["is_completed"] for item in listed)
+
+    monkeypatch.setattr(todos_router, "TODO_BATCH_MAX_ITEMS", 3)
+    response = await client.patch(
+        f"{API_PREFIX}/todos:batch",
+        json={"filter": {"is_completed": False}, "changes": {"is_completed": True}},
+    )
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"filter": {}, "changes": {"is_completed": True}},
+        {"items": [{"id": 1, "changes": {}}]},
+        {"items": [{"id": 1, "changes": {"title": "x"}}], "changes": {"title": "y"}},
+    ],
+)
+async def test_batch_update_todos_invalid_request(client: AsyncClient, body: dict):
+    """Test ambiguous or empty batch update requests fail validation."""
+    response = await client.patch(f"{API_PREFIX}/todos:batch", json=body)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_update_todos_duplicate_ids(client: AsyncClient):
+    """Test the same id cannot appear twice in one batch update."""
+    response = await client.patch(
+        f"{API_PREFIX}/todos:batch",
+        json={
+            "items": [
+                {"id": 1, "changes": {"title": "x"}},
+                {"id": 1, "changes": {"title": "y"}},
+            ]
+        },
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_todos_by_id(client: AsyncClient):
+    """Test id-mode batch delete reports deleted and missing ids."""
+    created = (
+        await client.post(
+            f"{API_PREFIX}/todos:batch",
+            json={"items": [{"title": f"Todo {i}"} for i in range(3)]},
+        )
+    ).json()["items"]
+    ids = [item["id"] for item in created]
+
+    response = await client.delete(
+        f"{API_PREFIX}/todos:batch",
+        params={"ids": [ids[0], 99999, ids[2]]},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"deleted": [ids[0], ids[2]], "not_found": [99999]}
+
+    remaining = (await client.get(f"{API_PREFIX}/todos/")).json()
+    assert [item["id"] for item in remaining["items"]] == [ids[1]]
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_todos_by_filter(client: AsyncClient):
+    """Test filter-mode batch delete removes only matching todos."""
+    done = (await client.post(f"{API_PREFIX}/todos/", json={"title": "Done"})).json()
+    await client.post(f"{API_PREFIX}/todos/", json={"title": "Open"})
+    await client.put(f"{API_PREFIX}/todos/{done['id']}", json={"is_completed": True})
+
+    response = await client.delete(
+        f"{API_PREFIX}/todos:batch", params={"is_completed": "true"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"deleted": [done["id"]], "not_found": []}
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_todos_requires_ids_or_filter(client: AsyncClient):
+    """Test batch delete refuses to run without any selector."""
+    response = await client.delete(f"{API_PREFIX}/todos:batch")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("write_mode", ["returning", "orm"])
+async def test_single_writes_in_each_write_mode(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    write_mode: str,
+):
+    """Test both write paths share create/update/delete and 404 semantics."""
+    monkeypatch.setattr(get_settings(), "todo_write_mode", write_mode)
+
+    created = await client.post(f"{API_PREFIX}/todos/", json={"title": "Mode"})
+    assert created.status_code == 201
+    todo = created.json()
+    assert todo["id"] and todo["created_at"] and todo["is_completed"] is False
+
+    updated = await client.put(
+        f"{API_PREFIX}/todos/{todo['id']}", json={"is_completed": True}
+    )
+    assert updated.status_code == 200
+    assert updated.json()["is_completed"] is True
+    assert updated.json()["title"] == "Mode"
+
+    unchanged = await client.put(f"{API_PREFIX}/todos/{todo['id']}", json={})
+    assert unchanged.status_code == 200
+    assert unchanged.json()["is_completed"] is True
+
+    missing = await client.put(f"{API_PREFIX}/todos/99999", json={"title": "x"})
+    assert missing.status_code == 404
+
+    deleted = await client.delete(f"{API_PREFIX}/todos/{todo['id']}")
+    assert deleted.status_code == 204
+    assert (await client.delete(f"{API_PREFIX}/todos/{todo['id']}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_todos_ndjson_streams_all_rows(client: AsyncClient):
+    """Test NDJSON export returns every todo beyond the list page cap."""
+    await client.post(
+        f"{API_PREFIX}/todos:batch",
+        json={"items": [{"title": f"Todo {i}"} for i in range(150)]},
+    )
+
+    response = await client.get(f"{API_PREFIX}/todos/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 150
+    assert [row["title"] for row in rows[:2]] == ["Todo 0", "Todo 1"]
+
+
+@pytest.mark.asyncio
+async def test_export_todos_csv_with_filter(client: AsyncClient):
+    """Test CSV export writes a header and honours filters."""
+    done = (await client.post(f"{API_PREFIX}/todos/", json={"title": "Done"})).json()
+    await client.post(f"{API_PREFIX}/todos/", json={"title": "Open"})
+    await client.put(f"{API_PREFIX}/todos/{done['id']}", json={"is_completed": True})
+
+    response = await client.get(
+        f"{API_PREFIX}/todos/export",
+        params={"format": "csv", "is_completed": "true"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Done"]
+
+
+@pytest.mark.asyncio
+async def test_import_todos_ndjson_reports_rejected_rows(client: AsyncClient):
+    """Test NDJSON import loads valid rows and itemizes rejected ones."""
+    body = "\n".join(
+        [
+            json.dumps({"title": "  First  ", "description": " a "}),
+            json.dumps({"title": "   "}),
+            "not json",
+            json.dumps({"title": "Second"}),
+        ]
+    )
+    response = await client.post(
+        f"{API_PREFIX}/todos/import",
+        content=body.encode("utf-8"),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 2
+    assert data["rejected"] == 2
+    assert [error["index"] for error in data["errors"]] == [2, 3]
+
+    listed = (await client.get(f"{API_PREFIX}/todos/")).json()
+    assert sorted(item["title"] for item in listed["items"]) == ["First", "Second"]
+    assert {item["description"] for item in listed["items"]} == {"a", None}
+
+
+@pytest.mark.asyncio
+async def test_import_todos_csv_round_trips_export(client: AsyncClient):
+    """Test a CSV export (with quoted multi-line fields) imports back cleanly."""
+    await client.post(
+        f"{API_PREFIX}/todos/",
+        json={"title": 'Quoted "title"', "description": "line one\nline two"},
+    )
+    exported = (
+        await client.get(f"{API_PREFIX}/todos/export", params={"format": "csv"})
+    ).text
+
+    async def chunks():
+        for start in range(0, len(exported), 7):
+            yield exported[start : start + 7].encode("utf-8")
+
+    response = await client.post(
+        f"{API_PREFIX}/todos/import",
+        params={"format": "csv"},
+        content=chunks(),
+    )
+    assert response.status_code == 200
+    assert response.json() == {"imported": 1, "rejected": 0, "errors": []}
+
+    listed = (await client.get(f"{API_PREFIX}/todos/")).json()["items"]
+    assert [item["description"] for item in listed] == ["line one\nline two"] * 2
+
+
+@pytest.mark.asyncio
+async def test_import_todos_rejects_oversized_records(client: AsyncClient):
+    """Test an unterminated quoted CSV field or NDJSON line fails with 400."""
+    filler = "x" * 1024
+    for import_format, head in (
+        ("csv", 'title,description\nOpen,"never closed'),
+        ("ndjson", json.dumps({"title": "Kept"}) + '\n{"title": "'),
+    ):
+
+        async def chunks(head: str = head):
+            yield head.encode("utf-8")
+            for _ in range(100):
+                yield filler.encode("utf-8")
+
+        response = await client.post(
+            f"{API_PREFIX}/todos/import",
+            params={"format": import_format},
+            content=chunks(),
+        )
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "bad_request"
+
+
+@pytest.mark.asyncio
+async def test_search_todos_pages_matches(client: AsyncClient):
+    """Test search matches title or description and pages with a cursor."""
+    await client.post(
+        f"{API_PREFIX}/todos:batch",
+        json={
+            "items": [
+                {"title": "Buy milk"},
+                {"title": "Call bank", "description": "about MILK budget"},
+                {"title": "Walk dog"},
+                {"title": "Milkshake recipe"},
+            ]
+        },
+    )
+
+    first = await client.get(
+        f"{API_PREFIX}/todos/search", params={"q": "milk", "limit": 2}
+    )
+    assert first.status_code == 200
+    page = first.json()
+    assert [item["title"] for item in page["items"]] == [
+        "Milkshake recipe",
+        "Call bank",
+    ]
+    assert page["next_cursor"]
+
+    second = (
+        await client.get(
+            f"{API_PREFIX}/todos/search",
+            params={"q": "milk", "limit": 2, "cursor": page["next_cursor"]},
+        )
+    ).json()
+    assert [item["title"] for item in second["items"]] == ["Buy milk"]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_todos_treats_wildcards_literally(client: AsyncClient):
+    """Test LIKE wildcards in the query do not match everything."""
+    await client.post(f"{API_PREFIX}/todos/", json={"title": "Plain"})
+    await client.post(f"{API_PREFIX}/todos/", json={"title": "Up 100%"})
+
+    response = await client.get(f"{API_PREFIX}/todos/search", params={"q": "%"})
+    assert [item["title"] for item in response.json()["items"]] == ["Up 100%"]
+
+
+@pytest.mark.asyncio
+async def test_list_todos_filters_apply_to_items_and_total(client: AsyncClient):
+    """Test list filters narrow both the page and the exact total."""
+    created = (
+        await client.post(
+            f"{API_PREFIX}/todos:batch",
+            json={"items": [{"title": f"Todo {i}"} for i in range(5)]},
+        )
+    ).json()["items"]
+    for item in created[:2]:
+        await client.put(
+            f"{API_PREFIX}/todos/{item['id']}", json={"is_completed": True}
+        )
+
+    response = await client.get(
+        f"{API_PREFIX}/todos/", params={"is_completed": "false", "limit": 2}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert all(item["is_completed"] is False for item in data["items"])
+
+    future = await client.get(
+        f"{API_PREFIX}/todos/",
+        params={"updated_after": "2999-01-01T00:00:00Z", "include_total": "none"},
+    )
+    assert future.json()["items"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("sort", "expected"),
+    [("title", ["a", "b", "c", "d"]), ("-title", ["d", "c", "b", "a"])],
+)
+async def test_list_todos_sort_walks_keyset_pages(
+    client: AsyncClient,
+    sort: str,
+    expected: list[str],
+):
+    """Test a whitelisted sort orders pages and its cursor resumes correctly."""
+    await client.post(
+        f"{API_PREFIX}/todos:batch",
+        json={"items": [{"title": title} for title in ["c", "a", "d", "b"]]},
+    )
+
+    titles: list[str] = []
+    params: dict[str, object] = {"sort": sort, "limit": 3, "include_total": "none"}
+    while True:
+        data = (await client.get(f"{API_PREFIX}/todos/", params=params)).json()
+        titles.extend(item["title"] for item in data["items"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+    assert titles == expected
+
+
+@pytest.mark.asyncio
+async def test_list_todos_rejects_cursor_from_other_sort(client: AsyncClient):
+    """Test a cursor cannot be replayed under a different sort."""
+    await client.post(
+        f"{API_PREFIX}/todos:batch",
+        json={"items": [{"title": f"Todo {i}"} for i in range(3)]},
+    )
+    cursor = (await client.get(f"{API_PREFIX}/todos/", params={"limit": 1})).json()[
+        "next_cursor"
+    ]
+
+    response = await client.get(
+        f"{API_PREFIX}/todos/", params={"cursor": cursor, "sort": "title"}
+    )
+    assert response.status_code == 400
+
+    bad_sort = await client.get(f"{API_PREFIX}/todos/", params={"sort": "id"})
+    assert bad_sort.status_code == 422